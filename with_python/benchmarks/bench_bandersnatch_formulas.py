@@ -0,0 +1,75 @@
+"""
+Compares the point formulas of `BandersnatchExtendedPoint`: the unified `add`
+used as a doubling (what `double` used to do), the dedicated `double`, and
+`mixed_add` against `add`, counting the field operations of each one.
+
+Run from `with_python/`:
+
+    python -m benchmarks.bench_bandersnatch_formulas
+"""
+
+import random
+import timeit
+
+from utils.ecc.bandersnatch.curve import BandersnatchExtendedPoint
+from utils.ecc.bandersnatch.fields import SCALAR_FIELD, Fp, Fr
+
+OPERATIONS = ("__mul__", "__add__", "__sub__", "mul_small")
+
+
+def count_operations(fn):
+    """
+    Runs `fn` once with the `Fp` operations wrapped by counters
+    """
+
+    counts = dict.fromkeys(OPERATIONS, 0)
+    originals = {name: getattr(Fp, name) for name in OPERATIONS}
+
+    def counting(name):
+        original = originals[name]
+
+        def wrapper(*args):
+            counts[name] += 1
+            return original(*args)
+        return wrapper
+
+    for name in OPERATIONS:
+        setattr(Fp, name, counting(name))
+    try:
+        fn()
+    finally:
+        for name, original in originals.items():
+            setattr(Fp, name, original)
+
+    return counts
+
+
+def bench(name, fn, number=2000):
+    counts = count_operations(fn)
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{name:<28} {counts['__mul__']:>4} {counts['mul_small']:>6} "
+          f"{counts['__add__'] + counts['__sub__']:>8} {seconds * 1e6:>10.1f} us")
+
+
+def main():
+    random.seed(0)
+    generator = BandersnatchExtendedPoint.generator()
+    p = generator * Fr(random.randrange(SCALAR_FIELD))
+    q = generator * Fr(random.randrange(SCALAR_FIELD))
+    q_affine = BandersnatchExtendedPoint(q.to_affine())
+    result = BandersnatchExtendedPoint.identity()
+
+    assert result.double(p) == BandersnatchExtendedPoint.identity().add(p, p)
+    assert result.mixed_add(p, q_affine) == p + q
+
+    print(f"{'':<28} {'mul':>4} {'mul_a':>6} {'add/sub':>8} {'time':>13}")
+    bench("add(p, p)", lambda: result.add(p, p))
+    bench("double(p)", lambda: result.double(p))
+    bench("add(p, q)", lambda: result.add(p, q))
+    bench("mixed_add(p, q), z_q = 1", lambda: result.mixed_add(p, q_affine))
+    bench("scalar_mul", lambda: result.scalar_mul(
+        p, Fr(random.randrange(SCALAR_FIELD))), 20)
+
+
+if __name__ == "__main__":
+    main()
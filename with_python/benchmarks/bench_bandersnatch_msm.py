@@ -0,0 +1,74 @@
+"""
+Compares the Pippenger `msm` against one scalar multiplication per point, and
+`PrecomputedMSM` over a fixed basis, at 256, 1024 and 16384 points.
+
+The naive sum and the precomputation of the shifted bases are only run on the
+smaller sizes, where they take seconds rather than minutes. Run from `with_python/`:
+
+    python -m benchmarks.bench_bandersnatch_msm
+"""
+
+import random
+import time
+
+from utils.ecc.bandersnatch.curve import BandersnatchExtendedPoint
+from utils.ecc.bandersnatch.fields import SCALAR_FIELD, Fr
+from utils.ecc.bandersnatch.msm import PrecomputedMSM, msm, pippenger_window
+
+SIZES = (256, 1024, 16384)
+# Sizes above this only run `msm`, once
+SMALL = 1024
+
+
+def bench(name, fn, repeat):
+    seconds = min(_timed(fn) for _ in range(repeat))
+    print(f"{name:<45} {seconds * 1e3:>10.1f} ms")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    random.seed(0)
+
+    # Random bases without a scalar multiplication each: P, 2P, 3P, ...
+    point = BandersnatchExtendedPoint.generator() * Fr(random.randrange(SCALAR_FIELD))
+    bases = [point]
+    for _ in range(max(SIZES) - 1):
+        bases.append(bases[-1] + point)
+
+    for n in SIZES:
+        points = bases[:n]
+        scalars = [Fr(random.randrange(SCALAR_FIELD)) for _ in range(n)]
+        repeat = 3 if n <= SMALL else 1
+        print(f"n = {n} (window {pippenger_window(n)})")
+
+        result = msm(scalars, points)
+        bench("msm", lambda: msm(scalars, points), repeat)
+
+        if n > SMALL:
+            continue
+
+        def naive():
+            total = BandersnatchExtendedPoint.identity()
+            for p, s in zip(points, scalars):
+                total = total + p * s
+            return total
+
+        assert naive() == result
+        bench("sum of scalar multiplications", naive, 1)
+
+        start = time.perf_counter()
+        precomputed = PrecomputedMSM(points)
+        print(f"{'PrecomputedMSM setup':<45} "
+              f"{(time.perf_counter() - start) * 1e3:>10.1f} ms")
+        assert precomputed.msm(scalars) == result
+        bench(f"PrecomputedMSM.msm (window {precomputed.window})",
+              lambda: precomputed.msm(scalars), repeat)
+
+
+if __name__ == "__main__":
+    main()
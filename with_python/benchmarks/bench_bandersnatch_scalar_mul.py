@@ -0,0 +1,61 @@
+"""
+Compares the double-and-add `scalar_mul` of both point types against the wNAF
+`wnaf_scalar_mul` used by the `*` overloads, the GLV `glv_scalar_mul` for points of
+the prime order subgroup, and the fixed-base table used for the generator, on random
+253 bit scalars.
+
+Run from `with_python/`:
+
+    python -m benchmarks.bench_bandersnatch_scalar_mul
+"""
+
+import random
+import timeit
+
+from utils.ecc.bandersnatch.curve import (BandersnatchAffinePoint,
+                                          BandersnatchExtendedPoint)
+from utils.ecc.bandersnatch.fields import SCALAR_FIELD, Fr
+
+
+def bench(name, fn, scalars, number=2):
+    seconds = min(timeit.repeat(lambda: [fn(k) for k in scalars],
+                                number=number, repeat=3))
+    print(f"{name:<45} {seconds / (number * len(scalars)) * 1e3:>8.2f} ms")
+
+
+def main():
+    random.seed(0)
+    scalars = [Fr(random.randrange(SCALAR_FIELD)) for _ in range(10)]
+
+    affine = BandersnatchAffinePoint.generator() * Fr(random.randrange(SCALAR_FIELD))
+    extended = BandersnatchExtendedPoint(affine)
+
+    for k in scalars[:3]:
+        expected = BandersnatchExtendedPoint.identity().scalar_mul(extended, k)
+        assert extended * k == expected
+        assert (affine * k) == expected.to_affine()
+
+    bench("BandersnatchAffinePoint.scalar_mul",
+          lambda k: BandersnatchAffinePoint.identity().scalar_mul(affine, k),
+          scalars[:3], 1)
+    bench("BandersnatchExtendedPoint.scalar_mul",
+          lambda k: BandersnatchExtendedPoint.identity().scalar_mul(extended, k),
+          scalars)
+    bench("BandersnatchExtendedPoint.wnaf_scalar_mul",
+          lambda k: BandersnatchExtendedPoint.identity().wnaf_scalar_mul(
+              extended, k), scalars)
+    bench("BandersnatchExtendedPoint.glv_scalar_mul",
+          lambda k: BandersnatchExtendedPoint.identity().glv_scalar_mul(
+              extended, k), scalars)
+    bench("BandersnatchAffinePoint * Fr", lambda k: affine * k, scalars)
+    bench("BandersnatchExtendedPoint * Fr", lambda k: extended * k, scalars)
+
+    # The generator is multiplied from its fixed-base table (built on first use)
+    generator = BandersnatchExtendedPoint.generator()
+    generator * scalars[0]
+    bench("generator * Fr (fixed-base table)",
+          lambda k: generator * k, scalars)
+
+
+if __name__ == "__main__":
+    main()
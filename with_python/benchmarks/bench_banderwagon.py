@@ -0,0 +1,44 @@
+"""
+Compares serializing banderwagon elements one by one (one inversion each) against
+`Banderwagon.batch_to_bytes` (one shared inversion), and times `from_bytes`.
+
+Run from `with_python/`:
+
+    python -m benchmarks.bench_banderwagon
+"""
+
+import random
+import timeit
+
+from utils.ecc.bandersnatch.banderwagon import Banderwagon
+from utils.ecc.bandersnatch.fields import SCALAR_FIELD, Fr
+
+NUM_ELEMENTS = 1000
+
+
+def bench(name, fn, number=3):
+    seconds = min(timeit.repeat(fn, number=number, repeat=3))
+    print(f"{name:<45} {seconds / (number * NUM_ELEMENTS) * 1e6:>8.2f} µs")
+
+
+def main():
+    random.seed(0)
+
+    # Random elements in projective form (z != 1), as after commitments: P, 2P, ...
+    point = Banderwagon.generator() * Fr(random.randrange(SCALAR_FIELD))
+    elements = [point]
+    for _ in range(NUM_ELEMENTS - 1):
+        elements.append(elements[-1] + point)
+
+    encodings = Banderwagon.batch_to_bytes(elements)
+    assert encodings == [e.to_bytes() for e in elements]
+
+    bench("to_bytes", lambda: [e.to_bytes() for e in elements])
+    bench("batch_to_bytes", lambda: Banderwagon.batch_to_bytes(elements))
+    bench("from_bytes", lambda: [Banderwagon.from_bytes(b) for b in encodings], 1)
+    bench("from_bytes (no subgroup check)",
+          lambda: [Banderwagon.from_bytes(b, False) for b in encodings], 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Compares the `Fp`/`Fr` backend (a full `%` after every product) against the
+montgomery backend (`FpMont`/`FrMont`) on long chains of multiplications.
+
+The point formulas below mirror `BandersnatchExtendedPoint.add` and `scalar_mul`
+but take the curve constants as arguments, so the exact same sequence of
+operations runs with both element types.
+
+Run from `with_python/`:
+
+    python -m benchmarks.bench_montgomery
+"""
+
+import random
+import timeit
+
+from utils.ecc.bandersnatch.curve import A, D, BandersnatchExtendedPoint
+from utils.ecc.bandersnatch.fields import (BASE_FIELD, SCALAR_FIELD, Fp,
+                                           FpMont, Fr, FrMont)
+
+
+def mul_chain(values):
+    acc = values[0]
+    for v in values:
+        acc = acc * v
+    return acc
+
+
+def square_chain(a, n):
+    for _ in range(n):
+        a = a * a
+    return a
+
+
+def unified_add(p, q, a_const, d_const):
+    # Same formula as `BandersnatchExtendedPoint.add`
+    x1, y1, t1, z1 = p
+    x2, y2, t2, z2 = q
+
+    a = x1 * x2
+    b = y1 * y2
+    c = d_const * t1 * t2
+    d = z1 * z2
+    h = b - (a * a_const)
+    e = (x1 + y1) * (x2 + y2) - a - b
+    f = d - c
+    g = d + c
+
+    return (e * f, g * h, e * h, f * g)
+
+
+def double_and_add(point, scalar, identity, a_const, d_const):
+    # Same loop as `BandersnatchExtendedPoint.scalar_mul`
+    result = identity
+    temp = point
+    while scalar:
+        if scalar & 1:
+            result = unified_add(result, temp, a_const, d_const)
+        temp = unified_add(temp, temp, a_const, d_const)
+        scalar >>= 1
+    return result
+
+
+def bench(name, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+    print(f"{name:<45} {seconds * 1e6:>12.1f} us")
+    return seconds
+
+
+def main():
+    random.seed(0)
+
+    for field, mont, modulus in ((Fp, FpMont, BASE_FIELD),
+                                 (Fr, FrMont, SCALAR_FIELD)):
+        values = [field(random.randrange(modulus)) for _ in range(1000)]
+        mont_values = mont.batch_from_field(values)
+        assert mont.batch_to_field([mul_chain(mont_values)])[
+            0] == mul_chain(values)
+
+        print(f"{field.__name__} vs {mont.__name__}")
+        bench(f"  {field.__name__} 1000 multiplications",
+              lambda: mul_chain(values), 20)
+        bench(f"  {mont.__name__} 1000 multiplications",
+              lambda: mul_chain(mont_values), 20)
+        bench(f"  {field.__name__} 1000 squarings",
+              lambda: square_chain(values[1], 1000), 20)
+        bench(f"  {mont.__name__} 1000 squarings",
+              lambda: square_chain(mont_values[1], 1000), 20)
+        bench(f"  {mont.__name__}.batch_from_field (1000)",
+              lambda: mont.batch_from_field(values), 20)
+
+    generator = BandersnatchExtendedPoint.generator()
+    point = (generator.x, generator.y, generator.t, generator.z)
+    mont_point = tuple(FpMont.batch_from_field(list(point)))
+    identity = (Fp.zero(), Fp.one(), Fp.zero(), Fp.one())
+    mont_identity = tuple(FpMont.batch_from_field(list(identity)))
+    mont_a = FpMont.from_field(A)
+    mont_d = FpMont.from_field(D)
+
+    scalar = random.randrange(SCALAR_FIELD)
+    expected = double_and_add(point, scalar, identity, A, D)
+    got = double_and_add(mont_point, scalar, mont_identity, mont_a, mont_d)
+    assert FpMont.batch_to_field(list(got)) == list(expected)
+
+    print("BandersnatchExtendedPoint")
+    bench("  BandersnatchExtendedPoint.add",
+          lambda: generator + generator, 200)
+    bench("  unified add with Fp",
+          lambda: unified_add(point, point, A, D), 200)
+    bench("  unified add with FpMont",
+          lambda: unified_add(mont_point, mont_point, mont_a, mont_d), 200)
+    # Called explicitly: `generator * Fr` would use the generator's fixed-base table
+    bench("  BandersnatchExtendedPoint.scalar_mul",
+          lambda: BandersnatchExtendedPoint.identity().scalar_mul(
+              generator, Fr(scalar)), 5)
+    bench("  double and add with Fp",
+          lambda: double_and_add(point, scalar, identity, A, D), 5)
+    bench("  double and add with FpMont",
+          lambda: double_and_add(mont_point, scalar, mont_identity,
+                                 mont_a, mont_d), 5)
+
+
+if __name__ == "__main__":
+    main()
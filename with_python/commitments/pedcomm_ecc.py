@@ -1,12 +1,12 @@
 """
 This is an implementation of Pedersen Commitments using Elliptic Curves Operations
 
-Check out implementations of Pedersen Commitments using Modular Exponentiation (./pedcomm_mod.py) and Elliptic Curve Cryptography (./utils/ecc.py)
+Check out implementations of Pedersen Commitments using Modular Exponentiation (./pedcomm_mod.py) and Elliptic Curve Cryptography (../utils/ecc/weierstrass.py)
 """
 
 import random
-import collections
 
+from utils.curves import SECP256K1
 from utils.ecc import ECC
 
 
@@ -39,7 +39,7 @@ class Ped_ECC(ECC):
         super().__init__(curve)
         g = self.curve.g
         s = random.randrange(1, self.curve.n - 1)
-        h = self.scalar_multiplication(s, g)
+        h = self.fixed_base_multiplication(s, g)
 
         self.q = self.curve.n
         self.g = g
@@ -48,49 +48,41 @@ class Ped_ECC(ECC):
     def commit(self, m: int, q: int,
                g: tuple[int, int], h: tuple[int, int]) -> (int, int, int):
         r = random.randrange(1, q - 1)
-        ag = self.scalar_multiplication(m, g)
-        ah = self.scalar_multiplication(r, h)
+        ag = self._multiply_base(m, g)
+        ah = self._multiply_base(r, h)
         c = self.point_addition(ag, ah)
         return (c, m, r)
 
+    def _multiply_base(self, z: int, point: tuple[int, int]) -> tuple[int, int]:
+        # The generator and this instance's h are used for every commitment, so
+        # their multiples are precomputed once (see `ECC.fixed_base_table`). A table
+        # is kept for the rest of the process, so other bases are multiplied
+        # directly
+        if point == self.curve.g or point == self.h:
+            return self.fixed_base_multiplication(z, point)
+        return self.scalar_multiplication(z, point)
+
     def open(self, m_i: int, c: int, *r_i) -> bool:
         sum = 0
         for i in r_i:
             sum += i
 
-        ag_i = self.scalar_multiplication(m_i, g)
-        ah_i = self.scalar_multiplication(sum, h)
-        c_i = self.point_addition(ag_i, ah_i)
+        # g and h have fixed-base tables, see `ECC.double_scalar_mul`
+        c_i = self.double_scalar_mul(m_i, self.g, sum, self.h)
         return c == c_i
 
     def add_comm(self, *c):
-        sum = self.point_at_infinity
+        # Summed in jacobian coordinates, so only the result needs an inversion
+        sum = self.jacobian_infinity
         for j in c:
-            sum = self.point_addition(sum, j)
-        c_s = sum
+            sum = self.jacobian_mixed_add(sum, j)
+        c_s = self.to_affine(sum)
         return c_s
 
 
 # USAGE
-EllipticCurve = collections.namedtuple('EllipticCurve', 'name p a b g n h')
-
-# Set the domain parameters specific to the curve
-
-curve = EllipticCurve(
-    'secp256k1',
-    # Field characteristic.
-    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
-    # Curve coefficients.
-    a=0,
-    b=7,
-    # Base point.
-    g=(0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
-       0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8),
-    # Subgroup order.
-    n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
-    # Subgroup cofactor.
-    h=1,
-)
+# The domain parameters of secp256k1, see `utils/curves.py`
+curve = SECP256K1
 
 
 # USAGE
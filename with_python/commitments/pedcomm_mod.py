@@ -26,6 +26,7 @@ and Polynomial Commitments(./polynomials/basic_polynomial_comm_using_mod)
 
 import random
 
+from utils.fields import multi_exp
 from utils.number_theory import generate_random_prime
 
 
@@ -62,7 +63,7 @@ class Ped_Mod:
         q = generate_random_prime(1, p)
         g = random.randrange(1, q - 1)
         s = random.randrange(1, q - 1)
-        h = (g ** s) % q
+        h = pow(g, s, q)
 
         self.q = q
         self.g = g
@@ -70,7 +71,7 @@ class Ped_Mod:
 
     def commit(self, m: int, q: int, g: int, h: int) -> (int, int, int):
         r = random.randrange(1, q - 1)
-        c = ((g ** m) * (h ** r)) % q
+        c = (pow(g, m, q) * pow(h, r, q)) % q
         return (c, m, r)
 
     def open(self, m_i: int, c: int, *r_i) -> bool:
@@ -78,7 +79,7 @@ class Ped_Mod:
         for i in r_i:
             sum += i
 
-        c_i = ((self.g ** m_i) * (self.h ** sum)) % self.q
+        c_i = multi_exp([self.g, self.h], [m_i, sum], self.q)
         return c == c_i
 
     def mul_comm(self, *c):
@@ -4,10 +4,9 @@ This is same polynomial commitment scheme implemented in (./basic_polynomial_com
 See (/basic_polynomial_comm_using_mod.py) for detailed explanation
 """
 
-import collections
-
 from numpy.polynomial.polynomial import polydiv
 
+from utils.curves import SECP256K1
 from utils.ecc import ECC
 from utils.number_theory import generate_random_prime
 
@@ -25,10 +24,11 @@ class PolyComm_ECC(ECC):
     def __encrypted_summation__(self, values: list[tuple[int, int]]):
         assert len(values) == self.d + 1, "wrong degree"
 
-        sum = self.point_at_infinity
+        # Summed in jacobian coordinates, so only the result needs an inversion
+        sum = self.jacobian_infinity
         for i in values:
-            sum = self.point_addition(sum, i)
-        return sum
+            sum = self.jacobian_mixed_add(sum, i)
+        return self.to_affine(sum)
 
     def __unencrypted_summation__(self, values: list[int]):
         assert len(values) == self.d + 1, "wrong degree"
@@ -55,13 +55,13 @@ class PolyComm_ECC(ECC):
         encrypted_terms = []
 
         for i in range(0, self.d + 1):
-            value = self.scalar_multiplication(x ** i, self.g)
+            value = self.fixed_base_multiplication(x ** i, self.g)
             encrypted_terms.append(value)
 
         # [(((x ** 0) * a) * G), (((x ** 1) * a) * G), ..., (((x ** 0) * d) * G)]
         encrypted_terms_with_a = []
         for i in range(0, self.d + 1):
-            value = self.scalar_multiplication((x ** i) * a, self.g)
+            value = self.fixed_base_multiplication((x ** i) * a, self.g)
             encrypted_terms_with_a.append(value)
 
         t_at_x = []
@@ -75,6 +75,7 @@ class PolyComm_ECC(ECC):
 
     def check_polynomial(self, a: int, eval_of_f: int,
                          eval_of_f_prime: int) -> bool:
+        self.validate_point(eval_of_f)
         return self.scalar_multiplication(a, eval_of_f) == eval_of_f_prime
 
     def check_knowledge_of_polynomial(
@@ -82,6 +83,7 @@ class PolyComm_ECC(ECC):
             eval_of_h: int,
             eval_of_t: int,
             eval_of_f: int) -> bool:
+        self.validate_point(eval_of_h)
         return self.scalar_multiplication(eval_of_t, eval_of_h) == eval_of_f
 
     """
@@ -115,23 +117,15 @@ class PolyComm_ECC(ECC):
             quotient = quotient + padding
         h_of_x = quotient
 
-        evals_of_f = [
-            self.scalar_multiplication(
-                i, j) for i, j in zip(
-                f_of_x, encrypted_terms)]
-        eval_of_f = self.__encrypted_summation__(evals_of_f)
+        # Each evaluation is a sum of scalar multiplications, computed as one
+        # multi-scalar multiplication (see `ECC.multi_scalar_mul`)
+        eval_of_f = self.multi_scalar_mul(f_of_x, encrypted_terms)
 
-        evals_of_f_prime = [
-            self.scalar_multiplication(
-                i, j) for i, j in zip(
-                f_of_x, encrypted_terms_with_a)]
-        eval_of_f_prime = self.__encrypted_summation__(evals_of_f_prime)
+        eval_of_f_prime = self.multi_scalar_mul(
+            f_of_x, encrypted_terms_with_a)
 
-        evals_of_h = [
-            self.scalar_multiplication(
-                int(i), j) for i, j in zip(
-                h_of_x, encrypted_terms)]
-        eval_of_h = self.__encrypted_summation__(evals_of_h)
+        eval_of_h = self.multi_scalar_mul(
+            [int(i) for i in h_of_x], encrypted_terms)
 
         return (eval_of_f, eval_of_f_prime, eval_of_h)
 
@@ -144,25 +138,8 @@ class PolyComm_ECC(ECC):
 # h(x) = (x - 3)
 
 
-EllipticCurve = collections.namedtuple('EllipticCurve', 'name p a b g n h')
-
-# Set the domain parameters specific to the curve
-
-curve = EllipticCurve(
-    'secp256k1',
-    # Field characteristic.
-    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
-    # Curve coefficients.
-    a=0,
-    b=7,
-    # Base point.
-    g=(0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
-       0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8),
-    # Subgroup order.
-    n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
-    # Subgroup cofactor.
-    h=1,
-)
+# The domain parameters of secp256k1, see `utils/curves.py`
+curve = SECP256K1
 
 # Secret
 x = generate_random_prime(1, 0xffff)
@@ -136,6 +136,7 @@ Let's fix the above protocol:
 
 from numpy.polynomial.polynomial import polydiv
 
+from utils.fields import FixedBaseExp, multi_exp
 from utils.number_theory import generate_random_prime
 
 
@@ -179,17 +180,20 @@ class PolyComm_Mod:
 
         assert len(t_of_x) == self.d + 1, "wrong degree"
 
+        # All the terms are powers of g, so they share one precomputed table
+        g = FixedBaseExp.get(self.g, self.n)
+
         # [((g ** (x ** 0)) mod n), ((g ** (x ** 1)) mod n), ..., ((g ** (x ** d)) mod n)]
         encrypted_terms = []
 
         for i in range(0, self.d + 1):
-            value = pow(self.g, x ** i, self.n)
+            value = g.pow(x ** i)
             encrypted_terms.append(value)
 
         # [((g ** (x ** 0) * a) mod n), ((g ** (x ** 1) * a) mod n), ..., ((g ** (x ** d) * a) mod n)]
         encrypted_terms_with_a = []
         for i in range(0, self.d + 1):
-            value = pow(self.g, (x ** i) * a, self.n)
+            value = g.pow((x ** i) * a)
             encrypted_terms_with_a.append(value)
 
         t_at_x = []
@@ -243,17 +247,14 @@ class PolyComm_Mod:
             quotient = quotient + padding
         h_of_x = quotient
 
-        evals_of_f = [pow(i, j, self.n)
-                      for i, j in zip(encrypted_terms, f_of_x)]
-        eval_of_f = self.__encrypted_product__(evals_of_f)
+        # Each evaluation is a product of powers of the encrypted terms,
+        # computed with a multi-exponentiation sharing one chain of squarings
+        eval_of_f = multi_exp(encrypted_terms, f_of_x, self.n)
 
-        evals_of_f_prime = [pow(i, j, self.n)
-                            for i, j in zip(encrypted_terms_with_a, f_of_x)]
-        eval_of_f_prime = self.__encrypted_product__(evals_of_f_prime)
+        eval_of_f_prime = multi_exp(encrypted_terms_with_a, f_of_x, self.n)
 
-        evals_of_h = [pow(i, int(j), self.n)
-                      for i, j in zip(encrypted_terms, h_of_x)]
-        eval_of_h = self.__encrypted_product__(evals_of_h)
+        eval_of_h = multi_exp(encrypted_terms, [int(j)
+                              for j in h_of_x], self.n)
 
         return (eval_of_f, eval_of_f_prime, eval_of_h)
 
@@ -4,8 +4,7 @@ This is an adaption of Trusted Setup using Mod (./basic_trusted_setup_mod.py) us
 Check out Trusted Setup using Mod (./basic_trusted_setup_mod.py) for detailed explanations
 """
 
-import collections
-
+from utils.curves import SECP256K1
 from utils.ecc import ECC
 from utils.number_theory import generate_random_prime
 
@@ -22,18 +21,12 @@ class TrustedSetup_ECC(ECC):
         super().__init__(curve)
         self.d = d
         self.g = curve.g
-        encrypted_values_of_f = [
-            self.scalar_multiplication(
-                x ** i,
-                self.g) for i in range(
-                0,
-                d + 1)]
-        encrypted_values_of_f_times_a = [
-            self.scalar_multiplication(
-                (x ** i) * a,
-                self.g) for i in range(
-                0,
-                d + 1)]
+        # The points are converted to affine together, see
+        # `ECC.batch_to_affine`
+        encrypted_values_of_f = self.batch_fixed_base_multiplication(
+            [x ** i for i in range(0, d + 1)], self.g)
+        encrypted_values_of_f_times_a = self.batch_fixed_base_multiplication(
+            [(x ** i) * a for i in range(0, d + 1)], self.g)
         self.base_crs = (encrypted_values_of_f, encrypted_values_of_f_times_a)
 
     def compute_crs(self, x: int, a: int, crs: (
@@ -41,11 +34,16 @@ class TrustedSetup_ECC(ECC):
         assert len(crs[0]) == self.d + 1, "wrong degree"
         assert len(crs[1]) == self.d + 1, "wrong degree"
 
-        encrypted_values_of_f = crs[0]
-        encrypted_values_of_f_times_a = crs[1]
+        # The crs comes from the previous participant
+        encrypted_values_of_f = [self.validate_point(i) for i in crs[0]]
+        encrypted_values_of_f_times_a = [
+            self.validate_point(i) for i in crs[1]]
 
-        crs = ([self.scalar_multiplication(x, i) for i in encrypted_values_of_f], [
-               self.scalar_multiplication(a, i) for i in encrypted_values_of_f_times_a])
+        crs = (
+            self.batch_scalar_multiplication(
+                [x] * (self.d + 1), encrypted_values_of_f),
+            self.batch_scalar_multiplication(
+                [a] * (self.d + 1), encrypted_values_of_f_times_a))
         return crs
 
 
@@ -59,25 +57,8 @@ a = generate_random_prime(1, 0xffff)
 d = 3
 g = 5
 
-EllipticCurve = collections.namedtuple('EllipticCurve', 'name p a b g n h')
-
-# Set the domain parameters specific to the curve
-
-curve = EllipticCurve(
-    'secp256k1',
-    # Field characteristic.
-    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
-    # Curve coefficients.
-    a=0,
-    b=7,
-    # Base point.
-    g=(0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
-       0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8),
-    # Subgroup order.
-    n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
-    # Subgroup cofactor.
-    h=1,
-)
+# The domain parameters of secp256k1, see `utils/curves.py`
+curve = SECP256K1
 
 trusted_setup = TrustedSetup_ECC(curve, d, x, a)
 crs = trusted_setup.base_crs
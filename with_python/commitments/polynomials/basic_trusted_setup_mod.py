@@ -57,6 +57,7 @@ Can we integrate this to our Polynomial Commitment or create a Polynomial Commit
 import random
 
 from .basic_polynomial_comm_using_mod import PolyComm_Mod
+from utils.fields import FixedBaseExp
 from utils.number_theory import generate_random_prime
 
 
@@ -73,10 +74,11 @@ class TrustedSetup_Mod:
         self.d = d
         self.g = g
         self.n = n
-        encrypted_values_of_f = [pow(self.g, x ** i, self.n)
+        g_exp = FixedBaseExp.get(self.g, self.n)
+        encrypted_values_of_f = [g_exp.pow(x ** i)
                                  for i in range(0, d + 1)]
         encrypted_values_of_f_times_a = [
-            pow(self.g, (x ** i) * a, self.n) for i in range(0, d + 1)]
+            g_exp.pow((x ** i) * a) for i in range(0, d + 1)]
         self.base_crs = (encrypted_values_of_f, encrypted_values_of_f_times_a)
 
     def compute_crs(self, x: int, a: int, crs: (
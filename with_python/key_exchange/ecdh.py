@@ -1,34 +1,16 @@
 """
 Elliptic Curve Diffie-Hellman is more secure type of Diffie-Hellman using Elliptic Curves
 
-Check out `utils/ecc.py` for more
+Check out `utils/ecc/weierstrass.py` for more
 """
 
-import collections
-
+from utils.curves import SECP256K1
 from utils.ecc import ECC
 
 # USAGE
 
-EllipticCurve = collections.namedtuple('EllipticCurve', 'name p a b g n h')
-
-# Set the domain parameters specific to the curve
-
-curve = EllipticCurve(
-    'secp256k1',
-    # Field characteristic.
-    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
-    # Curve coefficients.
-    a=0,
-    b=7,
-    # Base point.
-    g=(0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
-       0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8),
-    # Subgroup order.
-    n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
-    # Subgroup cofactor.
-    h=1,
-)
+# The domain parameters of secp256k1, see `utils/curves.py`
+curve = SECP256K1
 
 ecdh = ECC(curve)
 
@@ -38,6 +20,10 @@ alice_private_key, alice_public_key = ecdh.generate_key_pair()
 # Bob Generates key pair and shares public key with alice
 bob_private_key, bob_public_key = ecdh.generate_key_pair()
 
+# Each party validates the public key it receives before using it
+ecdh.validate_point(bob_public_key)
+ecdh.validate_point(alice_public_key)
+
 # Alice computes the scalar multiplication of her private key and Bob's
 # public key to get a shared secret
 alice_shared_secret = ecdh.scalar_multiplication(
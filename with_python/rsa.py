@@ -1,5 +1,5 @@
 from random import randint
-from utils.number_theory import gcd_by_ea, gcd_by_eea
+from utils.number_theory import gcd_by_ea, mod_inverse
 
 
 class RSA:
@@ -96,7 +96,8 @@ class RSA:
 
         We will use the Extended Euclidean Algorithm.
 
-        The multiplicative inverse is the value of y_1 mod ɸ(n) in the last row of the table returned by `gcd_by_eea`
+        The multiplicative inverse is the value of y_1 mod ɸ(n) in the last row of the table returned by `gcd_by_eea`.
+        `mod_inverse` computes it without building the table.
         """
 
         phi_of_n = self.phi_of_n()
@@ -105,8 +106,7 @@ class RSA:
         if gcd != 1:
             raise Exception("e is invalid")
 
-        table = gcd_by_eea(e, phi_of_n)
-        mi = table[-1][8] % phi_of_n
+        mi = mod_inverse(e, phi_of_n)
         d = mi
         return d
 
@@ -12,10 +12,11 @@ ECDSA is a built on the power of Elliptic Curve Cryptography; its discrete logar
 This is the used in the Bitcoin blockchain.
 """
 
-import collections
 import random
 
-from key_exchange.ecdh import ECC, gcd_by_eea
+from utils.curves import SECP256K1
+from utils.ecc import ECC
+from utils.number_theory import mod_inverse
 
 
 class ECDSA(ECC):
@@ -70,7 +71,7 @@ class ECDSA(ECC):
     """
 
     def compute_r(self, k: int) -> int:
-        x1, _ = self.scalar_multiplication(k, self.curve.g)
+        x1, _ = self.fixed_base_multiplication(k)
         r = x1 % self.curve.n
         if r == 0:
             raise Exception("Invalid r value. Choose another random number")
@@ -78,7 +79,7 @@ class ECDSA(ECC):
 
     def compute_s(self, r: int, k: int, m: int, d: int) -> int:
         # multiplicative inverse mod n
-        kmi = gcd_by_eea(k, self.curve.n)[-1][8]
+        kmi = mod_inverse(k, self.curve.n)
         s = (kmi * (m + (d * r))) % self.curve.n
         if s == 0:
             raise Exception("Invalid s value. Choose another random number")
@@ -93,15 +94,17 @@ class ECDSA(ECC):
         if r not in range(1, self.curve.n) or s not in range(1, self.curve.n):
             return False
 
+        # The public key comes from the signer, it is checked once here so the
+        # arithmetic below can run unchecked
+        self.validate_point(q)
+
         # multiplicative inverse mod n
-        smi = gcd_by_eea(s, self.curve.n)[-1][8] % self.curve.n
+        smi = mod_inverse(s, self.curve.n)
         u1 = (m * smi) % self.curve.n
         u2 = (r * smi) % self.curve.n
-        y = self.point_addition(
-            self.scalar_multiplication(
-                u1, self.curve.g), self.scalar_multiplication(
-                u2, q))
-        if y == self.point_at_infinity:
+        # u1 * G + u2 * q in one go, see `ECC.double_scalar_mul`
+        y = self.double_scalar_mul(u1, self.curve.g, u2, q)
+        if y is self.point_at_infinity:
             raise Exception("Invalid signature")
         x2 = y[0]
         v = x2 % self.curve.n
@@ -110,25 +113,8 @@ class ECDSA(ECC):
 
 # USAGE
 
-EllipticCurve = collections.namedtuple('EllipticCurve', 'name p a b g n h')
-
-# Set the domain parameters specific to the curve
-
-curve = EllipticCurve(
-    'secp256k1',
-    # Field characteristic.
-    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
-    # Curve coefficients.
-    a=0,
-    b=7,
-    # Base point.
-    g=(0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
-       0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8),
-    # Subgroup order.
-    n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
-    # Subgroup cofactor.
-    h=1,
-)
+# The domain parameters of secp256k1, see `utils/curves.py`
+curve = SECP256K1
 
 ecdsa = ECDSA(curve)
 
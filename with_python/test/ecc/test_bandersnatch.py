@@ -0,0 +1,156 @@
+import random
+import unittest
+
+from utils.ecc.bandersnatch import curve
+from utils.ecc.bandersnatch.curve import (A, A_INT, GLV_BASIS, LAMBDA,
+                                          BandersnatchAffinePoint,
+                                          BandersnatchExtendedPoint,
+                                          fixed_base_table, glv_decompose,
+                                          register_base)
+from utils.ecc.bandersnatch.fields import BASE_FIELD, SCALAR_FIELD, Fp, Fr
+
+
+def random_point():
+    return BandersnatchExtendedPoint.generator() * Fr(random.randrange(1, SCALAR_FIELD))
+
+
+class TestBandersnatch(unittest.TestCase):
+
+    def test_generator(self):
+
+        generator = BandersnatchExtendedPoint.generator()
+        self.assertEqual(
+            generator.to_bytes().hex(),
+            "18ae52a26618e7e1658499ad22c0792bf342be7b77113774c5340b2ccc32c129")
+
+    def test_mul_small(self):
+
+        x = Fp(random.randrange(BASE_FIELD))
+        self.assertEqual(x.mul_small(A_INT), x * A)
+        self.assertEqual(x.mul_small(0), Fp.zero())
+
+    def test_double(self):
+
+        identity = BandersnatchExtendedPoint.identity()
+        for p in (identity, BandersnatchExtendedPoint.generator(),
+                  random_point()):
+            expected = BandersnatchExtendedPoint.identity().add(p, p)
+            got = BandersnatchExtendedPoint.identity().double(p)
+            self.assertEqual(got, expected)
+            # t stays consistent with x, y and z
+            self.assertEqual(got.t * got.z, got.x * got.y)
+
+    def test_mixed_add(self):
+
+        p = random_point()
+        q = BandersnatchExtendedPoint(random_point().to_affine())
+
+        expected = BandersnatchExtendedPoint.identity().add(p, q)
+        got = BandersnatchExtendedPoint.identity().mixed_add(p, q)
+        self.assertEqual(got, expected)
+
+        neg = BandersnatchExtendedPoint((-p).to_affine())
+        got = BandersnatchExtendedPoint.identity().mixed_add(p, neg)
+        self.assertTrue(got.is_zero())
+
+    def test_affine_matches_extended(self):
+
+        scalar = Fr(random.randrange(SCALAR_FIELD))
+        affine = BandersnatchAffinePoint.generator() * scalar
+        extended = BandersnatchExtendedPoint.generator() * scalar
+        self.assertEqual(extended.to_affine(), affine)
+
+    def test_endomorphism(self):
+
+        self.assertEqual((LAMBDA * LAMBDA) % SCALAR_FIELD, SCALAR_FIELD - 2)
+        for a, b in GLV_BASIS:
+            self.assertEqual((a + b * LAMBDA) % SCALAR_FIELD, 0)
+
+        p = random_point()
+        expected = BandersnatchExtendedPoint.identity().scalar_mul(p, Fr(LAMBDA))
+        got = BandersnatchExtendedPoint.identity().endomorphism(p)
+        self.assertEqual(got, expected)
+
+    def test_glv_decompose(self):
+
+        for k in [0, 1, LAMBDA, SCALAR_FIELD - 1] + \
+                [random.randrange(SCALAR_FIELD) for _ in range(50)]:
+            k1, k2 = glv_decompose(k)
+            self.assertEqual((k1 + k2 * LAMBDA - k) % SCALAR_FIELD, 0)
+            self.assertLessEqual(abs(k1).bit_length(), 128)
+            self.assertLessEqual(abs(k2).bit_length(), 128)
+
+    def test_glv_scalar_mul(self):
+
+        p = random_point()
+        scalars = [0, 1, 2, LAMBDA, SCALAR_FIELD - 1] + \
+            [random.randrange(SCALAR_FIELD) for _ in range(5)]
+        for k in scalars:
+            expected = BandersnatchExtendedPoint.identity().scalar_mul(p, Fr(k))
+            got = BandersnatchExtendedPoint.identity().glv_scalar_mul(p, Fr(k))
+            self.assertEqual(got, expected)
+            self.assertEqual(p * Fr(k), expected)
+
+        identity = BandersnatchExtendedPoint.identity()
+        self.assertTrue((identity * Fr(5)).is_zero())
+
+    def test_mul_outside_subgroup(self):
+
+        # Points of the subgroup plus the point of order 2 (0, -1), like the point
+        # with x = 3
+        order_2 = BandersnatchExtendedPoint.from_coordinates(
+            Fp.zero(), -Fp.one(), Fp.zero(), Fp.one())
+        x = Fp(3)
+        y = BandersnatchAffinePoint.get_y_coordinate(x, True)
+        other = BandersnatchExtendedPoint(BandersnatchAffinePoint(x, y))
+
+        for p in (random_point() + order_2, other):
+            # r * p is not the identity, so p is not in the subgroup
+            self.assertFalse(
+                (BandersnatchExtendedPoint.identity().scalar_mul(
+                    p, Fr(SCALAR_FIELD - 1)) + p).is_zero())
+            # GLV gets LAMBDA * p wrong on these points
+            for k in (1, 2, LAMBDA, SCALAR_FIELD - 1,
+                      random.randrange(SCALAR_FIELD)):
+                expected = BandersnatchExtendedPoint.identity().scalar_mul(p, Fr(k))
+                self.assertEqual(p * Fr(k), expected)
+                self.assertEqual(
+                    BandersnatchExtendedPoint.identity().wnaf_scalar_mul(p, Fr(k)),
+                    expected)
+
+    def test_batch_normalize(self):
+
+        points = [random_point() for _ in range(4)]
+        normalized = BandersnatchExtendedPoint.batch_normalize(points)
+        for p, q in zip(points, normalized):
+            self.assertTrue(q.z.is_one())
+            self.assertEqual(p, q)
+
+    def test_fixed_base(self):
+
+        # The base registered here is removed after the test
+        tables = dict(curve._FIXED_BASE_TABLES)
+        self.addCleanup(curve._FIXED_BASE_TABLES.update, tables)
+        self.addCleanup(curve._FIXED_BASE_TABLES.clear)
+
+        generator = BandersnatchExtendedPoint.generator()
+        self.assertIsNotNone(fixed_base_table(generator))
+
+        # With z != 1, the generator is recognized by cross-multiplication and other
+        # points are only normalized once another base is registered
+        z = Fp(7)
+        scaled = BandersnatchExtendedPoint.from_coordinates(
+            generator.x * z, generator.y * z, generator.t * z, z)
+        self.assertIs(fixed_base_table(scaled), fixed_base_table(generator))
+
+        base = random_point()
+        self.assertFalse(base.z.is_one())
+        self.assertIsNone(fixed_base_table(base))
+        register_base(base)
+        self.assertIsNotNone(fixed_base_table(base))
+
+        for p in (generator, base):
+            for k in [0, 1, SCALAR_FIELD - 1, random.randrange(SCALAR_FIELD)]:
+                expected = BandersnatchExtendedPoint.identity().glv_scalar_mul(
+                    p, Fr(k))
+                self.assertEqual(p * Fr(k), expected)
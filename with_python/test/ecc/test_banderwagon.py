@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from utils.ecc.bandersnatch.banderwagon import Banderwagon
+from utils.ecc.bandersnatch.curve import LAMBDA, BandersnatchExtendedPoint
+from utils.ecc.bandersnatch.fields import BASE_FIELD, SCALAR_FIELD, Fp, Fr
+
+
+def random_element():
+    return Banderwagon.generator() * Fr(random.randrange(1, SCALAR_FIELD))
+
+
+class TestBanderwagon(unittest.TestCase):
+
+    def test_generator(self):
+
+        self.assertEqual(
+            Banderwagon.generator().to_bytes().hex(),
+            "4a2c7486fd924882bf02c6908de395122843e3e05264d7991e18e7985dad51e9")
+
+    def test_serialization(self):
+
+        elements = [Banderwagon.identity(), Banderwagon.generator()]
+        elements += [random_element() for _ in range(10)]
+        encodings = Banderwagon.batch_to_bytes(elements)
+
+        for element, encoding in zip(elements, encodings):
+            self.assertEqual(element.to_bytes(), encoding)
+            decoded = Banderwagon.from_bytes(encoding)
+            self.assertEqual(decoded, element)
+            self.assertEqual(decoded.to_bytes(), encoding)
+
+    def test_equality(self):
+
+        p = random_element()
+        # (-x, -y) is the other representative of the same element
+        other = Banderwagon(BandersnatchExtendedPoint.from_coordinates(
+            -p.point.x, -p.point.y, p.point.t, p.point.z))
+        self.assertEqual(p, other)
+        self.assertEqual(p.to_bytes(), other.to_bytes())
+        self.assertNotEqual(p, -p)
+        self.assertEqual(p + p - p, p)
+
+    def test_mul(self):
+
+        p = random_element()
+        # The other representative of p, and the representatives of the identity
+        other = Banderwagon(BandersnatchExtendedPoint.from_coordinates(
+            -p.point.x, -p.point.y, p.point.t, p.point.z))
+        order_2 = Banderwagon(BandersnatchExtendedPoint.from_coordinates(
+            Fp.zero(), -Fp.one(), Fp.zero(), Fp.one()))
+
+        for k in (0, 1, 2, LAMBDA, SCALAR_FIELD - 1, random.randrange(SCALAR_FIELD)):
+            expected = Banderwagon(
+                BandersnatchExtendedPoint.identity().scalar_mul(p.point, Fr(k)))
+            self.assertEqual(p * Fr(k), expected)
+            self.assertEqual(other * Fr(k), expected)
+            self.assertEqual(order_2 * Fr(k), Banderwagon.identity())
+            self.assertEqual(Banderwagon.identity() * Fr(k),
+                             Banderwagon.identity())
+
+    def test_invalid_bytes(self):
+
+        self.assertIsNone(Banderwagon.from_bytes(bytes(31)))
+        # x >= p is not canonical
+        self.assertIsNone(Banderwagon.from_bytes(
+            BASE_FIELD.to_bytes(32, byteorder='big')))
+
+        # Points on the curve that are not in the subgroup are rejected. The
+        # encodings come from a seeded generator so that some always are
+        rng = random.Random(0)
+        rejected = 0
+        for _ in range(30):
+            encoding = rng.randrange(BASE_FIELD).to_bytes(32, byteorder='big')
+            element = Banderwagon.from_bytes(encoding, subgroup_check=False)
+            if element is None:
+                continue
+            x = Fp.from_bytes(encoding[::-1])
+            if not Banderwagon.subgroup_check(x):
+                self.assertIsNone(Banderwagon.from_bytes(encoding))
+                rejected += 1
+            else:
+                self.assertEqual(Banderwagon.from_bytes(encoding), element)
+        self.assertGreater(rejected, 0)
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from utils.ecc.bandersnatch.curve import BandersnatchExtendedPoint
+from utils.ecc.bandersnatch.fields import SCALAR_FIELD, Fr
+from utils.ecc.bandersnatch.msm import (PrecomputedMSM, _signed_digits,
+                                        msm, pippenger_window)
+
+
+def random_point():
+    return BandersnatchExtendedPoint.generator() * Fr(random.randrange(1, SCALAR_FIELD))
+
+
+def naive_msm(scalars, points):
+    result = BandersnatchExtendedPoint.identity()
+    for scalar, point in zip(scalars, points):
+        result = result + point * scalar
+    return result
+
+
+class TestMSM(unittest.TestCase):
+
+    def test_signed_digits(self):
+
+        for window in (2, 5, 8):
+            k = random.randrange(SCALAR_FIELD)
+            digits = _signed_digits(k, window, -(-254 // window))
+            self.assertEqual(
+                sum(d << (window * j) for j, d in enumerate(digits)), k)
+            self.assertTrue(all(abs(d) <= 1 << (window - 1) for d in digits))
+
+    def test_window(self):
+
+        # The windows measured to be the fastest at the sizes of
+        # `benchmarks/bench_bandersnatch_msm.py` (at 256 points, 6 and 7 are within
+        # the noise of each other)
+        self.assertEqual(pippenger_window(256), 6)
+        self.assertEqual(pippenger_window(1024), 8)
+        self.assertEqual(pippenger_window(16384), 11)
+
+        # A single set of buckets for all the windows makes larger windows pay off
+        for n in (256, 1024):
+            self.assertGreater(pippenger_window(n, precomputed=True),
+                               pippenger_window(n))
+
+    def test_msm(self):
+
+        self.assertEqual(msm([], []), BandersnatchExtendedPoint.identity())
+
+        for n in (1, 3, 20):
+            points = [random_point() for _ in range(n)]
+            scalars = [Fr(random.randrange(SCALAR_FIELD)) for _ in range(n)]
+            expected = naive_msm(scalars, points)
+            self.assertEqual(msm(scalars, points), expected)
+            self.assertEqual(msm(scalars, points, window=3), expected)
+
+        # Zero and -1 scalars, and the identity among the points
+        points = [random_point(), BandersnatchExtendedPoint.identity(),
+                  random_point()]
+        scalars = [Fr(0), Fr(7), Fr(SCALAR_FIELD - 1)]
+        self.assertEqual(msm(scalars, points), -points[2])
+
+    def test_precomputed(self):
+
+        basis = [random_point() for _ in range(8)]
+        precomputed = PrecomputedMSM(basis)
+        for n in (8, 5):
+            scalars = [Fr(random.randrange(SCALAR_FIELD)) for _ in range(n)]
+            expected = naive_msm(scalars, basis)
+            self.assertEqual(precomputed.msm(scalars), expected)
+            self.assertEqual(PrecomputedMSM(basis, window=4).msm(scalars),
+                             expected)
@@ -0,0 +1,282 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from signatures.ecdsa import ECDSA
+from utils.curves import SECP256K1, CurveContext
+from utils.ecc import ECC, INFINITY, FixedBaseTable, Point, wnaf
+
+# y^2 = x^3 + x + 8 mod 10009, of prime order 10099. Not registered, so the tables
+# built for it stay in this context
+TOY = CurveContext('toy-weierstrass', p=10009, a=1, b=8, g=(1, 843), n=10099, h=1)
+
+CURVES = (SECP256K1, TOY)
+
+
+def reference(curve):
+    # Affine double and add, with an inversion per operation
+    return ECC(curve, coordinates="affine", window=None)
+
+
+def random_point(curve):
+    return reference(curve).scalar_multiplication(
+        random.randrange(1, curve.n), curve.g)
+
+
+class TestWeierstrass(unittest.TestCase):
+
+    def test_validate_point(self):
+
+        for curve in CURVES:
+            ecc = ECC(curve)
+            point = random_point(curve)
+            x, y = point
+
+            self.assertEqual(ecc.validate_point(point), point)
+            self.assertRaises(Exception, ecc.validate_point, INFINITY)
+            # The same point with unreduced coordinates
+            self.assertRaises(Exception, ecc.validate_point, (x + curve.p, y))
+            self.assertRaises(Exception, ecc.validate_point, (x, y - curve.p))
+            self.assertRaises(Exception, ecc.validate_point,
+                              (x, (y + 1) % curve.p))
+
+        # ECDSA rejects such public keys before verifying
+        ecdsa = ECDSA(SECP256K1)
+        private_key, public_key = ecdsa.generate_key_pair()
+        k = ecdsa.generate_random_number()
+        r = ecdsa.compute_r(k)
+        s = ecdsa.compute_s(r, k, 22, private_key)
+        self.assertTrue(ecdsa.verify(22, r, s, public_key))
+
+        x, y = SECP256K1.g
+        for key in (INFINITY, (x + SECP256K1.p, y)):
+            self.assertRaises(Exception, ecdsa.verify, 22, r, s, key)
+
+    def test_jacobian(self):
+
+        for curve in CURVES:
+            ref = reference(curve)
+            for ecc in (ECC(curve), ECC(curve, window=None),
+                        ECC(curve, window=3)):
+                point = random_point(curve)
+                for z in (1, 2, random.randrange(curve.n), curve.n - 1):
+                    self.assertEqual(ecc.scalar_multiplication(z, point),
+                                     ref.scalar_multiplication(z, point))
+                self.assertIs(ecc.scalar_multiplication(curve.n, point),
+                              INFINITY)
+                self.assertIs(ecc.scalar_multiplication(5, INFINITY), INFINITY)
+
+    def test_fixed_base_table(self):
+
+        for curve in CURVES:
+            ecc = ECC(curve)
+            ref = reference(curve)
+            point = random_point(curve)
+
+            with tempfile.TemporaryDirectory() as cache_dir:
+                table = ecc.fixed_base_table(point, window=4, cache_dir=cache_dir)
+                self.assertIs(ecc.fixed_base_table(point, window=4), table)
+
+                files = os.listdir(cache_dir)
+                self.assertEqual(len(files), 1)
+                loaded = FixedBaseTable.load(os.path.join(cache_dir, files[0]))
+                self.assertEqual(loaded.window, 4)
+                self.assertEqual(loaded.table, table.table)
+
+                for z in (1, random.randrange(curve.n), curve.n - 1):
+                    expected = ref.scalar_multiplication(z, point)
+                    self.assertEqual(ecc.to_affine(table.multiply(ecc, z)),
+                                     expected)
+                    self.assertEqual(ecc.to_affine(loaded.multiply(ecc, z)),
+                                     expected)
+
+                # A corrupted or mismatched file is rebuilt and overwritten
+                path = os.path.join(cache_dir, files[0])
+                off_curve = [list(row) for row in table.table]
+                x, y = off_curve[1][2]
+                off_curve[1][2] = (x, (y + 1) % curve.p)
+                corruptions = (
+                    {"window": 4, "table": off_curve},
+                    {"window": 4, "table": table.table[:-1]},
+                    {"window": 3, "table": table.table},
+                    {"window": 4, "table": [table.table[1]] + table.table[1:]},
+                    {"window": 4, "table": table.table[:1] +
+                     [row[::-1] for row in table.table[1:]]},
+                )
+                for data in corruptions:
+                    with open(path, "w") as f:
+                        json.dump(data, f)
+                    del curve.fixed_base_tables[(point, 4)]
+                    rebuilt = ecc.fixed_base_table(point, window=4,
+                                                   cache_dir=cache_dir)
+                    self.assertEqual(rebuilt.table, table.table)
+                    self.assertEqual(FixedBaseTable.load(path).table, table.table)
+
+                with open(path, "w") as f:
+                    f.write("{")
+                del curve.fixed_base_tables[(point, 4)]
+                self.assertEqual(ecc.fixed_base_table(
+                    point, window=4, cache_dir=cache_dir).table, table.table)
+
+            z = random.randrange(curve.n)
+            self.assertEqual(ecc.fixed_base_multiplication(z),
+                             ref.scalar_multiplication(z, curve.g))
+            self.assertEqual(ecc.batch_fixed_base_multiplication([z, 0]),
+                             [ref.scalar_multiplication(z, curve.g), INFINITY])
+
+    def test_wnaf(self):
+
+        for window in (2, 4, 5, 7):
+            z = random.randrange(SECP256K1.n)
+            digits = wnaf(z, window)
+            self.assertEqual(sum(d << i for i, d in enumerate(digits)), z)
+            for i, digit in enumerate(digits):
+                if digit:
+                    self.assertEqual(digit & 1, 1)
+                    self.assertLess(abs(digit), 1 << (window - 1))
+                    # At most one non zero digit in any `window` consecutive ones
+                    self.assertFalse(any(digits[i + 1:i + window]))
+
+        ecc = ECC(SECP256K1)
+        ref = reference(SECP256K1)
+        point = random_point(SECP256K1)
+        z = random.randrange(SECP256K1.n)
+        for window in (2, 5, 7):
+            self.assertEqual(ecc.wnaf_multiplication(z, point, window),
+                             ref.scalar_multiplication(z, point))
+
+    def test_glv(self):
+
+        ecc = ECC(SECP256K1)
+        ref = reference(SECP256K1)
+        n = SECP256K1.n
+        lam = SECP256K1.glv["lambda"]
+
+        for z in (1, n - 1, random.randrange(n), random.randrange(n)):
+            k1, k2 = ecc.glv_decompose(z)
+            self.assertEqual((k1 + k2 * lam) % n, z)
+            self.assertLess(abs(k1).bit_length(), 130)
+            self.assertLess(abs(k2).bit_length(), 130)
+
+        point = random_point(SECP256K1)
+        z = random.randrange(n)
+        self.assertEqual(ecc.glv_multiplication(z, point),
+                         ref.scalar_multiplication(z, point))
+
+        # φ(P) = (beta * x, y) = lambda * P
+        x, y = point
+        self.assertEqual(((SECP256K1.glv["beta"] * x) % SECP256K1.p, y),
+                         ref.scalar_multiplication(lam, point))
+
+    def test_multi_scalar_mul(self):
+
+        for curve in CURVES:
+            ecc = ECC(curve)
+            ref = reference(curve)
+
+            # Straus below `MSM_STRAUS_MAX` points, Pippenger above
+            for size in (3, 40):
+                points = [random_point(curve) for _ in range(size)]
+                scalars = [random.randrange(curve.n) for _ in range(size)]
+                points[1] = INFINITY
+                scalars[2] = 0
+
+                expected = INFINITY
+                for z, point in zip(scalars, points):
+                    expected = ref.point_addition(
+                        expected, ref.scalar_multiplication(z, point))
+
+                self.assertEqual(ecc.multi_scalar_mul(scalars, points),
+                                 expected)
+                self.assertEqual(ecc.multi_scalar_mul(scalars, points, window=3),
+                                 expected)
+
+            self.assertIs(ecc.multi_scalar_mul([0], [curve.g]), INFINITY)
+
+    def test_batch(self):
+
+        for curve in CURVES:
+            ecc = ECC(curve)
+            ref = reference(curve)
+            p = curve.p
+            P = random_point(curve)
+            Q = random_point(curve)
+            neg_P = (P[0], p - P[1])
+
+            jacobian = [ecc.to_jacobian(P), ecc.jacobian_infinity,
+                        ecc.jacobian_double(ecc.to_jacobian(Q))]
+            self.assertEqual(ecc.batch_to_affine(jacobian),
+                             [P, INFINITY, ref.point_addition(Q, Q)])
+
+            a = [P, P, P, INFINITY, INFINITY]
+            b = [Q, P, neg_P, Q, INFINITY]
+            self.assertEqual(ecc.batch_add(a, b),
+                             [ref.point_addition(x, y) for x, y in zip(a, b)])
+
+            scalars = [random.randrange(curve.n) for _ in range(3)] + [0]
+            points = [P, Q, P, Q]
+            self.assertEqual(
+                ecc.batch_scalar_multiplication(scalars, points),
+                [ref.scalar_multiplication(z, point)
+                 for z, point in zip(scalars, points)])
+
+    def test_sec1(self):
+
+        for curve in CURVES:
+            ecc = ECC(curve)
+            points = [random_point(curve) for _ in range(5)]
+
+            for compressed in (True, False):
+                for point in points:
+                    encoded = ecc.encode_point(point, compressed)
+                    self.assertEqual(len(encoded),
+                                     1 + curve.byte_length * (1 if compressed else 2))
+                    decoded = ecc.decode_point(encoded)
+                    self.assertIsInstance(decoded, Point)
+                    self.assertEqual(decoded, point)
+
+                buffer = ecc.batch_encode_points(points, compressed)
+                self.assertEqual(ecc.batch_decode_points(buffer, compressed),
+                                 points)
+
+            self.assertEqual(ecc.encode_point(INFINITY), b"\x00")
+            self.assertIs(ecc.decode_point(b"\x00"), INFINITY)
+
+            # Points not on the curve and invalid encodings are rejected
+            x, y = points[0]
+            length = curve.byte_length
+            not_on_curve = (b"\x04" + x.to_bytes(length, "big") +
+                            ((y + 1) % curve.p).to_bytes(length, "big"))
+            self.assertRaises(Exception, ecc.decode_point, not_on_curve)
+            self.assertRaises(Exception, ecc.decode_point,
+                              b"\x02" + curve.p.to_bytes(length, "big"))
+            self.assertRaises(Exception, ecc.decode_point,
+                              b"\x05" + x.to_bytes(length, "big"))
+            self.assertRaises(Exception, ecc.batch_decode_points, b"\x02")
+
+        # x = 3 has no point on the toy curve (38 is not a square mod 10009)
+        self.assertRaises(Exception, ECC(TOY).decode_point, b"\x02\x00\x03")
+
+    def test_double_scalar_mul(self):
+
+        for curve in CURVES:
+            ecc = ECC(curve)
+            ref = reference(curve)
+            P = random_point(curve)
+            Q = random_point(curve)
+            u1 = random.randrange(curve.n)
+            u2 = random.randrange(curve.n)
+
+            # The generator is multiplied from its fixed-base table
+            for first in (curve.g, P):
+                expected = ref.point_addition(
+                    ref.scalar_multiplication(u1, first),
+                    ref.scalar_multiplication(u2, Q))
+                self.assertEqual(ecc.double_scalar_mul(u1, first, u2, Q),
+                                 expected)
+
+            self.assertEqual(ecc.double_scalar_mul(u1, P, 0, INFINITY),
+                             ref.scalar_multiplication(u1, P))
+            self.assertIs(ecc.double_scalar_mul(1, P, curve.n - 1, P), INFINITY)
@@ -0,0 +1,88 @@
+import collections
+import unittest
+
+from utils import curves
+from utils.curves import P256, P384, SECP256K1, CurveContext, get_curve
+from utils.ecc import ECC
+
+
+class TestCurves(unittest.TestCase):
+
+    def setUp(self):
+
+        # The curves registered by a test are removed after it
+        registry = (dict(curves._CURVES), dict(curves._CURVES_BY_NAME),
+                    dict(curves._OTHER_GENERATORS))
+
+        def restore():
+            curves._CURVES.clear()
+            curves._CURVES.update(registry[0])
+            curves._CURVES_BY_NAME.clear()
+            curves._CURVES_BY_NAME.update(registry[1])
+            curves._OTHER_GENERATORS.clear()
+            curves._OTHER_GENERATORS.update(registry[2])
+
+        self.addCleanup(restore)
+
+    def test_generators_on_curve(self):
+
+        for curve in (SECP256K1, P256, P384):
+            x, y = curve.g
+            self.assertEqual((y * y) % curve.p,
+                             (x ** 3 + curve.a * x + curve.b) % curve.p)
+
+    def test_registry(self):
+
+        self.assertIs(get_curve("secp256k1"), SECP256K1)
+        self.assertIs(get_curve("secp256r1"), P256)
+        self.assertIs(get_curve("P-384"), P384)
+        self.assertIs(CurveContext.get(P256), P256)
+        self.assertRaises(Exception, get_curve, "unknown")
+
+        # A namedtuple with the parameters of a registered curve gets its context
+        EllipticCurve = collections.namedtuple(
+            'EllipticCurve', 'name p a b g n h')
+        curve = EllipticCurve('secp256k1', SECP256K1.p, SECP256K1.a,
+                              SECP256K1.b, SECP256K1.g, SECP256K1.n, 1)
+        self.assertIs(CurveContext.get(curve), SECP256K1)
+
+        # Another generator of a registered curve keeps its endomorphism
+        ecc = ECC(SECP256K1)
+        g2 = ecc.scalar_multiplication(2, SECP256K1.g)
+        other = EllipticCurve('secp256k1', SECP256K1.p, SECP256K1.a,
+                              SECP256K1.b, g2, SECP256K1.n, 1)
+        ctx = CurveContext.get(other)
+        self.assertIsNot(ctx, SECP256K1)
+        self.assertIs(CurveContext.get(other), ctx)
+        self.assertEqual(ctx.g, g2)
+        self.assertIs(ctx.glv, SECP256K1.glv)
+        self.assertIs(get_curve("secp256k1"), SECP256K1)
+        self.assertEqual(ECC(ctx).fixed_base_multiplication(3),
+                         ecc.scalar_multiplication(6, SECP256K1.g))
+
+        # Unknown parameters get a new context, created once
+        toy = EllipticCurve('toy', 13, 0, 7, (7, 5), 7, 1)
+        ctx = CurveContext.get(toy)
+        self.assertIsNot(ctx, SECP256K1)
+        self.assertIs(CurveContext.get(toy), ctx)
+        self.assertIs(get_curve("toy"), ctx)
+
+        # A name can not be reused for other parameters
+        fake = EllipticCurve('secp256k1', SECP256K1.p, SECP256K1.a, 5,
+                             SECP256K1.g, SECP256K1.n, 1)
+        self.assertRaises(Exception, CurveContext.get, fake)
+        self.assertIs(get_curve("secp256k1"), SECP256K1)
+
+    def test_sqrt(self):
+
+        # 13 = 1 mod 4 and p = 3 mod 4 for secp256k1
+        toy = CurveContext('toy-sqrt', 13, 0, 7, (7, 5), 7, 1)
+        for curve in (toy, SECP256K1):
+            for value in range(1, 20):
+                root = curve.sqrt(value)
+                if root is None:
+                    self.assertEqual(pow(value, (curve.p - 1) // 2, curve.p),
+                                     curve.p - 1)
+                else:
+                    self.assertEqual((root * root) % curve.p, value % curve.p)
+
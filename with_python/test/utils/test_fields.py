@@ -1,6 +1,10 @@
+import random
 import unittest
 
-from utils.fields import Field
+from utils import fields
+from utils.fields import (Field, FieldContext, FieldVector, FixedBaseExp,
+                          MontgomeryContext, MontgomeryField, SqrtContext,
+                          TypedField, legendre_symbol, multi_exp)
 
 
 class TestFields(unittest.TestCase):
@@ -95,6 +99,31 @@ class TestFields(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_sqrt_non_square(self):
+        b = Field(2, 13)
+        self.assertTrue(b.legendre() == -1)
+
+        b_sqrt = Field(5, 13)
+
+        self.assertIsNone(b_sqrt.sqrt(b))
+        self.assertEqual(b_sqrt, Field(5, 13))
+
+    def test_sqrt_context(self):
+        # Primes with 2-adicity 1, 2, 4, 5, 8 and 9, each with Tonelli-Shanks
+        # (window 0) and with lookup tables of several widths
+        for p in (7, 13, 17, 97, 3329, 7681):
+            for window in (None, 0, 1, 4):
+                ctx = SqrtContext(p, window)
+                for a in range(p):
+                    is_square, root = ctx.sqrt_and_is_square(a)
+
+                    self.assertEqual(
+                        is_square, a == 0 or legendre_symbol(a, p) == 1)
+                    if is_square:
+                        self.assertEqual((root * root) % p, a)
+                    else:
+                        self.assertIsNone(root)
+
     def test_neg(self):
         b = Field(3, 13)
         self.assertTrue(b.legendre() == 1)
@@ -114,6 +143,25 @@ class TestFields(unittest.TestCase):
 
         self.assertEqual(three, deserialised_three)
 
+    def test_batch_serialise(self):
+        values = [Field(i, 13) for i in range(13)]
+
+        buffer = Field.batch_to_bytes(values, 2)
+        self.assertEqual(bytes(buffer), b''.join(v.to_bytes(2) for v in values))
+
+        out = bytearray(len(buffer) + 2)
+        Field.batch_to_bytes(values, 2, memoryview(out)[2:])
+        self.assertEqual(out[2:], buffer)
+
+        deserialised = Field.batch_from_bytes(buffer, 13, 2)
+        self.assertEqual(deserialised, values)
+
+        non_canonical = buffer + Field(13, 17).to_bytes(2)
+        self.assertIsNone(Field.batch_from_bytes(non_canonical, 13, 2))
+        self.assertEqual(
+            Field.batch_from_bytes(non_canonical, 13, 2, False),
+            values + [Field(0, 13)])
+
     def test_multi_inv(self):
         values = [Field(1, 13), Field(2, 13), Field(3, 13)]
 
@@ -122,6 +170,253 @@ class TestFields(unittest.TestCase):
 
         self.assertEqual(got_inverse, expected_inverse)
 
+    def test_multi_inv_zeros(self):
+        values = [Field(0, 13), Field(2, 13), Field(0, 13), Field(3, 13)]
+
+        got_inverse = Field.multi_inv(values)
+
+        self.assertEqual(got_inverse, [Field(0, 13), Field(7, 13),
+                                       Field(0, 13), Field(9, 13)])
+        self.assertEqual(Field.multi_inv([]), [])
+
+    def test_multi_inv_chunked(self):
+        values = [Field(i, 13) for i in range(40)]
+
+        expected_inverse = Field.multi_inv(values)
+
+        for chunk_size in (1, 3, 13, 100):
+            got_inverse = Field.multi_inv(values, chunk_size)
+            self.assertEqual(got_inverse, expected_inverse)
+
+    def test_dup(self):
+        a = Field(5, 13)
+
+        b = a.dup()
+        b.add(b, Field(1, 13))
+
+        self.assertEqual(a, Field(5, 13))
+        self.assertEqual(b, Field(6, 13))
+
+    def test_from_reduced(self):
+        a = Field(5, 13)
+
+        got = Field.from_reduced(5, a.ctx)
+
+        self.assertEqual(got, a)
+        self.assertEqual(got.modulus, 13)
+        self.assertIs(got.ctx, Field(18, 13).ctx)
+
+
+class F13(TypedField):
+    __slots__ = ()
+
+    field_ctx = FieldContext.get(13)
+
+
+class F17(TypedField):
+    __slots__ = ()
+
+    field_ctx = FieldContext.get(17)
+
+
+class TestTypedFields(unittest.TestCase):
+
+    def setUp(self):
+        self.checked = fields.CHECKED
+        fields.CHECKED = False
+
+    def tearDown(self):
+        fields.CHECKED = self.checked
+
+    def test_arithmetic(self):
+        a = F13(19)
+        b = F13(56)
+
+        self.assertIsInstance(a * b, F13)
+        self.assertEqual(a * b, F13(1064))
+        self.assertEqual(a + b, F13(75))
+        self.assertEqual(a - b, F13(-37))
+        self.assertEqual(-a, F13(-19))
+        self.assertEqual((a / b) * b, a)
+
+    def test_constants(self):
+        one = F13.constant(1)
+
+        self.assertIs(F13.constant(14), one)
+        self.assertIsInstance(one, F13)
+        self.assertEqual(one, F13(1))
+
+        with self.assertRaises(AttributeError):
+            one.add(one, one)
+        with self.assertRaises(AttributeError):
+            one.inv(F13(2))
+        self.assertEqual(one, F13(1))
+
+        two = one + one
+        two.add(two, one)
+        self.assertEqual(two, F13(3))
+
+        copy = one.dup()
+        copy.mul(copy, F13(5))
+        self.assertEqual(copy, F13(5))
+
+    def test_checked_mode(self):
+        a = F13(3)
+        b = F17(3)
+
+        # Mixing fields is not detected in the default release mode
+        a + b
+
+        fields.CHECKED = True
+        with self.assertRaises(AssertionError):
+            a + b
+        with self.assertRaises(AssertionError):
+            F13(0).mul(a, b)
+
+
+class F13Mont(MontgomeryField):
+    __slots__ = ()
+
+    mont_ctx = MontgomeryContext(13)
+    field_cls = F13
+
+
+class TestMontgomery(unittest.TestCase):
+
+    def test_round_trip(self):
+        values = [F13(i) for i in range(13)]
+
+        got = F13Mont.batch_to_field(F13Mont.batch_from_field(values))
+
+        self.assertEqual(got, values)
+        self.assertEqual(F13Mont.from_field(F13(7)).to_field(), F13(7))
+
+    def test_arithmetic(self):
+        for i in range(13):
+            for j in range(13):
+                a, b = F13(i), F13(j)
+                a_mont, b_mont = F13Mont(i), F13Mont(j)
+
+                self.assertEqual((a_mont * b_mont).to_field(), a * b)
+                self.assertEqual((a_mont + b_mont).to_field(), a + b)
+                self.assertEqual((a_mont - b_mont).to_field(), a - b)
+                self.assertEqual((-a_mont).to_field(), -a)
+
+    def test_mont_mul_sqr(self):
+        ctx = MontgomeryContext(13)
+        a = ctx.to_mont(5)
+        b = ctx.to_mont(7)
+
+        self.assertEqual(ctx.from_mont(ctx.mont_mul(a, b)), 35 % 13)
+        self.assertEqual(ctx.from_mont(ctx.mont_sqr(a)), 25 % 13)
+
+
+class TestFieldVector(unittest.TestCase):
+
+    # 2 ** 255 - 19, large enough to need several limbs
+    modulus = 57896044618658097711785492504343953926634992332820282019728792003956564819949
+
+    def setUp(self):
+        random.seed(0)
+        self.a = [random.randrange(self.modulus) for _ in range(50)] + \
+            [0, 1, self.modulus - 1]
+        self.b = [random.randrange(self.modulus) for _ in range(50)] + \
+            [self.modulus - 1, 0, self.modulus - 1]
+
+    def test_round_trip(self):
+        values = [F13(i) for i in range(13)]
+
+        got = FieldVector.from_fields(values).to_fields()
+
+        self.assertEqual(got, values)
+        self.assertIsInstance(got[0], F13)
+
+    def test_arithmetic(self):
+        modulus = self.modulus
+        a = FieldVector.from_ints(self.a, modulus)
+        b = FieldVector.from_ints(self.b, modulus)
+
+        self.assertEqual((a + b).to_ints(),
+                         [(x + y) % modulus for x, y in zip(self.a, self.b)])
+        self.assertEqual((a - b).to_ints(),
+                         [(x - y) % modulus for x, y in zip(self.a, self.b)])
+        self.assertEqual((a * b).to_ints(),
+                         [(x * y) % modulus for x, y in zip(self.a, self.b)])
+        self.assertEqual(a.square().to_ints(),
+                         [(x * x) % modulus for x in self.a])
+        self.assertEqual((-a).to_ints(), [-x % modulus for x in self.a])
+
+    def test_serialise(self):
+        a = FieldVector.from_ints(self.a, self.modulus)
+
+        buffer = a.to_bytes()
+        self.assertEqual(bytes(buffer), b''.join(
+            v.to_bytes(32, byteorder='little') for v in self.a))
+        self.assertEqual(FieldVector.from_bytes(buffer, self.modulus), a)
+
+        non_canonical = buffer + self.modulus.to_bytes(32, byteorder='little')
+        self.assertIsNone(FieldVector.from_bytes(non_canonical, self.modulus))
+        self.assertEqual(
+            FieldVector.from_bytes(non_canonical, self.modulus, False).to_ints(),
+            self.a + [0])
+
+    def test_reduce(self):
+        a = FieldVector.from_ints(self.a, self.modulus)
+        # The limbs of the montgomery form are arbitrary values below 2 ** 256
+        reduced = FieldVector.reduce(a.limbs, self.modulus)
+
+        self.assertEqual(reduced.to_ints(),
+                         [(x << 256) % self.modulus for x in self.a])
+
+
+class TestExponentiation(unittest.TestCase):
+
+    modulus = 1000003
+
+    def test_fixed_base(self):
+        random.seed(0)
+        fixed_base = FixedBaseExp(5, self.modulus, window=3, max_bits=8)
+
+        exponents = [0, 1, 2, 7, 8, -1, -12] + \
+            [random.randrange(1 << 300) for _ in range(10)]
+        for exponent in exponents:
+            self.assertEqual(fixed_base.pow(exponent),
+                             pow(5, exponent, self.modulus))
+
+        self.assertIs(FixedBaseExp.get(5, self.modulus),
+                      FixedBaseExp.get(5 + self.modulus, self.modulus))
+
+    def test_fixed_base_cache(self):
+        # The table is sized from the modulus
+        fixed_base = FixedBaseExp(5, self.modulus, window=4)
+        self.assertEqual(len(fixed_base.table), 5)
+
+        cached = dict(fields._FIXED_BASES)
+        fields._FIXED_BASES.clear()
+        self.addCleanup(fields._FIXED_BASES.update, cached)
+
+        first = FixedBaseExp.get(2, self.modulus)
+        for base in range(3, 3 + fields.FIXED_BASES_MAX):
+            FixedBaseExp.get(base, self.modulus)
+        self.assertLessEqual(len(fields._FIXED_BASES), fields.FIXED_BASES_MAX)
+        self.assertIsNot(FixedBaseExp.get(2, self.modulus), first)
+
+    def test_multi_exp(self):
+        random.seed(0)
+        modulus = self.modulus
+
+        # Straus for the small sizes and Pippenger for the large ones
+        for n in (0, 1, 5, 31, 32, 100):
+            bases = [random.randrange(1, modulus) for _ in range(n)]
+            exponents = [random.randrange(-modulus, 1 << 64)
+                         for _ in range(n)]
+
+            expected = 1
+            for base, exponent in zip(bases, exponents):
+                expected = (expected * pow(base, exponent, modulus)) % modulus
+
+            self.assertEqual(multi_exp(bases, exponents, modulus), expected)
+
 
 def _naive_multi_inv(values: list[Field]):
 
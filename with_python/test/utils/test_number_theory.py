@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from utils.fields import legendre_symbol
+from utils.number_theory import (extended_gcd, gcd_by_ea, gcd_by_eea,
+                                 jacobi_symbol, mod_inverse, mod_inverse_binary)
+
+
+class TestNumberTheory(unittest.TestCase):
+
+    def test_extended_gcd(self):
+
+        for _ in range(100):
+            a = random.randrange(1, 1 << 64)
+            b = random.randrange(1, 1 << 64)
+            gcd, x, y = extended_gcd(a, b)
+            self.assertEqual(gcd, gcd_by_ea(a, b))
+            self.assertEqual(a * x + b * y, gcd)
+
+        # Same coefficients as the last row of the table
+        table = gcd_by_eea(240, 46)
+        self.assertEqual(extended_gcd(240, 46), (2, table[-1][5], table[-1][8]))
+
+    def test_mod_inverse(self):
+
+        modulus = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
+        for _ in range(100):
+            a = random.randrange(1, modulus)
+            self.assertEqual((a * mod_inverse(a, modulus)) % modulus, 1)
+            self.assertEqual(mod_inverse_binary(a, modulus),
+                             mod_inverse(a, modulus))
+
+        # Negative values and values above the modulus are reduced first
+        self.assertEqual(mod_inverse(-3, 7), 2)
+        self.assertEqual(mod_inverse_binary(10, 7), 5)
+        self.assertEqual(mod_inverse_binary(1, 7), 1)
+
+    def test_mod_inverse_not_invertible(self):
+
+        self.assertRaises(Exception, mod_inverse, 6, 9)
+        self.assertRaises(Exception, mod_inverse_binary, 6, 9)
+        self.assertRaises(Exception, mod_inverse_binary, 9, 9)
+        self.assertRaises(Exception, mod_inverse, 0, 7)
+
+    def test_jacobi_symbol(self):
+
+        modulus = 0x73eda753299d7d483339d80809a1d80553bda402fffe5bfeffffffff00000001
+        for a in [0, 1, 2, modulus - 1, -1] + \
+                [random.randrange(modulus) for _ in range(100)]:
+            self.assertEqual(jacobi_symbol(a, modulus), legendre_symbol(a, modulus))
+
+        # Composite n: (2|15) = (2|3)(2|5) = 1 although 2 is not a square mod 15
+        self.assertEqual(jacobi_symbol(2, 15), 1)
+        self.assertEqual(jacobi_symbol(5, 15), 0)
+        self.assertEqual(jacobi_symbol(7, 15), -1)
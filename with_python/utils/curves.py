@@ -0,0 +1,194 @@
+"""
+Named elliptic curves of the form y**2 mod p = (x**3 + ax + b) mod p (see `utils/ecc/weierstrass.py`).
+
+Every curve is a single `CurveContext` for the whole process, which holds its domain
+parameters along with everything computed from them (fixed-base tables, square
+root constants, endomorphism data). So the tables built by one module are reused by
+all the others working on the same curve:
+
+    from utils.curves import SECP256K1
+    from utils.ecc import ECC
+
+    ecc = ECC(SECP256K1)
+
+Curves can also be looked up by name with `get_curve("P-256")`.
+"""
+
+from .fields import SqrtContext
+
+# The GLV endomorphism of secp256k1, see `ECC.glv_multiplication`:
+#
+#     φ(x, y) = (beta * x, y) = lambda * (x, y)
+#
+# where beta and lambda are cube roots of unity mod p and mod n. `basis` is a
+# short basis (a1, b1), (a2, b2) of the lattice of (k1, k2) with
+# k1 + k2 * lambda = 0 mod n, used to split scalars (see `ECC.glv_decompose`).
+SECP256K1_GLV = {
+    "beta": 0x7ae96a2b657c07106e64479eac3434e99cf0497512f58995c1396c28719501ee,
+    "lambda": 0x5363ad4cc05c30e0a5261c028812645a122e22ea20816678df02967c1b23bd72,
+    "basis": ((0x3086d221a7d46bcde86c90e49284eb15,
+               -0xe4437ed6010e88286f547fa90abfe4c3),
+              (0x114ca50f7a8e2f3f657c1108d9d44cfd8,
+               0x3086d221a7d46bcde86c90e49284eb15)),
+}
+
+
+class CurveContext:
+
+    """
+    The domain parameters of a curve (same fields as the `EllipticCurve` namedtuple
+    used in the examples) and the data precomputed from them.
+
+    `fixed_base_tables` is filled by `ECC.fixed_base_table`, and the square root
+    constants are only computed on the first decompression.
+    """
+
+    __slots__ = ('name', 'p', 'a', 'b', 'g', 'n', 'h', 'glv', 'byte_length',
+                 'fixed_base_tables', '_sqrt_ctx')
+
+    def __init__(self, name: str, p: int, a: int, b: int, g: tuple[int, int],
+                 n: int, h: int, glv: dict = None) -> None:
+        self.name = name
+        self.p = p
+        self.a = a
+        self.b = b
+        self.g = tuple(g)
+        self.n = n
+        self.h = h
+        self.glv = glv
+
+        # Length of an encoded coordinate, see `ECC.encode_point`
+        self.byte_length = (p.bit_length() + 7) // 8
+
+        # (point, window) -> `FixedBaseTable`
+        self.fixed_base_tables = {}
+        self._sqrt_ctx = None
+
+    def __repr__(self) -> str:
+        return f"CurveContext({self.name})"
+
+    def sqrt(self, value: int) -> int | None:
+        """
+        A square root of value mod p, or None if there is none
+        """
+
+        p = self.p
+        if p % 4 == 3:
+            # value ** ((p + 1) / 4) is a square root of value when there is one
+            root = pow(value, (p + 1) // 4, p)
+            return root if (root * root) % p == value % p else None
+
+        if self._sqrt_ctx is None:
+            self._sqrt_ctx = SqrtContext.get(p)
+        return self._sqrt_ctx.sqrt(value)
+
+    def get(curve) -> 'CurveContext':
+        """
+        Returns the context of `curve`, given by name or as any object with the
+        attributes `name p a b g n h` (like the `EllipticCurve` namedtuples). A curve
+        that is not registered yet is registered on first use, which fails if its
+        name is already used by a curve with other parameters. A registered curve
+        given with another generator gets a context of its own, which shares the
+        endomorphism data of the registered one.
+        """
+
+        if isinstance(curve, CurveContext):
+            return curve
+
+        if isinstance(curve, str):
+            ctx = _CURVES_BY_NAME.get(curve)
+            if ctx is None:
+                raise Exception(f"unknown curve {curve}")
+            return ctx
+
+        key = _curve_key(curve)
+        ctx = _CURVES.get(key)
+        if ctx is None:
+            return register_curve(CurveContext(
+                curve.name, curve.p, curve.a, curve.b, curve.g, curve.n,
+                curve.h))
+
+        g = tuple(curve.g)
+        if ctx.g == g:
+            return ctx
+
+        other = _OTHER_GENERATORS.get((key, g))
+        if other is None:
+            other = CurveContext(curve.name, curve.p, curve.a, curve.b, g,
+                                 curve.n, curve.h, ctx.glv)
+            _OTHER_GENERATORS[(key, g)] = other
+        return other
+
+
+_CURVES: dict[tuple, CurveContext] = {}
+_CURVES_BY_NAME: dict[str, CurveContext] = {}
+# (curve key, generator) -> context, for registered curves used with another
+# generator
+_OTHER_GENERATORS: dict[tuple, CurveContext] = {}
+
+
+def _curve_key(curve) -> tuple:
+    # The generator is left out, so the same curve is recognized whichever
+    # generator it is given with
+    return (curve.p, curve.a % curve.p, curve.b % curve.p, curve.n)
+
+
+def register_curve(ctx: CurveContext, *aliases: str) -> CurveContext:
+    """
+    Makes `ctx` the context of its curve, also reachable by its name and `aliases`.
+    Raises an exception if one of the names is already taken by another curve.
+    """
+
+    key = _curve_key(ctx)
+    for name in (ctx.name,) + aliases:
+        other = _CURVES_BY_NAME.get(name)
+        if other is not None and _curve_key(other) != key:
+            raise Exception(
+                f"the name {name} is already used by another curve")
+
+    _CURVES[key] = ctx
+    for name in (ctx.name,) + aliases:
+        _CURVES_BY_NAME[name] = ctx
+    return ctx
+
+
+def get_curve(name: str) -> CurveContext:
+    return CurveContext.get(name)
+
+
+# Bitcoin's curve
+SECP256K1 = register_curve(CurveContext(
+    'secp256k1',
+    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
+    a=0,
+    b=7,
+    g=(0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
+       0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8),
+    n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
+    h=1,
+    glv=SECP256K1_GLV,
+))
+
+# NIST P-256
+P256 = register_curve(CurveContext(
+    'P-256',
+    p=0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff,
+    a=0xffffffff00000001000000000000000000000000fffffffffffffffffffffffc,
+    b=0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b,
+    g=(0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+       0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5),
+    n=0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551,
+    h=1,
+), 'secp256r1', 'prime256v1')
+
+# NIST P-384
+P384 = register_curve(CurveContext(
+    'P-384',
+    p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffeffffffff0000000000000000ffffffff,
+    a=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffeffffffff0000000000000000fffffffc,
+    b=0xb3312fa7e23ee7e4988e056be3f82d19181d9c6efe8141120314088f5013875ac656398d8a2ed19d2a85c8edd3ec2aef,
+    g=(0xaa87ca22be8b05378eb1c71ef320ad746e1d3b628ba79b9859f741e082542a385502f25dbf55296c3a545e3872760ab7,
+       0x3617de4a96262c6f5d9e98bf9292dc29f8f41dbd289a147ce9da3113b5f0b8c00a60b1ce1d7e819d7a431d7c90ea0e5f),
+    n=0xffffffffffffffffffffffffffffffffffffffffffffffffc7634d81f4372ddf581a0db248b0a77aecec196accc52973,
+    h=1,
+), 'secp384r1')
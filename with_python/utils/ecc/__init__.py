@@ -0,0 +1,3 @@
+# The short weierstrass curves (secp256k1, P-256, ...), see `weierstrass.py`
+from .weierstrass import (ECC, INFINITY, FixedBaseTable, Point,
+                          PointAtInfinity, wnaf)
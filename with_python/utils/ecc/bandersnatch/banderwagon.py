@@ -0,0 +1,138 @@
+"""
+Banderwagon: a prime order group built on bandersnatch, used by verkle tries.
+
+The bandersnatch curve has order 4 * r. Banderwagon takes the points (x, y) for which
+1 - a * x^2 is a square, and identifies every point with (-x, -y), which is the point
+plus the 2-torsion point (0, -1). This quotient group has prime order r, so there is
+no cofactor to clear, and each element has two representatives on the curve.
+
+An element is encoded as the 32 big-endian bytes of x * sign(y), where sign(y) is 1
+when y is lexicographically largest and -1 otherwise. Both representatives give the
+same bytes. Decoding rebuilds y from x and checks that 1 - a * x^2 is a square (the
+subgroup check). The square root is the only exponentiation: the check uses the
+Jacobi symbol, which is computed like a gcd.
+
+Encoding needs the affine x and y, so one inversion of z per element. For many
+elements, `batch_to_bytes` shares a single inversion between all of them.
+"""
+
+from ...number_theory import jacobi_symbol
+from .curve import A, BandersnatchAffinePoint, BandersnatchExtendedPoint
+from .fields import BASE_FIELD, BYTE_LEN, Fp, Fr
+
+
+class Banderwagon:
+
+    """
+    A banderwagon element, represented by one of its two bandersnatch points in
+    extended coordinates
+    """
+
+    point: BandersnatchExtendedPoint
+
+    def __init__(self, point: BandersnatchExtendedPoint) -> None:
+        self.point = point
+
+    def generator() -> 'Banderwagon':
+        # The bandersnatch generator is in the subgroup
+        return Banderwagon(BandersnatchExtendedPoint.generator())
+
+    def identity() -> 'Banderwagon':
+        return Banderwagon(BandersnatchExtendedPoint.identity())
+
+    def equal(p: 'Banderwagon', q: 'Banderwagon') -> bool:
+        """
+        (x1, y1) and (x2, y2) are the same element when (x2, y2) = ±(x1, y1), which is
+        x1 * y2 = x2 * y1. The z of both points cancel, so nothing is inverted.
+        """
+
+        return p.point.x * q.point.y == q.point.x * p.point.y
+
+    def subgroup_check(x: Fp) -> bool:
+        """
+        Whether a point with this x is in banderwagon: 1 - a * x^2 must be a square.
+
+        `jacobi_symbol` gives the same answer as `Fp.legendre` without its
+        exponentiation, which would cost as much as the square root of decoding.
+        """
+
+        return jacobi_symbol((Fp.one() - A * x * x).value, BASE_FIELD) == 1
+
+    def to_bytes(self) -> bytes:
+        z_inv = self.point.z.dup()
+        z_inv.inv(z_inv)
+        return _encode(self.point.x * z_inv, self.point.y * z_inv)
+
+    def batch_to_bytes(elements: list['Banderwagon']) -> list[bytes]:
+        """
+        The encodings of the elements, inverting all the z with one shared inversion
+        (see `Fp.multi_inv`)
+        """
+
+        z_invs = Fp.multi_inv([e.point.z for e in elements])
+        return [_encode(e.point.x * z_inv, e.point.y * z_inv)
+                for e, z_inv in zip(elements, z_invs)]
+
+    def from_bytes(data: bytes, subgroup_check: bool = True) -> 'Banderwagon':
+        """
+        Returns None if the bytes are not the encoding of an element: not 32 bytes,
+        not a canonical x, no point with this x, or a point outside the subgroup.
+
+        `subgroup_check` can be turned off for trusted bytes (e.g produced by
+        `to_bytes`), since it costs a Jacobi symbol.
+        """
+
+        if len(data) != BYTE_LEN:
+            return None
+
+        # `Fp.from_bytes` is little-endian
+        x = Fp.from_bytes(bytes(data)[::-1])
+        if x is None:
+            return None
+
+        # Either representative will do, so take the one with the largest y
+        y = BandersnatchAffinePoint.get_y_coordinate(x, True)
+        if y is None:
+            return None
+
+        if subgroup_check and not Banderwagon.subgroup_check(x):
+            return None
+
+        return Banderwagon(BandersnatchExtendedPoint.from_coordinates(
+            x, y, x * y, Fp.one()))
+
+    # Method overloads
+
+    def __add__(self, other):
+        return Banderwagon(self.point + other.point)
+
+    def __sub__(self, other):
+        return Banderwagon(self.point - other.point)
+
+    def __neg__(self):
+        return Banderwagon(-self.point)
+
+    def __mul__(self, other):
+        if isinstance(other, Fr) == False:
+            raise TypeError(
+                "[additive notation]: can only multiply an element by a scalar")
+        # The representatives are in the subgroup of order 2r, where GLV is right
+        # up to (0, -1), which does not change the element. x = 0 is the identity,
+        # which the endomorphism can not take
+        if self.point.x.is_zero():
+            return Banderwagon.identity()
+        result = BandersnatchExtendedPoint.identity()
+        result.glv_scalar_mul(self.point, other)
+        return Banderwagon(result)
+
+    def __eq__(self, other):
+        if isinstance(other, Banderwagon):
+            return Banderwagon.equal(self, other)
+        raise TypeError("can only check if a Banderwagon is equal to a Banderwagon")
+
+
+def _encode(x: Fp, y: Fp) -> bytes:
+    # x * sign(y), big-endian
+    if not y.lexographically_largest():
+        x = -x
+    return x.to_bytes()[::-1]
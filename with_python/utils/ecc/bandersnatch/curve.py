@@ -1,17 +1,99 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from .fields import Fp, Fr
+from .fields import SCALAR_FIELD, Fp, Fr
 import copy
 
 
-A = Fp(-5)
+# The curve constants are shared, immutable elements (see `TypedField.constant`)
+A = Fp.constant(-5)
+
+# A is small, so the formulas multiply by it with `Field.mul_small` and this int
+# rather than with a full field multiplication by `A`
+A_INT = -5
 
 d_num = Fp(138827208126141220649022263972958607803)
 d_den = Fp(171449701953573178309673572579671231137)
 d_den.inv(d_den)
 
-D = d_num * d_den
+D = Fp.constant((d_num * d_den).value)
+
+# The GLV endomorphism of bandersnatch (section 3 of the bandersnatch paper):
+#
+#     ψ(x, y) = (ENDO_C * (1 - y^2) / (x * y), ENDO_B * (y^2 + ENDO_B) / (y^2 - ENDO_B))
+#
+# which is the multiplication by LAMBDA, a square root of -2 mod r, on the points of
+# the prime order subgroup. The constants were checked against `scalar_mul`.
+ENDO_B = Fp.constant(
+    0x52c9f28b828426a561f00d3a63511a882ea712770d9af4d6ee0f014d172510b4)
+ENDO_C = Fp.constant(
+    0x6cc624cf865457c3a97c6efd6c17d1078456abcfff36f4e9515c806cdf650b3d)
+LAMBDA = 0x13b4f3dc4a39a493edf849562b38c72bcfc49db970a5056ed13d21408783df05
+
+# A short basis (a1, b1), (a2, b2) of the lattice of the (k1, k2) with
+# k1 + k2 * LAMBDA = 0 mod r, found with the extended euclidean algorithm on
+# (r, LAMBDA). Its determinant is -r.
+GLV_BASIS = ((0x555fe2004be6928e4b02f94a9789181f,
+              0x814b3eee55e8f5df8e2591a23d61f44),
+             (0x102967ddcabd1ebbf1c4b23447ac3e88,
+              -0x555fe2004be6928e4b02f94a9789181f))
+
+# Width of the NAF of the scalars in `wnaf_scalar_mul` and of their halves in
+# `glv_scalar_mul`
+WNAF_WINDOW = 5
+
+# Generator point was taken from the bandersnatch paper. Its coordinates are
+# shared constants so that `generator` does not rebuild and re-check them
+GENERATOR_X = Fp.constant(
+    0x29c132cc2c0b34c5743711777bbe42f32b79c022ad998465e1e71866a252ae18)
+GENERATOR_Y = Fp.constant(
+    0x2a6c669eda123e0f157d8b50badcd586358cad81eee464605e3167b6cc974166)
+
+# Window (in bits) of the fixed-base tables, see `FixedBaseTable`
+FIXED_BASE_WINDOW = 6
+
+
+def glv_decompose(scalar: int) -> tuple[int, int]:
+    """
+    Splits a scalar into (k1, k2) with scalar = k1 + k2 * LAMBDA mod r, both about
+    128 bits long, by subtracting from (scalar, 0) the closest vector of the
+    lattice spanned by `GLV_BASIS` (Babai's rounding)
+    """
+
+    r = SCALAR_FIELD
+    (a1, b1), (a2, b2) = GLV_BASIS
+
+    # (c1, c2) = round((scalar, 0) * basis^-1), the determinant being -r
+    c1 = (-2 * b2 * scalar + r) // (2 * r)
+    c2 = (2 * b1 * scalar + r) // (2 * r)
+
+    k1 = scalar - c1 * a1 - c2 * a2
+    k2 = -c1 * b1 - c2 * b2
+    return (k1, k2)
+
+
+def wnaf(k: int, window: int) -> list[int]:
+    """
+    The width-w non-adjacent form of k >= 0, least significant digit first: every
+    digit is 0 or odd with |digit| < 2^(w - 1), and of any w consecutive digits at
+    most one is non zero
+    """
+
+    modulus = 1 << window
+    half = 1 << (window - 1)
+
+    digits = []
+    while k:
+        if k & 1:
+            digit = k & (modulus - 1)
+            if digit >= half:
+                digit -= modulus
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        k >>= 1
+    return digits
 
 
 # Bandersnatch using affine co-ordinates
@@ -42,11 +124,20 @@ class BandersnatchAffinePoint():
         if self.is_on_curve() == False:
             raise Exception("point not on curve")
 
+    def from_coordinates(x: Fp, y: Fp) -> 'BandersnatchAffinePoint':
+        """
+        Builds a point from coordinates known to be on the curve, skipping the
+        checks of `__init__`
+        """
+
+        point = object.__new__(BandersnatchAffinePoint)
+        point.x = x
+        point.y = y
+        return point
+
     def generator():
-        # Generator point was taken from the bandersnatch paper
-        yTe = Fp(0x2a6c669eda123e0f157d8b50badcd586358cad81eee464605e3167b6cc974166)
-        xTe = Fp(0x29c132cc2c0b34c5743711777bbe42f32b79c022ad998465e1e71866a252ae18)
-        return BandersnatchAffinePoint(xTe, yTe)
+        # See `GENERATOR_X`
+        return BandersnatchAffinePoint.from_coordinates(GENERATOR_X, GENERATOR_Y)
 
     def neg(self, p: 'BandersnatchAffinePoint'):
         self.y = p.y
@@ -73,7 +164,7 @@ class BandersnatchAffinePoint():
         y1x2 = y1 * x2
 
         y1y2 = y1 * y2
-        ax1x2 = x1 * x2 * A
+        ax1x2 = (x1 * x2).mul_small(A_INT)
 
         dx1x2y1y2 = x1y2 * y1x2 * D
 
@@ -114,17 +205,17 @@ class BandersnatchAffinePoint():
         x1 = p.x
         y1 = p.y
 
-        two = Fp(2)
+        two = Fp.two()
 
         x1y1 = x1 * y1
 
         x1y1_2 = two * x1y1
 
-        y1_exp_2 = y1.exp(2)
+        y1_exp_2 = y1 * y1
 
-        x1_exp_2 = x1.exp(2)
+        x1_exp_2 = x1 * x1
 
-        a_x1_exp_2 = A * x1_exp_2
+        a_x1_exp_2 = x1_exp_2.mul_small(A_INT)
 
         x2 = x1y1_2 / (y1_exp_2 + a_x1_exp_2)
 
@@ -143,11 +234,11 @@ class BandersnatchAffinePoint():
 
         """
 
-        x_exp_2 = self.x.exp(2)
-        y_exp_2 = self.y.exp(2)
+        x_exp_2 = self.x * self.x
+        y_exp_2 = self.y * self.y
 
         dxy_sq = x_exp_2 * y_exp_2 * D
-        a_x_sq = A * x_exp_2
+        a_x_sq = x_exp_2.mul_small(A_INT)
 
         one = Fp.one()
 
@@ -158,8 +249,8 @@ class BandersnatchAffinePoint():
 
     def to_bytes(self):
 
-        # This is here to test that we have the correct generator element
-        # banderwagon uses a different serialisation algorithm
+        # This is here to test that we have the correct generator element.
+        # Banderwagon uses a different serialisation, see `banderwagon.py`
 
         mCompressedNegative = 0x80
         mCompressedPositive = 0x00
@@ -175,7 +266,7 @@ class BandersnatchAffinePoint():
         return bytes(x_bytes)
 
     def from_bytes(self):
-        # This is not needed, see `to_bytes`
+        # This is not needed, see `to_bytes` and `Banderwagon.from_bytes`
         return NotImplemented
 
     def dup(self) -> 'BandersnatchAffinePoint':
@@ -225,9 +316,9 @@ class BandersnatchAffinePoint():
         if y is None:
             return None
 
-        y.sqrt(y)
-        # This means that the square root does not exist
-        if y is None:
+        # This means that the square root does not exist. `sqrt` finds out
+        # while computing the root, so no separate legendre symbol is needed
+        if y.sqrt(y) is None:
             return None
 
         is_largest = y.lexographically_largest()
@@ -256,9 +347,8 @@ class BandersnatchAffinePoint():
         if isinstance(other, Fr) == False:
             raise TypeError(
                 "[additive notation]: can only multiply a point by a scalar")
-        result = BandersnatchAffinePoint.generator()
-        result.scalar_mul(self, other)
-        return result
+        # Computed in extended coordinates, see `BandersnatchExtendedPoint.__mul__`
+        return (BandersnatchExtendedPoint(self) * other).to_affine()
 
     def __eq__(self, other):
         if isinstance(other, BandersnatchAffinePoint):
@@ -280,13 +370,29 @@ class BandersnatchExtendedPoint():
         self.z = Fp.one()
         pass
 
+    def from_coordinates(x: Fp, y: Fp, t: Fp, z: Fp) -> 'BandersnatchExtendedPoint':
+        """
+        Builds a point from coordinates known to be valid (e.g the result of other
+        point operations), skipping the affine point and its curve check
+        """
+
+        point = object.__new__(BandersnatchExtendedPoint)
+        point.x = x
+        point.y = y
+        point.t = t
+        point.z = z
+        return point
+
     def identity():
-        affine_point = BandersnatchAffinePoint.identity()
-        return BandersnatchExtendedPoint(affine_point)
+        # The coordinates are the shared zero and one, which are immutable; the
+        # point operations replace coordinates rather than mutate them
+        zero = Fp.zero()
+        one = Fp.one()
+        return BandersnatchExtendedPoint.from_coordinates(zero, one, zero, one)
 
     def generator():
-        affine_point = BandersnatchAffinePoint.generator()
-        return BandersnatchExtendedPoint(affine_point)
+        return BandersnatchExtendedPoint.from_coordinates(
+            GENERATOR_X, GENERATOR_Y, GENERATOR_X * GENERATOR_Y, Fp.one())
 
     def neg(self, p):
         self.x = -p.x
@@ -339,7 +445,46 @@ class BandersnatchExtendedPoint():
 
         d = z1 * z2
 
-        h = b - (a * A)
+        h = b - a.mul_small(A_INT)
+
+        e = (x1 + y1) * (x2 + y2) - a - b
+
+        f = d - c
+
+        g = d + c
+
+        self.x = e * f
+        self.y = g * h
+        self.t = e * h
+        self.z = f * g
+
+        return self
+
+    def mixed_add(self, p, q):
+        """
+        Same as `add` for a `q` with z = 1 (e.g built from an affine point, or
+        normalized with `to_affine`), which saves the multiplication z1 * z2.
+
+        This is the addition to use with tables of precomputed points.
+        """
+
+        x1 = p.x
+        y1 = p.y
+        t1 = p.t
+
+        x2 = q.x
+        y2 = q.y
+        t2 = q.t
+
+        a = x1 * x2
+
+        b = y1 * y2
+
+        c = D * t1 * t2
+
+        d = p.z
+
+        h = b - a.mul_small(A_INT)
 
         e = (x1 + y1) * (x2 + y2) - a - b
 
@@ -360,8 +505,148 @@ class BandersnatchExtendedPoint():
         return self
 
     def double(self, p):
-        # TODO: can replace this with dedicated doubling formula
-        return self.add(p, p)
+        # See "Twisted Edwards Curves Revisited" (https: // eprint.iacr.org/2008/522.pdf)
+        # 3.3 Doubling in E^e ("dbl-2008-hwcd")
+        #
+        # 4 multiplications and 4 squarings, against 9 multiplications (one of them
+        # by D) for `add(p, p)`. T is not an input of the formula.
+
+        x1 = p.x
+        y1 = p.y
+        z1 = p.z
+
+        a = x1 * x1
+
+        b = y1 * y1
+
+        zz = z1 * z1
+        c = zz + zz
+
+        d = a.mul_small(A_INT)
+
+        x1_plus_y1 = x1 + y1
+        e = x1_plus_y1 * x1_plus_y1 - a - b
+
+        g = d + b
+
+        f = g - c
+
+        h = d - b
+
+        self.x = e * f
+        self.y = g * h
+        self.t = e * h
+        self.z = f * g
+
+        return self
+
+    def endomorphism(self, p):
+        """
+        ψ(p) = LAMBDA * p (see `ENDO_B`), for a point p of the prime order subgroup
+        other than the identity.
+
+        With x = X/Z and y = Y/Z:
+
+            f = ENDO_C * (Z^2 - Y^2), g = ENDO_B * (Y^2 + ENDO_B * Z^2), h = Y^2 - ENDO_B * Z^2
+            X' = f * h, Y' = g * X * Y, T' = f * g, Z' = h * X * Y
+        """
+
+        xy = p.x * p.y
+        yy = p.y * p.y
+        zz = p.z * p.z
+        b_zz = ENDO_B * zz
+
+        f = ENDO_C * (zz - yy)
+        g = ENDO_B * (yy + b_zz)
+        h = yy - b_zz
+
+        self.x = f * h
+        self.y = g * xy
+        self.t = f * g
+        self.z = h * xy
+
+        return self
+
+    def glv_scalar_mul(self, point, scalar: Fr):
+        """
+        Same result as `scalar_mul` for a point of the prime order subgroup (every
+        multiple of the generator), about twice as fast. For other points of the curve
+        the result is wrong, since ψ is only the multiplication by LAMBDA on the
+        subgroup; use `wnaf_scalar_mul` when the point is not known to be in it.
+
+            1. The scalar is split as k1 + k2 * LAMBDA with `glv_decompose`, so
+               scalar * point = k1 * point + k2 * ψ(point) with 128 bit k1 and k2.
+
+            2. Both halves are written in width-w NAF (see `wnaf`) and processed
+               together, sharing one chain of about 128 doublings. The odd multiples
+               of point and ψ(point) they need are computed first and normalized with
+               one shared inversion (see `batch_normalize`) so that the additions are
+               `mixed_add`s.
+        """
+
+        k = scalar.value
+        if k == 0 or point.is_zero():
+            result = BandersnatchExtendedPoint.identity()
+        else:
+            result = _glv_mul(point, k)
+
+        self.x = result.x
+        self.y = result.y
+        self.t = result.t
+        self.z = result.z
+
+        return self
+
+    def wnaf_scalar_mul(self, point, scalar: Fr):
+        """
+        Same result as `scalar_mul` for any point of the curve. The scalar is written
+        in width-w NAF (see `wnaf`), so there is a doubling per bit but only about one
+        `mixed_add` every w + 1 bits, from the odd multiples of point normalized with
+        one shared inversion.
+
+        This is what `point * scalar` uses, since a point of the curve is not
+        necessarily in the prime order subgroup that `glv_scalar_mul` needs.
+        """
+
+        k = scalar.value
+        if k == 0 or point.is_zero():
+            result = BandersnatchExtendedPoint.identity()
+        else:
+            result = _wnaf_mul(point, k)
+
+        self.x = result.x
+        self.y = result.y
+        self.t = result.t
+        self.z = result.z
+
+        return self
+
+    def odd_multiples(point, count: int) -> list['BandersnatchExtendedPoint']:
+        """
+        [P, 3P, 5P, ..., (2 * count - 1)P]
+        """
+
+        double = BandersnatchExtendedPoint.identity().double(point)
+
+        multiples = [point]
+        for _ in range(count - 1):
+            multiples.append(
+                BandersnatchExtendedPoint.identity().add(multiples[-1], double))
+        return multiples
+
+    def batch_normalize(
+            points: list['BandersnatchExtendedPoint']) -> list['BandersnatchExtendedPoint']:
+        """
+        Returns the points scaled to z = 1, inverting all the z with one shared
+        inversion (see `Fp.multi_inv`)
+        """
+
+        z_invs = Fp.multi_inv([p.z for p in points])
+
+        one = Fp.one()
+        return [BandersnatchExtendedPoint.from_coordinates(
+            p.x * z_inv, p.y * z_inv, p.t * z_inv, one)
+            for p, z_inv in zip(points, z_invs)]
 
     def scalar_mul(self, point, scalar: Fr):
         # Same as AffinePoint's equivalent method
@@ -393,8 +678,8 @@ class BandersnatchExtendedPoint():
             return BandersnatchAffinePoint(self.x, self.y)
         else:
             assert self.z.is_zero() == False
-            z_inv = Fp.zero()
-            z_inv.inv(self.z)
+            z_inv = self.z.dup()
+            z_inv.inv(z_inv)
 
             x_aff = self.x * z_inv
             y_aff = self.y * z_inv
@@ -428,11 +713,182 @@ class BandersnatchExtendedPoint():
         if isinstance(other, Fr) == False:
             raise TypeError(
                 "[additive notation]: can only multiply a point by a scalar")
-        result = BandersnatchExtendedPoint.generator()
-        result.scalar_mul(self, other)
+        # The generator and the registered bases are multiplied from their
+        # fixed-base table, see `register_base`
+        table = fixed_base_table(self)
+        if table is not None:
+            return table.mul(other)
+
+        # Any point of the curve, see `glv_scalar_mul` for the points known to be
+        # in the prime order subgroup
+        result = BandersnatchExtendedPoint.identity()
+        result.wnaf_scalar_mul(self, other)
         return result
 
     def __eq__(self, other):
         if isinstance(other, BandersnatchExtendedPoint):
             return BandersnatchExtendedPoint.equal(self, other)
         raise TypeError("can only check if a Point is equal to a Point")
+
+
+class FixedBaseTable:
+
+    """
+    Precomputed multiples of a fixed base P, so that multiplying P needs no doubling.
+
+    The scalar is split into w-bit digits k = d_0 + d_1 * 2^w + d_2 * 2^(2w) + ... and
+
+        table[i][d - 1] = d * 2^(w * i) * P, for every digit d in [1, 2^w - 1]
+
+    so that kP = table[0][d_0 - 1] + table[1][d_1 - 1] + ... is one `mixed_add` per
+    non zero digit: about 42 additions for a 253 bit scalar with w = 6, against the
+    128 doublings and 40 additions of `glv_scalar_mul`. The entries are normalized
+    to z = 1 with one shared inversion.
+    """
+
+    def __init__(self, base: BandersnatchExtendedPoint,
+                 window: int = FIXED_BASE_WINDOW) -> None:
+        self.window = window
+        num_windows = -(-SCALAR_FIELD.bit_length() // window)
+        row_length = (1 << window) - 1
+
+        multiples = []
+        row_base = base
+        for _ in range(num_windows):
+            multiple = row_base
+            for _ in range(row_length):
+                multiples.append(multiple)
+                multiple = BandersnatchExtendedPoint.identity().add(multiple, row_base)
+            # The last sum is 2^w * row_base, the base of the next row
+            row_base = multiple
+
+        multiples = BandersnatchExtendedPoint.batch_normalize(multiples)
+        self.table = [multiples[i:i + row_length]
+                      for i in range(0, len(multiples), row_length)]
+
+    def mul(self, scalar: Fr) -> BandersnatchExtendedPoint:
+        window = self.window
+        mask = (1 << window) - 1
+        k = scalar.value
+
+        result = BandersnatchExtendedPoint.identity()
+        for row in self.table:
+            if k == 0:
+                break
+            digit = k & mask
+            if digit:
+                result.mixed_add(result, row[digit - 1])
+            k >>= window
+
+        return result
+
+
+# Fixed-base tables by the affine coordinates of their base, see `register_base`
+_FIXED_BASE_TABLES: dict[tuple[int, int], FixedBaseTable] = {}
+
+
+def _affine_key(point: BandersnatchExtendedPoint) -> tuple[int, int]:
+    if point.z.is_one():
+        return (point.x.value, point.y.value)
+    z_inv = point.z.dup()
+    z_inv.inv(z_inv)
+    return ((point.x * z_inv).value, (point.y * z_inv).value)
+
+
+def register_base(point: BandersnatchExtendedPoint) -> FixedBaseTable:
+    """
+    Builds the fixed-base table of a point that is multiplied many times (e.g the
+    bases of a Pedersen or IPA commitment). From then on, `point * scalar` uses it.
+    The table is only built once per point.
+    """
+
+    key = _affine_key(point)
+    table = _FIXED_BASE_TABLES.get(key)
+    if table is None:
+        table = FixedBaseTable(point)
+        _FIXED_BASE_TABLES[key] = table
+    return table
+
+
+def fixed_base_table(point: BandersnatchExtendedPoint) -> FixedBaseTable | None:
+    """
+    The table of `point` if it was registered, None otherwise. The table of the
+    generator is built on its first use.
+
+    This runs before every `point * scalar`, so a point with z != 1 is only
+    normalized (one inversion) when bases other than the generator are registered;
+    it is compared with the generator by cross-multiplication.
+    """
+
+    if point.is_zero():
+        return None
+
+    generator_key = (GENERATOR_X.value, GENERATOR_Y.value)
+    if point.z.is_one():
+        key = (point.x.value, point.y.value)
+    elif point.x == GENERATOR_X * point.z and point.y == GENERATOR_Y * point.z:
+        key = generator_key
+    elif len(_FIXED_BASE_TABLES) > (generator_key in _FIXED_BASE_TABLES):
+        key = _affine_key(point)
+    else:
+        return None
+
+    table = _FIXED_BASE_TABLES.get(key)
+    if table is None and key == generator_key:
+        table = register_base(BandersnatchExtendedPoint.generator())
+    return table
+
+
+def _glv_mul(point: BandersnatchExtendedPoint, k: int) -> BandersnatchExtendedPoint:
+    # See `BandersnatchExtendedPoint.glv_scalar_mul`, for 0 < k < r
+    k1, k2 = glv_decompose(k)
+
+    count = 1 << (WNAF_WINDOW - 2)
+    endo = BandersnatchExtendedPoint.identity().endomorphism(point)
+    multiples = BandersnatchExtendedPoint.batch_normalize(
+        BandersnatchExtendedPoint.odd_multiples(point, count) +
+        BandersnatchExtendedPoint.odd_multiples(endo, count))
+
+    tables = []
+    for k_i, table in ((k1, multiples[:count]), (k2, multiples[count:])):
+        negated = [BandersnatchExtendedPoint.from_coordinates(-q.x, q.y, -q.t, q.z)
+                   for q in table]
+        # A negative half uses the negated multiples
+        if k_i < 0:
+            tables.append((wnaf(-k_i, WNAF_WINDOW), negated, table))
+        else:
+            tables.append((wnaf(k_i, WNAF_WINDOW), table, negated))
+
+    length = max(len(naf) for naf, _, _ in tables)
+
+    result = BandersnatchExtendedPoint.identity()
+    for i in reversed(range(length)):
+        result.double(result)
+        for naf, positive, negative in tables:
+            if i >= len(naf):
+                continue
+            digit = naf[i]
+            if digit > 0:
+                result.mixed_add(result, positive[digit >> 1])
+            elif digit < 0:
+                result.mixed_add(result, negative[-digit >> 1])
+
+    return result
+
+
+def _wnaf_mul(point: BandersnatchExtendedPoint, k: int) -> BandersnatchExtendedPoint:
+    # See `BandersnatchExtendedPoint.wnaf_scalar_mul`, for 0 < k < r
+    table = BandersnatchExtendedPoint.batch_normalize(
+        BandersnatchExtendedPoint.odd_multiples(point, 1 << (WNAF_WINDOW - 2)))
+    negated = [BandersnatchExtendedPoint.from_coordinates(-q.x, q.y, -q.t, q.z)
+               for q in table]
+
+    result = BandersnatchExtendedPoint.identity()
+    for digit in reversed(wnaf(k, WNAF_WINDOW)):
+        result.double(result)
+        if digit > 0:
+            result.mixed_add(result, table[digit >> 1])
+        elif digit < 0:
+            result.mixed_add(result, negated[-digit >> 1])
+
+    return result
@@ -1,4 +1,5 @@
-from utils.fields import Field
+from utils.fields import (Field, FieldContext, FieldVector,
+                          MontgomeryContext, MontgomeryField, TypedField)
 
 
 # This is the basefield(modulus) assosciated with the bandersnatch curve
@@ -15,29 +16,39 @@ Q_MIN_ONE_DIV_2_SCALAR_FIELD = (SCALAR_FIELD - 1) // 2
 
 BYTE_LEN = 32
 
+BASE_FIELD_CTX = FieldContext.get(BASE_FIELD)
 
-class Fp(Field):
+SCALAR_FIELD_CTX = FieldContext.get(SCALAR_FIELD)
+
+BASE_FIELD_MONT_CTX = MontgomeryContext(BASE_FIELD)
+
+SCALAR_FIELD_MONT_CTX = MontgomeryContext(SCALAR_FIELD)
+
+
+class Fp(TypedField):
 
     """
     A generic implementation of a finite field over the modulus of the bandersnatch curve
     """
 
-    def __init__(self, value=None, generic_field=None) -> None:
-        if generic_field is not None:
-            assert generic_field.modulus == BASE_FIELD
-            super().__init__(generic_field.value, BASE_FIELD)
-            return
+    __slots__ = ()
 
-        super().__init__(value, BASE_FIELD)
+    field_ctx = BASE_FIELD_CTX
 
     def zero() -> 'Fp':
-        return Fp(None, Field.zero(BASE_FIELD))
+        return Fp.constant(0)
 
     def one() -> 'Fp':
-        return Fp(None, Field.one(BASE_FIELD))
+        return Fp.constant(1)
+
+    def two() -> 'Fp':
+        return Fp.constant(2)
 
     def from_bytes(bytes) -> 'Fp':
-        return Fp(None, Field.from_bytes(bytes, BASE_FIELD))
+        value = Field.from_bytes(bytes, BASE_FIELD)
+        if value is None:
+            return None
+        return Fp.from_reduced(value.value, BASE_FIELD_CTX)
 
     def from_bytes_reduce(bytes) -> 'Fp':
         return Fp(None, Field.from_bytes_reduce(bytes, BASE_FIELD))
@@ -45,56 +56,50 @@ class Fp(Field):
     def to_bytes(self) -> bytes:
         return super().to_bytes(BYTE_LEN)
 
-    def lexographically_largest(self) -> bool:
-        return super().lexographically_largest(Q_MIN_ONE_DIV_2_BASE_FIELD)
+    def batch_to_bytes(values: list['Fp'],
+                       out: bytearray = None) -> bytearray:
+        return Field.batch_to_bytes(values, BYTE_LEN, out)
 
-    def multi_inv(values) -> list['Fp']:
-        result = []
-        inverses = Field.multi_inv(values)
-        for inv in inverses:
-            result.append(Fp(None, inv))
-        return result
+    def batch_from_bytes(buffer,
+                         check_canonical: bool = True) -> list['Fp']:
+        return Field.batch_from_bytes(
+            buffer, BASE_FIELD, BYTE_LEN, check_canonical, Fp)
 
-    # Method overloads
+    def vector_from_bytes(buffer,
+                          check_canonical: bool = True) -> FieldVector:
+        return FieldVector.from_bytes(buffer, BASE_FIELD, check_canonical, Fp)
 
-    def __add__(self, other):
-        return Fp(None, super().__add__(other))
-
-    def __sub__(self, other):
-        return Fp(None, super().__sub__(other))
-
-    def __mul__(self, other):
-        return Fp(None, super().__mul__(other))
-
-    def __neg__(self):
-        return Fp(None, super().__neg__())
+    def lexographically_largest(self) -> bool:
+        return super().lexographically_largest(Q_MIN_ONE_DIV_2_BASE_FIELD)
 
-    def __truediv__(self, other):
-        return Fp(None, super().__truediv__(other))
+    def multi_inv(values, chunk_size: int = None) -> list['Fp']:
+        return Field.multi_inv(values, chunk_size)
 
 
-class Fr(Field):
+class Fr(TypedField):
 
     """
     A generic implementation of a finite field over the order of the bandersnatch curve
     """
 
-    def __init__(self, value=None, generic_field=None) -> None:
-        if generic_field is not None:
-            assert generic_field.modulus == SCALAR_FIELD
-            super().__init__(generic_field.value, SCALAR_FIELD)
-            return
+    __slots__ = ()
 
-        super().__init__(value, SCALAR_FIELD)
+    field_ctx = SCALAR_FIELD_CTX
 
     def zero() -> 'Fr':
-        return Fr(None, Field.zero(SCALAR_FIELD))
+        return Fr.constant(0)
 
     def one() -> 'Fr':
-        return Fr(None, Field.one(SCALAR_FIELD))
+        return Fr.constant(1)
+
+    def two() -> 'Fr':
+        return Fr.constant(2)
 
     def from_bytes(bytes) -> 'Fr':
-        return Fr(None, Field.from_bytes(bytes, SCALAR_FIELD))
+        value = Field.from_bytes(bytes, SCALAR_FIELD)
+        if value is None:
+            return None
+        return Fr.from_reduced(value.value, SCALAR_FIELD_CTX)
 
     def from_bytes_reduce(bytes) -> 'Fr':
         return Fr(None, Field.from_bytes_reduce(bytes, SCALAR_FIELD))
@@ -102,29 +107,50 @@ class Fr(Field):
     def to_bytes(self) -> 'Fr':
         return super().to_bytes(BYTE_LEN)
 
+    def batch_to_bytes(values: list['Fr'],
+                       out: bytearray = None) -> bytearray:
+        return Field.batch_to_bytes(values, BYTE_LEN, out)
+
+    def batch_from_bytes(buffer,
+                         check_canonical: bool = True) -> list['Fr']:
+        return Field.batch_from_bytes(
+            buffer, SCALAR_FIELD, BYTE_LEN, check_canonical, Fr)
+
+    def vector_from_bytes(buffer,
+                          check_canonical: bool = True) -> FieldVector:
+        return FieldVector.from_bytes(buffer, SCALAR_FIELD, check_canonical, Fr)
+
     def lexographically_largest(self) -> bool:
         return super().lexographically_largest(Q_MIN_ONE_DIV_2_SCALAR_FIELD)
 
-    def multi_inv(values) -> list['Fr']:
-        result = []
-        inverses = Field.multi_inv(values)
-        for inv in inverses:
-            result.append(Fr(None, inv))
-        return result
+    def multi_inv(values, chunk_size: int = None) -> list['Fr']:
+        return Field.multi_inv(values, chunk_size)
+
 
-    # Method Overloads
+class FpMont(MontgomeryField):
 
-    def __add__(self, other):
-        return Fr(None, super().__add__(other))
+    """
+    An element of the base field of the bandersnatch curve in montgomery form.
+
+    This is an opt-in alternative to `Fp` for long chains of multiplications.
+    Convert with `FpMont.from_field` and `to_field` at the ends of the chain.
+    """
 
-    def __sub__(self, other):
-        return Fr(None, super().__sub__(other))
+    __slots__ = ()
 
-    def __mul__(self, other):
-        return Fr(None, super().__mul__(other))
+    mont_ctx = BASE_FIELD_MONT_CTX
+    field_cls = Fp
+
+
+class FrMont(MontgomeryField):
+
+    """
+    An element of the scalar field of the bandersnatch curve in montgomery form.
+
+    See `FpMont`
+    """
 
-    def __neg__(self):
-        return Fr(None, super().__neg__())
+    __slots__ = ()
 
-    def __truediv__(self, other):
-        return Fr(None, super().__truediv__(other))
+    mont_ctx = SCALAR_FIELD_MONT_CTX
+    field_cls = Fr
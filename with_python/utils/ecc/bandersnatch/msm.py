@@ -0,0 +1,206 @@
+"""
+Multi-scalar multiplication (MSM) over bandersnatch: computes
+
+    scalars[0] * points[0] + scalars[1] * points[1] + ... + scalars[n-1] * points[n-1]
+
+much faster than n scalar multiplications, using Pippenger's bucket method.
+
+Every scalar is split into c-bit windows. For each window, the points are added into
+buckets by their digit and the buckets are combined as bucket_1 + 2 * bucket_2 + ...
+with running sums, which costs about n additions plus two per bucket for each window
+instead of one scalar multiplication per point. The digits are signed, in
+[-2^(c-1), 2^(c-1)], so that only 2^(c-1) buckets are needed (a negative digit adds
+the negated point).
+
+When the points are a fixed basis (e.g the bases of a vector commitment),
+`PrecomputedMSM` also stores every base shifted by each window, 2^(c*j) * G_i,
+which removes the doublings between windows and lets a single set of buckets be
+used for all the windows.
+"""
+
+from .curve import BandersnatchExtendedPoint
+from .fields import SCALAR_FIELD, Fr
+
+SCALAR_BITS = SCALAR_FIELD.bit_length()
+
+
+# Field multiplications of the point formulas (see
+# `benchmarks/bench_bandersnatch_formulas.py`), for `pippenger_window`
+MIXED_ADD_COST = 9
+ADD_COST = 10
+DOUBLE_COST = 8
+
+
+def pippenger_window(n: int, precomputed: bool = False) -> int:
+    """
+    The window c that minimizes the field multiplications for n points. With signed
+    digits there are 2^(c-1) buckets per window, and per window:
+
+        - about n * (1 - 2^-c) `mixed_add`s into the buckets (a digit is 0 with
+          probability 2^-c)
+        - two `add`s per bucket to sum them with running sums
+
+    plus SCALAR_BITS doublings between the windows. The shifted bases of
+    `PrecomputedMSM` need no doubling and a single set of buckets for all windows.
+    """
+
+    def cost(c):
+        num_windows = _num_windows(c)
+        num_buckets = 1 << (c - 1)
+        bucket_adds = num_windows * n * (1 - 2 ** -c) * MIXED_ADD_COST
+        if precomputed:
+            return bucket_adds + 2 * num_buckets * ADD_COST
+        return (bucket_adds + num_windows * 2 * num_buckets * ADD_COST +
+                SCALAR_BITS * DOUBLE_COST)
+
+    return min(range(2, 21), key=cost)
+
+
+def msm(scalars: list[Fr], points: list[BandersnatchExtendedPoint],
+        window: int = None) -> BandersnatchExtendedPoint:
+    """
+    The sum of scalars[i] * points[i] (same argument order as
+    `ECC.multi_scalar_mul`). The window is chosen from the number of points (see
+    `pippenger_window`) unless given.
+    """
+
+    assert len(scalars) == len(points), "one scalar per point"
+
+    if len(points) == 0:
+        return BandersnatchExtendedPoint.identity()
+
+    if window is None:
+        window = pippenger_window(len(points))
+    num_windows = _num_windows(window)
+
+    # The points are added with `mixed_add`, which needs z = 1
+    points = BandersnatchExtendedPoint.batch_normalize(points)
+    negated = [_neg(p) for p in points]
+    digits = [_signed_digits(s.value, window, num_windows) for s in scalars]
+
+    result = BandersnatchExtendedPoint.identity()
+    for j in reversed(range(num_windows)):
+        for _ in range(window):
+            result.double(result)
+
+        buckets = [None] * ((1 << (window - 1)) + 1)
+        for point, neg_point, point_digits in zip(points, negated, digits):
+            digit = point_digits[j]
+            if digit > 0:
+                _add_to_bucket(buckets, digit, point)
+            elif digit < 0:
+                _add_to_bucket(buckets, -digit, neg_point)
+
+        result.add(result, _sum_buckets(buckets))
+
+    return result
+
+
+class PrecomputedMSM:
+
+    """
+    MSM over a fixed basis G_0, ..., G_{n-1}.
+
+    For every base, the multiples 2^(c * j) * G_i for every window j are computed
+    once (and normalized to z = 1 with one shared inversion). Then
+
+        sum(s_i * G_i) = sum over i and j of d_ij * (2^(c * j) * G_i)
+
+    where d_ij is the j-th digit of s_i, is a single bucket pass over n * num_windows
+    points, with no doublings.
+    """
+
+    def __init__(self, basis: list[BandersnatchExtendedPoint],
+                 window: int = None) -> None:
+        if window is None:
+            window = pippenger_window(len(basis), precomputed=True)
+        self.window = window
+        self.num_windows = _num_windows(window)
+
+        shifted = []
+        for base in basis:
+            point = base
+            for _ in range(self.num_windows):
+                shifted.append(point)
+                point = BandersnatchExtendedPoint.identity().add(point, point)
+                for _ in range(window - 1):
+                    point.double(point)
+
+        shifted = BandersnatchExtendedPoint.batch_normalize(shifted)
+        # shifted_bases[i][j] = 2^(c * j) * G_i
+        self.shifted_bases = [
+            [(p, _neg(p)) for p in shifted[i:i + self.num_windows]]
+            for i in range(0, len(shifted), self.num_windows)]
+
+    def msm(self, scalars: list[Fr]) -> BandersnatchExtendedPoint:
+        """
+        sum(scalars[i] * G_i), for at most as many scalars as bases
+        """
+
+        assert len(scalars) <= len(self.shifted_bases), "more scalars than bases"
+
+        window = self.window
+        buckets = [None] * ((1 << (window - 1)) + 1)
+        for scalar, bases in zip(scalars, self.shifted_bases):
+            digits = _signed_digits(scalar.value, window, self.num_windows)
+            for digit, (point, neg_point) in zip(digits, bases):
+                if digit > 0:
+                    _add_to_bucket(buckets, digit, point)
+                elif digit < 0:
+                    _add_to_bucket(buckets, -digit, neg_point)
+
+        return _sum_buckets(buckets)
+
+
+def _num_windows(window: int) -> int:
+    # One more bit for the carry of the last signed digit
+    return -(-(SCALAR_BITS + 1) // window)
+
+
+def _signed_digits(k: int, window: int, num_windows: int) -> list[int]:
+    """
+    k = sum(digits[j] * 2^(window * j)) with every digit in [-2^(c-1), 2^(c-1)]
+    """
+
+    full = 1 << window
+    half = full >> 1
+    mask = full - 1
+
+    digits = []
+    for _ in range(num_windows):
+        digit = k & mask
+        k >>= window
+        if digit > half:
+            digit -= full
+            k += 1
+        digits.append(digit)
+    return digits
+
+
+def _neg(p: BandersnatchExtendedPoint) -> BandersnatchExtendedPoint:
+    return BandersnatchExtendedPoint.from_coordinates(-p.x, p.y, -p.t, p.z)
+
+
+def _add_to_bucket(buckets: list, digit: int,
+                   point: BandersnatchExtendedPoint):
+    bucket = buckets[digit]
+    if bucket is None:
+        # A copy, since the bucket is then updated in place
+        buckets[digit] = BandersnatchExtendedPoint.from_coordinates(
+            point.x, point.y, point.t, point.z)
+    else:
+        bucket.mixed_add(bucket, point)
+
+
+def _sum_buckets(buckets: list) -> BandersnatchExtendedPoint:
+    """
+    sum(d * buckets[d]) = sum over d of (buckets[d] + ... + buckets[top])
+    """
+
+    running = BandersnatchExtendedPoint.identity()
+    total = BandersnatchExtendedPoint.identity()
+    for bucket in reversed(buckets[1:]):
+        if bucket is not None:
+            running.add(running, bucket)
+        total.add(total, running)
+    return total
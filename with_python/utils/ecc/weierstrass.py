@@ -0,0 +1,1118 @@
+"""
+Recall that the security of Diffie-Hellman lies in the fact that given m ** e mod n = c, it's hard to find `e` for
+a sufficiently large `n` and we called this the discrete logarithm problem. Well, elliptic curves give us another
+form of a discrete logarithm problem.
+
+For an elliptic curve over a finite field in the form y**2 mod p = (x**3 + ax + b) mod p.
+Given a base point (generator) with symbol G: (x, y) on the curve, if the base point is added by itself `z` times and resulting in a new point A = zG.
+
+It turns out that finding `z` when A and G are known is a harder discrete logarithm problem with an even lesser value of `n.`
+
+Every cryptographic elliptic curve has public parameters (domain parameters) and in this implementation, we would use the secp256k1 curve used in Bitcoin.
+Its domain parameters are listed below:
+
+    curve: y**2 = x**3 + 7
+    p: 0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f
+    a: 0xffffffff00000001000000000000000000000000fffffffffffffffffffffffc
+    b: 0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b
+    G: (0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798, 0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8)
+    n: 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
+    h: 0x1
+
+    `p` is the prime of the curve and it would used as the modulus.
+
+    `a` and `b` are constants
+
+    `G` is the base point, generator and the starting point. It is the point on the curve where other points would be generated from.
+        Either by addition or scalar multiplication.
+
+    `n` is the order of the generator point `G`. That is the smallest positive integer such that nG equals to the identity element.
+        The identity element of an elliptic curve is the point at infinity, a line that cuts only two points vertically.
+
+        To verify this, perform a scalar multiplication (see below) of `n` and `G` you should get the point at infinity
+
+        Research on `order of an element in a group` to learn more.
+
+    `h` is the ratio of the number of points on the curve and n, ideally 1.
+"""
+
+import hashlib
+import json
+import os
+import random
+
+from ..curves import CurveContext
+from ..fields import batch_inverse
+from ..number_theory import mod_inverse
+
+# Default window (in bits) of the fixed-base tables, see `FixedBaseTable`
+FIXED_BASE_WINDOW = 6
+
+# Default width of the NAF used by variable-base multiplications, see `wnaf`
+WNAF_WINDOW = 5
+
+# Below this many points `ECC.multi_scalar_mul` uses Straus' method, otherwise
+# Pippenger's
+MSM_STRAUS_MAX = 32
+
+
+class Point(tuple):
+
+    """
+    An affine point (x, y). It is a tuple, so it unpacks and compares like the plain
+    (x, y) tuples used everywhere, but it has no per instance `__dict__`.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, x: int, y: int) -> 'Point':
+        return tuple.__new__(cls, (x, y))
+
+    @property
+    def x(self) -> int:
+        return self[0]
+
+    @property
+    def y(self) -> int:
+        return self[1]
+
+
+class PointAtInfinity:
+
+    """
+    The identity element of the curve. There is a single instance, `INFINITY`, so
+    the point at infinity is checked with `is`.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "♾️"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "INFINITY"
+
+
+INFINITY = PointAtInfinity()
+
+
+def wnaf(z: int, window: int) -> list[int]:
+    """
+    The width-w non-adjacent form of z >= 0, least significant digit first.
+
+    Every digit is 0 or odd with |d| < 2^(w - 1), and of any w consecutive digits at
+    most one is non zero. So for a 256 bit scalar, there are about 256 / (w + 1)
+    additions instead of the 128 of the binary expansion, and the only multiples
+    of P needed are the odd ones P, 3P, ..., (2^(w - 1) - 1)P (negating a point is
+    free).
+    """
+
+    modulus = 1 << window
+    half = 1 << (window - 1)
+
+    digits = []
+    while z:
+        if z & 1:
+            digit = z & (modulus - 1)
+            if digit >= half:
+                digit -= modulus
+            z -= digit
+        else:
+            digit = 0
+        digits.append(digit)
+        z >>= 1
+    return digits
+
+
+class ECC:
+
+    """
+    Steps:
+        1. Choose an elliptic curve. E.g secp256k1, curve25519
+        2. Alice generates key pair and shares the public key with Bob
+        3. Bob generates key pair and shares the public key with Bob
+        4. Alice performs a scalar multiplication using her private key and Bob's public key to get a secret key
+        4. Bob performs a scalar multiplication using her private key and Alice's public key to the same secret key
+    """
+
+    curve = None
+    point_at_infinity = INFINITY
+
+    # The point at infinity in jacobian coordinates, any point with Z = 0
+    jacobian_infinity = (1, 1, 0)
+
+    def __init__(self, curve, coordinates: str = "jacobian",
+                 strict: bool = False, window: int = WNAF_WINDOW) -> None:
+        """
+        `coordinates` selects how `scalar_multiplication` works internally:
+
+            "affine": every addition and doubling computes a modular inverse.
+
+            "jacobian": the intermediate points are kept in jacobian coordinates
+            (see `jacobian_add`), which need no inversion, and the result is
+            converted back to affine once at the end. The scalar is recoded with
+            `wnaf` using `window` as its width; a `window` of None uses the plain
+            binary expansion instead. On secp256k1, the scalar is first split in
+            two halves with the GLV endomorphism (see `glv_multiplication`).
+
+        Points given to and returned by the public methods are always affine: (x, y)
+        tuples (`Point` for the results) or `INFINITY`.
+
+        Points are expected to be checked once with `validate_point` when they enter
+        the system, so the arithmetic does not check them again. With `strict`, every
+        input and result of `point_addition` and `scalar_multiplication` is checked to
+        be on the curve, which is useful for testing.
+        """
+
+        assert coordinates in ("affine", "jacobian"), "unknown coordinates"
+        # Every ECC on the same curve shares its context and precomputed tables,
+        # see `utils/curves.py`
+        self.curve = CurveContext.get(curve)
+        self.coordinates = coordinates
+        self.strict = strict
+        self.window = window
+
+        self.glv = self.curve.glv
+
+    def is_on_curve(self, point: tuple[int, int]):
+        """
+        We check if a point is on the curve using the condition:
+
+        y**2 mod p == (x**3 + ax + b) mod p
+        """
+
+        if point is self.point_at_infinity:
+            return True
+
+        x, y = point
+        return (y ** 2) % self.curve.p == ((x ** 3) + \
+                (self.curve.a * x) + self.curve.b) % self.curve.p
+
+    def validate_point(
+            self, point: tuple[int, int] | str) -> tuple[int, int] | str:
+        """
+        Checks a point received from outside (user input, another party,
+        deserialization) and returns it, raising an exception if it is the point at
+        infinity, has a coordinate outside [0, p - 1] or is not on the curve.
+        """
+
+        if point is self.point_at_infinity:
+            raise Exception("point at infinity")
+        x, y = point
+        p = self.curve.p
+        if not (0 <= x < p and 0 <= y < p):
+            raise Exception("point coordinates out of range")
+        if not self.is_on_curve(point):
+            raise Exception("point not on curve")
+        return point
+
+    def slope_for_point_addition(self, x1: int, x2: int, y1: int, y2: int):
+        """
+        To get the slope when solving for point addition:
+            s = ((y2 - y1)/(x2 - x1)) mod p
+
+        But, to avoid getting decimal values, we would do this instead:
+            s = (((y2 - y1) mod p)) * (((x2 - x1) ** -1) mod p) mod p
+
+            We converted the divisor to its multiplicative inverse mod p
+            multiplied it by the dividend mod p
+        """
+
+        dividend = (y2 - y1) % self.curve.p
+        divisor = (x2 - x1) % self.curve.p
+        # multiplicative inverse mod p
+        mi = mod_inverse(divisor, self.curve.p)
+        return (dividend * mi) % self.curve.p
+
+    def slope_for_point_doubling(self, x1: int, y1: int):
+        """
+        To get the slope when solving for point doubling:
+            s = ((3 * (x1 ** 2) + a)/2y1) mod p
+
+        But, to avoid getting decimal values just like above, we would do this instead:
+            s = (((3 * (x1 ** 2) + a) mod p) * ((2y1) ** -1) mod p) mod p
+        """
+
+        dividend = ((3 * (x1 ** 2)) + self.curve.a) % self.curve.p
+        divisor = (2 * y1) % self.curve.p
+        # multiplicative inverse mod p
+        mi = mod_inverse(divisor, self.curve.p)
+        return (dividend * mi) % self.curve.p
+
+    def point_addition(self, a: tuple[int, int]
+                       | str, b: tuple[int, int] | str):
+
+        if self.strict:
+            assert self.is_on_curve(a)
+            assert self.is_on_curve(b)
+
+        """
+        The infinity point is the identity element of the elliptic curve group so
+        computing an addition operation on a point and the infinity returns the point.
+
+        That is, (point `a` + infinity point = `a`)
+        """
+
+        if a is self.point_at_infinity:
+            return b
+
+        if b is self.point_at_infinity:
+            return a
+
+        x1 = a[0]
+        x2 = b[0]
+        y1 = a[1]
+        y2 = b[1]
+
+        if x1 == x2 and y1 != y2:
+
+            """
+            if x1 is equal to x2 and y1 and y2 are, then line between point `a` and point `b`
+            would be a vertical line heading towards infinity so we would return
+            infinity as the new point
+            """
+
+            return self.point_at_infinity
+
+        if x1 == x2:
+            slope = self.slope_for_point_doubling(x1, y1)
+        else:
+            slope = self.slope_for_point_addition(x1, x2, y1, y2)
+
+        x3 = ((slope ** 2) - a[0] - b[0]) % self.curve.p
+        y3 = (slope * (x1 - x3) - y1) % self.curve.p
+        new_point = Point(x3, y3)
+        if self.strict:
+            assert self.is_on_curve(new_point)
+
+        return new_point
+
+    """
+    JACOBIAN COORDINATES
+
+    A point (x, y) is represented by any (X, Y, Z) with x = X/(Z ** 2) and y = Y/(Z ** 3),
+    and the point at infinity by any (X, Y, 0). Additions and doublings are done on the
+    numerators and denominators separately, so no modular inverse is needed until the
+    point is converted back to affine coordinates.
+
+    Formulas: https://hyperelliptic.org/EFD/g1p/auto-shortw-jacobian.html
+    """
+
+    def to_jacobian(self, point: tuple[int, int] | str) -> tuple[int, int, int]:
+        if point is self.point_at_infinity:
+            return self.jacobian_infinity
+        return (point[0], point[1], 1)
+
+    def to_affine(self, point: tuple[int, int, int]) -> tuple[int, int] | str:
+        X, Y, Z = point
+        if Z == 0:
+            return self.point_at_infinity
+
+        p = self.curve.p
+        z_inv = pow(Z, -1, p)
+        z_inv_2 = (z_inv * z_inv) % p
+        return Point((X * z_inv_2) % p, (Y * z_inv_2 * z_inv) % p)
+
+    def jacobian_double(
+            self, point: tuple[int, int, int]) -> tuple[int, int, int]:
+        """
+        "dbl-1998-cmo-2":
+
+            S = 4 * X * (Y ** 2), M = 3 * (X ** 2) + a * (Z ** 4)
+            X' = (M ** 2) - 2S, Y' = M * (S - X') - 8 * (Y ** 4), Z' = 2 * Y * Z
+        """
+
+        X, Y, Z = point
+        if Z == 0 or Y == 0:
+            return self.jacobian_infinity
+
+        p = self.curve.p
+        YY = (Y * Y) % p
+        S = (4 * X * YY) % p
+        M = 3 * X * X
+        if self.curve.a:
+            ZZ = (Z * Z) % p
+            M += self.curve.a * ZZ * ZZ
+        M %= p
+
+        X3 = (M * M - 2 * S) % p
+        Y3 = (M * (S - X3) - 8 * YY * YY) % p
+        Z3 = (2 * Y * Z) % p
+        return (X3, Y3, Z3)
+
+    def jacobian_add(self, a: tuple[int, int, int],
+                     b: tuple[int, int, int]) -> tuple[int, int, int]:
+        """
+        "add-1998-cmo-2":
+
+            U1 = X1 * (Z2 ** 2), U2 = X2 * (Z1 ** 2), S1 = Y1 * (Z2 ** 3), S2 = Y2 * (Z1 ** 3)
+            H = U2 - U1, R = S2 - S1
+            X3 = (R ** 2) - (H ** 3) - 2 * U1 * (H ** 2)
+            Y3 = R * (U1 * (H ** 2) - X3) - S1 * (H ** 3)
+            Z3 = H * Z1 * Z2
+        """
+
+        X1, Y1, Z1 = a
+        X2, Y2, Z2 = b
+        if Z1 == 0:
+            return b
+        if Z2 == 0:
+            return a
+
+        p = self.curve.p
+        Z1Z1 = (Z1 * Z1) % p
+        Z2Z2 = (Z2 * Z2) % p
+        U1 = (X1 * Z2Z2) % p
+        U2 = (X2 * Z1Z1) % p
+        S1 = (Y1 * Z2 * Z2Z2) % p
+        S2 = (Y2 * Z1 * Z1Z1) % p
+
+        if U1 == U2:
+            if S1 != S2:
+                # a = -b
+                return self.jacobian_infinity
+            return self.jacobian_double(a)
+
+        H = (U2 - U1) % p
+        R = (S2 - S1) % p
+        HH = (H * H) % p
+        HHH = (H * HH) % p
+        U1HH = (U1 * HH) % p
+
+        X3 = (R * R - HHH - 2 * U1HH) % p
+        Y3 = (R * (U1HH - X3) - S1 * HHH) % p
+        Z3 = (H * Z1 * Z2) % p
+        return (X3, Y3, Z3)
+
+    def jacobian_mixed_add(self, a: tuple[int, int, int],
+                           b: tuple[int, int] | str) -> tuple[int, int, int]:
+        """
+        Adds an affine point `b` to a jacobian point `a`. This is `jacobian_add`
+        with Z2 = 1, which saves the multiplications by Z2.
+        """
+
+        if b is self.point_at_infinity:
+            return a
+
+        X1, Y1, Z1 = a
+        x2, y2 = b
+        if Z1 == 0:
+            return (x2, y2, 1)
+
+        p = self.curve.p
+        Z1Z1 = (Z1 * Z1) % p
+        U2 = (x2 * Z1Z1) % p
+        S2 = (y2 * Z1 * Z1Z1) % p
+
+        if X1 == U2:
+            if Y1 != S2:
+                return self.jacobian_infinity
+            return self.jacobian_double(a)
+
+        H = (U2 - X1) % p
+        R = (S2 - Y1) % p
+        HH = (H * H) % p
+        HHH = (H * HH) % p
+        U1HH = (X1 * HH) % p
+
+        X3 = (R * R - HHH - 2 * U1HH) % p
+        Y3 = (R * (U1HH - X3) - Y1 * HHH) % p
+        Z3 = (H * Z1) % p
+        return (X3, Y3, Z3)
+
+    def scalar_multiplication(self, z: int, point: tuple[int, int] | str):
+        """
+        A=zG computed using the double and add algorithm (https://www.youtube.com/watch?v=5ITRACsmCvQ).
+        Where z is the multiple and G is the `point` argument
+        """
+
+        if self.strict:
+            assert self.is_on_curve(point)
+
+        if z % self.curve.n == 0 or point is self.point_at_infinity:
+            return self.point_at_infinity
+
+        z = z % self.curve.n
+
+        if self.coordinates == "jacobian":
+            result = self.to_affine(self._jacobian_multiply(z, point))
+            if self.strict:
+                assert self.is_on_curve(result)
+            return result
+
+        result = self.point_at_infinity
+        addend = point
+
+        while z:
+
+            if z & 1:
+                # Add
+                result = self.point_addition(result, addend)
+            # Double
+            addend = self.point_addition(addend, addend)
+
+            z >>= 1
+
+        if self.strict:
+            assert self.is_on_curve(result)
+
+        return result
+
+    def batch_scalar_multiplication(
+            self, scalars: list[int],
+            points: list[tuple[int, int] | str]) -> list[tuple[int, int] | str]:
+        """
+        [scalars[0] * points[0], scalars[1] * points[1], ...], where the results are
+        converted to affine together with one shared inversion (see
+        `batch_to_affine`) instead of one inversion each
+        """
+
+        assert len(scalars) == len(points), "one scalar per point"
+
+        if self.coordinates == "affine":
+            return [self.scalar_multiplication(z, point)
+                    for z, point in zip(scalars, points)]
+
+        results = []
+        for z, point in zip(scalars, points):
+            z = z % self.curve.n
+            if z == 0 or point is self.point_at_infinity:
+                results.append(self.jacobian_infinity)
+            else:
+                results.append(self._jacobian_multiply(z, point))
+        return self.batch_to_affine(results)
+
+    def _jacobian_multiply(self, z: int,
+                           point: tuple[int, int]) -> tuple[int, int, int]:
+        # zP in jacobian coordinates for 0 < z < n, with the method selected by
+        # the constructor (see `__init__`)
+        if self.window is None:
+            return self._jacobian_scalar_multiplication(z, point)
+        if self.glv is not None:
+            return self._glv_multiplication(z, point, self.window)
+        return self._wnaf_multiplication(z, point, self.window)
+
+    def _jacobian_scalar_multiplication(
+            self, z: int, point: tuple[int, int]) -> tuple[int, int, int]:
+        """
+        Double and add from the most significant bit, so that the point added is
+        always the affine `point` and the cheaper mixed addition can be used
+        """
+
+        result = self.jacobian_infinity
+        for bit in bin(z)[2:]:
+            result = self.jacobian_double(result)
+            if bit == "1":
+                result = self.jacobian_mixed_add(result, point)
+
+        return result
+
+    def wnaf_multiplication(self, z: int, point: tuple[int, int],
+                            window: int = WNAF_WINDOW) -> tuple[int, int] | str:
+        """
+        zP using the width-w NAF of z (see `wnaf`), for a point P that is only
+        multiplied once, like the other party's public key in ECDH.
+
+        The odd multiples of P are computed first and normalized to affine with one
+        shared inversion, then the digits are processed from the most significant
+        one with a doubling per digit and a mixed addition per non zero digit.
+        """
+
+        z = z % self.curve.n
+        if z == 0 or point is self.point_at_infinity:
+            return self.point_at_infinity
+
+        return self.to_affine(self._wnaf_multiplication(z, point, window))
+
+    def _wnaf_multiplication(self, z: int, point: tuple[int, int],
+                             window: int) -> tuple[int, int, int]:
+        p = self.curve.p
+        table = self.odd_multiples(point, 1 << (window - 2))
+
+        result = self.jacobian_infinity
+        for digit in reversed(wnaf(z, window)):
+            result = self.jacobian_double(result)
+            if digit > 0:
+                result = self.jacobian_mixed_add(result, table[digit >> 1])
+            elif digit < 0:
+                x, y = table[-digit >> 1]
+                result = self.jacobian_mixed_add(result, (x, p - y))
+
+        return result
+
+    def glv_decompose(self, z: int) -> tuple[int, int]:
+        """
+        Splits z into (k1, k2) with z = k1 + k2 * lambda mod n and |k1|, |k2| about
+        sqrt(n), by subtracting from (z, 0) the closest lattice vector
+        c1 * (a1, b1) + c2 * (a2, b2) (Babai's rounding)
+        """
+
+        n = self.curve.n
+        (a1, b1), (a2, b2) = self.glv["basis"]
+
+        # (c1, c2) = round((z, 0) * basis^-1), the determinant being n
+        c1 = (2 * b2 * z + n) // (2 * n)
+        c2 = (-2 * b1 * z + n) // (2 * n)
+
+        k1 = z - c1 * a1 - c2 * a2
+        k2 = -c1 * b1 - c2 * b2
+        return (k1, k2)
+
+    def glv_multiplication(self, z: int, point: tuple[int, int],
+                           window: int = WNAF_WINDOW) -> tuple[int, int] | str:
+        """
+        zP = k1 * P + k2 * φ(P) where (k1, k2) = `glv_decompose(z)` and
+        φ(P) = lambda * P is computed with a single multiplication by beta.
+
+        Both halves are 128 bits long and are processed together (interleaved
+        width-w NAFs sharing one doubling chain), which halves the doublings of
+        `wnaf_multiplication`. The odd multiples of φ(P) come for free from the
+        ones of P since φ((x, y)) = (beta * x, y).
+        """
+
+        z = z % self.curve.n
+        if z == 0 or point is self.point_at_infinity:
+            return self.point_at_infinity
+
+        return self.to_affine(self._glv_multiplication(z, point, window))
+
+    def _glv_multiplication(self, z: int, point: tuple[int, int],
+                            window: int) -> tuple[int, int, int]:
+        p = self.curve.p
+        beta = self.glv["beta"]
+        k1, k2 = self.glv_decompose(z)
+
+        table = self.odd_multiples(point, 1 << (window - 2))
+        endo_table = [((beta * x) % p, y) for x, y in table]
+
+        # A negative half multiplies the negated point instead
+        if k1 < 0:
+            k1 = -k1
+            table = [(x, p - y) for x, y in table]
+        if k2 < 0:
+            k2 = -k2
+            endo_table = [(x, p - y) for x, y in endo_table]
+
+        naf1 = wnaf(k1, window)
+        naf2 = wnaf(k2, window)
+        length = max(len(naf1), len(naf2))
+        naf1 += [0] * (length - len(naf1))
+        naf2 += [0] * (length - len(naf2))
+
+        result = self.jacobian_infinity
+        for i in reversed(range(length)):
+            result = self.jacobian_double(result)
+            for digit, multiples in ((naf1[i], table), (naf2[i], endo_table)):
+                if digit > 0:
+                    result = self.jacobian_mixed_add(
+                        result, multiples[digit >> 1])
+                elif digit < 0:
+                    x, y = multiples[-digit >> 1]
+                    result = self.jacobian_mixed_add(result, (x, p - y))
+
+        return result
+
+    def odd_multiples(self, point: tuple[int, int],
+                      count: int) -> list[tuple[int, int]]:
+        """
+        [P, 3P, 5P, ..., (2 * count - 1)P] in affine coordinates
+        """
+
+        return self.batch_to_affine(self._odd_multiples(point, count))
+
+    def _odd_multiples(self, point: tuple[int, int],
+                       count: int) -> list[tuple[int, int, int]]:
+        double = self.jacobian_double(self.to_jacobian(point))
+
+        multiples = [self.to_jacobian(point)]
+        for _ in range(count - 1):
+            multiples.append(self.jacobian_add(multiples[-1], double))
+        return multiples
+
+    def multi_scalar_mul(self, scalars: list[int],
+                         points: list[tuple[int, int] | str],
+                         window: int = None) -> tuple[int, int] | str:
+        """
+        Computes scalars[0] * points[0] + scalars[1] * points[1] + ... sharing one
+        chain of doublings, the same way `utils.fields.multi_exp` shares squarings:
+
+            - Straus' method (small inputs): every point gets a table of its odd
+              multiples (all normalized with one inversion) and the scalars are
+              recoded with `wnaf`, so each digit position costs one doubling plus
+              one mixed addition per non zero digit.
+
+            - Pippenger's bucket method (large inputs): for every c-bit window the
+              points are added into 2^c - 1 buckets by their digit, and the buckets
+              are combined as bucket_1 + 2 * bucket_2 + ... using running sums.
+
+        The window is chosen from the number of points unless given.
+        """
+
+        assert len(scalars) == len(points), "one scalar per point"
+
+        n = self.curve.n
+        pairs = []
+        for z, point in zip(scalars, points):
+            z = z % n
+            if z and point is not self.point_at_infinity:
+                pairs.append((z, point))
+
+        if not pairs:
+            return self.point_at_infinity
+
+        if len(pairs) < MSM_STRAUS_MAX:
+            result = self._straus(pairs, window or WNAF_WINDOW)
+        else:
+            if window is None:
+                window = max(2, len(pairs).bit_length() - 2)
+            result = self._pippenger(pairs, window)
+
+        return self.to_affine(result)
+
+    def double_scalar_mul(self, u1: int, P: tuple[int, int] | PointAtInfinity,
+                          u2: int, Q: tuple[int, int] | PointAtInfinity
+                          ) -> Point | PointAtInfinity:
+        """
+        u1 * P + u2 * Q, as needed to verify a signature or open a commitment.
+
+        Instead of two scalar multiplications followed by an addition, the
+        variable points are processed together (Shamir's trick, see `_straus`) so
+        they share one chain of doublings. On secp256k1 both scalars are also split
+        with `glv_decompose`, so the chain is 128 doublings long.
+
+        A point with a fixed-base table (see `fixed_base_table`), which is always
+        the case for the generator, is multiplied from its table instead, which
+        needs no doubling at all.
+        """
+
+        n = self.curve.n
+        result = self.jacobian_infinity
+        variable = []
+        for z, point in ((u1, P), (u2, Q)):
+            z = z % n
+            if z == 0 or point is self.point_at_infinity:
+                continue
+            table = self._cached_fixed_base_table(point)
+            if table is not None:
+                result = self.jacobian_add(result, table.multiply(self, z))
+            else:
+                variable.append((z, point))
+
+        if variable:
+            result = self.jacobian_add(
+                result, self._straus(variable, self.window or WNAF_WINDOW))
+
+        return self.to_affine(result)
+
+    def _straus(self, pairs: list[tuple[int, tuple[int, int]]],
+                window: int) -> tuple[int, int, int]:
+        p = self.curve.p
+        count = 1 << (window - 2)
+
+        if self.glv is not None:
+            # Every point P becomes P and φ(P) with 128 bit scalars, negating the
+            # point when its half of the scalar is negative
+            beta = self.glv["beta"]
+            halves = []
+            for z, (x, y) in pairs:
+                k1, k2 = self.glv_decompose(z)
+                for k, point in ((k1, (x, y)), (k2, ((beta * x) % p, y))):
+                    if k < 0:
+                        k, point = -k, (point[0], p - point[1])
+                    if k:
+                        halves.append((k, point))
+            pairs = halves
+
+        multiples = []
+        for _, point in pairs:
+            multiples += self._odd_multiples(point, count)
+        multiples = self.batch_to_affine(multiples)
+        tables = [multiples[i:i + count]
+                  for i in range(0, len(multiples), count)]
+
+        nafs = [wnaf(z, window) for z, _ in pairs]
+        length = max(len(naf) for naf in nafs)
+
+        result = self.jacobian_infinity
+        for i in reversed(range(length)):
+            result = self.jacobian_double(result)
+            for naf, table in zip(nafs, tables):
+                if i >= len(naf):
+                    continue
+                digit = naf[i]
+                if digit > 0:
+                    result = self.jacobian_mixed_add(result, table[digit >> 1])
+                elif digit < 0:
+                    x, y = table[-digit >> 1]
+                    result = self.jacobian_mixed_add(result, (x, p - y))
+
+        return result
+
+    def _pippenger(self, pairs: list[tuple[int, tuple[int, int]]],
+                   window: int) -> tuple[int, int, int]:
+        mask = (1 << window) - 1
+        max_bits = max(z.bit_length() for z, _ in pairs)
+
+        result = self.jacobian_infinity
+        for shift in range(((max_bits - 1) // window) * window, -1, -window):
+            for _ in range(window):
+                result = self.jacobian_double(result)
+
+            buckets = [self.jacobian_infinity] * (1 << window)
+            for z, point in pairs:
+                digit = (z >> shift) & mask
+                if digit:
+                    buckets[digit] = self.jacobian_mixed_add(
+                        buckets[digit], point)
+
+            # sum(d * bucket_d) = sum over d of (bucket_d + ... + bucket_top)
+            running = self.jacobian_infinity
+            total = self.jacobian_infinity
+            for digit in range(mask, 0, -1):
+                running = self.jacobian_add(running, buckets[digit])
+                total = self.jacobian_add(total, running)
+            result = self.jacobian_add(result, total)
+
+        return result
+
+    def fixed_base_table(self, point: tuple[int, int] = None,
+                         window: int = FIXED_BASE_WINDOW,
+                         cache_dir: str = None) -> 'FixedBaseTable':
+        """
+        Returns the fixed-base table of `point` (the generator by default).
+
+        A table is built once per curve, point and window and kept in memory for the
+        rest of the process. When `cache_dir` is given, it is also stored there as
+        JSON and loaded from there by later processes. A stored table that does not
+        match the point and window or has entries off the curve is rebuilt.
+        """
+
+        if point is None:
+            point = self.curve.g
+
+        tables = self.curve.fixed_base_tables
+        table = tables.get((point, window))
+        if table is not None:
+            return table
+
+        path = None
+        if cache_dir is not None:
+            key = (self.curve.p, self.curve.a, self.curve.b, self.curve.n,
+                   point, window)
+            digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+            path = os.path.join(cache_dir, f"fixed_base_{digest}.json")
+
+        if path is not None and os.path.exists(path):
+            table = self._load_fixed_base_table(path, point, window)
+        if table is None:
+            table = FixedBaseTable(self, point, window)
+            if path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                table.save(path)
+
+        tables[(point, window)] = table
+        return table
+
+    def _load_fixed_base_table(self, path: str, point: tuple[int, int],
+                               window: int) -> 'FixedBaseTable':
+        # The table stored at `path`, or None if it can't be read or is not the
+        # table of `point` and `window`
+        try:
+            table = FixedBaseTable.load(path)
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        rows = table.table
+        num_windows = -(-self.curve.n.bit_length() // window)
+        if (table.window != window or len(rows) != num_windows or
+                any(len(row) != (1 << window) - 1 for row in rows) or
+                rows[0][0] != point):
+            return None
+
+        try:
+            for row in rows:
+                for entry in row:
+                    self.validate_point(entry)
+        except Exception:
+            return None
+
+        # The last entry of a row plus its first one, (2^w - 1 + 1) * 2^(w * i) * P,
+        # is the first entry of the next row
+        for row, next_row in zip(rows, rows[1:]):
+            if self.point_addition(row[-1], row[0]) != next_row[0]:
+                return None
+
+        return table
+
+    def _cached_fixed_base_table(
+            self, point: tuple[int, int]) -> 'FixedBaseTable':
+        # The table of `point` if the generator or if already built, else None
+        if point == self.curve.g:
+            return self.fixed_base_table(point)
+        return self.curve.fixed_base_tables.get((point, FIXED_BASE_WINDOW))
+
+    def fixed_base_multiplication(
+            self, z: int, point: tuple[int, int] = None) -> tuple[int, int] | str:
+        """
+        zP for a point P (the generator by default) that is multiplied many times,
+        using its precomputed table (see `FixedBaseTable`). Only additions are needed.
+        """
+
+        z = z % self.curve.n
+        if z == 0:
+            return self.point_at_infinity
+
+        table = self.fixed_base_table(point)
+        return self.to_affine(table.multiply(self, z))
+
+    def batch_fixed_base_multiplication(
+            self, scalars: list[int],
+            point: tuple[int, int] = None) -> list[tuple[int, int] | str]:
+        """
+        [scalars[0] * P, scalars[1] * P, ...] for a point P (the generator by
+        default), converted to affine with one shared inversion
+        """
+
+        table = self.fixed_base_table(point)
+        return self.batch_to_affine(
+            [table.multiply(self, z % self.curve.n) for z in scalars])
+
+    def generate_key_pair(self) -> (int, int):
+        """
+        Generates a random private-public key pair
+        """
+
+        private_key = random.randrange(1, self.curve.n)
+        public_key = self.fixed_base_multiplication(private_key)
+        return (private_key, public_key)
+
+    # Batch operations
+    def batch_to_affine(self, points: list[tuple[int, int, int]]
+                        ) -> list[tuple[int, int] | str]:
+        """
+        Converts jacobian points to affine sharing a single modular inversion
+        (Montgomery's trick, see `utils.fields.batch_inverse`)
+        """
+
+        p = self.curve.p
+        z_invs = batch_inverse([Z for _, _, Z in points], p)
+
+        affine = []
+        for (X, Y, Z), z_inv in zip(points, z_invs):
+            if Z == 0:
+                affine.append(self.point_at_infinity)
+                continue
+            z_inv_2 = (z_inv * z_inv) % p
+            affine.append(Point((X * z_inv_2) % p, (Y * z_inv_2 * z_inv) % p))
+        return affine
+
+    def batch_add(self, a: list[tuple[int, int] | str],
+                  b: list[tuple[int, int] | str]) -> list[tuple[int, int] | str]:
+        """
+        [a[0] + b[0], a[1] + b[1], ...] in affine coordinates.
+
+        Every affine addition divides by x2 - x1 (or 2 * y1 for a doubling), so the
+        denominators of all the pairs are inverted together with one shared
+        inversion, which makes each addition cost a few multiplications.
+        """
+
+        assert len(a) == len(b), "one point of `b` per point of `a`"
+
+        p = self.curve.p
+        infinity = self.point_at_infinity
+
+        # (numerator, denominator) of the slope of every pair, None when the sum
+        # does not need a slope
+        slopes = []
+        for P, Q in zip(a, b):
+            if P is infinity or Q is infinity:
+                slopes.append(None)
+                continue
+            (x1, y1), (x2, y2) = P, Q
+            if x1 != x2:
+                slopes.append((y2 - y1, x2 - x1))
+            elif (y1 + y2) % p == 0:
+                # Q = -P
+                slopes.append(None)
+            else:
+                slopes.append((3 * x1 * x1 + self.curve.a, 2 * y1))
+
+        inverses = batch_inverse(
+            [0 if s is None else s[1] % p for s in slopes], p)
+
+        sums = []
+        for P, Q, slope, inverse in zip(a, b, slopes, inverses):
+            if slope is None:
+                sums.append(Q if P is infinity else P if Q is infinity
+                            else infinity)
+                continue
+            (x1, y1), (x2, _) = P, Q
+            m = (slope[0] * inverse) % p
+            x3 = (m * m - x1 - x2) % p
+            sums.append(Point(x3, (m * (x1 - x3) - y1) % p))
+        return sums
+
+    """
+    SEC1 ENCODING
+
+    The point at infinity is the single byte 0x00. Other points are encoded as:
+
+        uncompressed: 0x04 || x || y
+        compressed: (0x02 if y is even else 0x03) || x
+
+    where x and y are big endian and as long as p (32 bytes for secp256k1, so 33
+    bytes for a compressed point). A compressed point is decoded by solving
+    y ** 2 = x ** 3 + ax + b and picking the root with the right parity.
+
+    See section 2.3 of https://www.secg.org/sec1-v2.pdf
+    """
+
+    def encode_point(self, point: tuple[int, int] | PointAtInfinity,
+                     compressed: bool = True) -> bytes:
+        if point is self.point_at_infinity:
+            return b"\x00"
+
+        length = self.curve.byte_length
+        x, y = point
+        if compressed:
+            return bytes((2 + (y & 1),)) + x.to_bytes(length, "big")
+        return b"\x04" + x.to_bytes(length, "big") + y.to_bytes(length, "big")
+
+    def decode_point(self, data: bytes) -> Point | PointAtInfinity:
+        """
+        Decodes a SEC1 encoded point, raising an exception if it is not a valid
+        encoding of a point of the curve
+        """
+
+        data = memoryview(data)
+        length = self.curve.byte_length
+
+        if len(data) == 1 and data[0] == 0:
+            return self.point_at_infinity
+
+        if len(data) == 1 + length and data[0] in (2, 3):
+            x = int.from_bytes(data[1:], "big")
+            return self._decompress(x, data[0] & 1)
+
+        if len(data) == 1 + 2 * length and data[0] == 4:
+            x = int.from_bytes(data[1:1 + length], "big")
+            y = int.from_bytes(data[1 + length:], "big")
+            if x >= self.curve.p or y >= self.curve.p:
+                raise Exception("point not on curve")
+            return self.validate_point(Point(x, y))
+
+        raise Exception("invalid point encoding")
+
+    def batch_encode_points(self, points: list[tuple[int, int]],
+                            compressed: bool = True) -> bytes:
+        """
+        Concatenates the encodings of points, which must not be the point at
+        infinity so that every encoding has the same length
+        """
+
+        return b"".join(self.encode_point(point, compressed)
+                        for point in points)
+
+    def batch_decode_points(self, buffer: bytes,
+                            compressed: bool = True) -> list[Point]:
+        """
+        Decodes the output of `batch_encode_points`
+        """
+
+        buffer = memoryview(buffer)
+        length = self.curve.byte_length
+        size = 1 + length if compressed else 1 + 2 * length
+        if len(buffer) % size:
+            raise Exception("invalid point encoding")
+
+        return [self.decode_point(buffer[i:i + size])
+                for i in range(0, len(buffer), size)]
+
+    def _decompress(self, x: int, parity: int) -> Point:
+        p = self.curve.p
+        if x >= p:
+            raise Exception("point not on curve")
+
+        y_2 = (x * x * x + self.curve.a * x + self.curve.b) % p
+        y = self.curve.sqrt(y_2)
+        if y is None:
+            raise Exception("point not on curve")
+        if y & 1 != parity:
+            y = p - y
+        return Point(x, y)
+
+
+class FixedBaseTable:
+
+    """
+    Precomputed multiples of a fixed point P for a fixed-base scalar multiplication.
+
+    The scalar is split into w-bit digits z = d_0 + d_1 * 2^w + d_2 * 2^(2w) + ... and
+
+        table[i][d - 1] = d * 2^(w * i) * P, for every digit d in [1, 2^w - 1]
+
+    so that zP = table[0][d_0 - 1] + table[1][d_1 - 1] + ... is a sum of at most one
+    entry per window, with no doublings. The entries are stored in affine form
+    (normalized with one shared inversion) so that the additions are mixed additions.
+    """
+
+    def __init__(self, ecc: ECC = None, point: tuple[int, int] = None,
+                 window: int = FIXED_BASE_WINDOW) -> None:
+        self.window = window
+        self.table = []
+        if ecc is None:
+            return
+
+        num_windows = -(-ecc.curve.n.bit_length() // window)
+
+        multiples = []
+        base = ecc.to_jacobian(point)
+        for _ in range(num_windows):
+            multiple = base
+            for _ in range((1 << window) - 1):
+                multiples.append(multiple)
+                multiple = ecc.jacobian_add(multiple, base)
+            # The last sum is 2^w * base, the base of the next window
+            base = multiple
+
+        affine = ecc.batch_to_affine(multiples)
+        row_length = (1 << window) - 1
+        self.table = [affine[i:i + row_length]
+                      for i in range(0, len(affine), row_length)]
+
+    def multiply(self, ecc: ECC, z: int) -> tuple[int, int, int]:
+        """
+        Returns z * P in jacobian coordinates, for 0 <= z < n
+        """
+
+        window = self.window
+        mask = (1 << window) - 1
+
+        result = ecc.jacobian_infinity
+        for row in self.table:
+            if z == 0:
+                break
+            digit = z & mask
+            if digit:
+                result = ecc.jacobian_mixed_add(result, row[digit - 1])
+            z >>= window
+
+        return result
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"window": self.window, "table": self.table}, f)
+
+    def load(path: str) -> 'FixedBaseTable':
+        with open(path) as f:
+            data = json.load(f)
+
+        table = FixedBaseTable(window=data["window"])
+        table.table = [[Point(*p) for p in row] for row in data["table"]]
+        return table
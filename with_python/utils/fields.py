@@ -1,4 +1,40 @@
-import copy
+import os
+
+import numpy as np
+
+# Typed fields (see `TypedField`) only run their modulus checks in checked mode.
+# It is enabled by setting the environment variable FIELDS_CHECKED=1 or by
+# assigning `utils.fields.CHECKED = True`, e.g in tests.
+CHECKED = os.environ.get('FIELDS_CHECKED', '0') == '1'
+
+
+class FieldContext:
+
+    """
+    The parameters shared by every element of a finite field.
+
+    Elements only hold their value and a reference to the context of their field,
+    so the modulus is stored once per field rather than once per element.
+    """
+
+    __slots__ = ('modulus',)
+
+    def __init__(self, modulus: int) -> None:
+        self.modulus = modulus
+
+    def get(modulus: int) -> 'FieldContext':
+        """
+        Returns the context for `modulus`, creating it on first use
+        """
+
+        ctx = _CONTEXTS.get(modulus)
+        if ctx is None:
+            ctx = FieldContext(modulus)
+            _CONTEXTS[modulus] = ctx
+        return ctx
+
+
+_CONTEXTS: dict[int, FieldContext] = {}
 
 
 class Field:
@@ -7,12 +43,32 @@ class Field:
     A generic implementation of a finite field
     """
 
-    value: int = None
-    modulus: int = None
+    __slots__ = ('value', 'ctx')
+
+    value: int
+    ctx: FieldContext
 
     def __init__(self, value, modulus) -> None:
+        self.ctx = FieldContext.get(modulus)
         self.value = value % modulus
-        self.modulus = modulus
+
+    @property
+    def modulus(self) -> int:
+        return self.ctx.modulus
+
+    @classmethod
+    def from_reduced(cls, value: int, ctx: FieldContext) -> 'Field':
+        """
+        Builds an element from a value that is already in [0, modulus-1].
+
+        This skips `__init__` and the `% modulus`, which is what the arithmetic
+        methods below use to create their results.
+        """
+
+        element = object.__new__(cls)
+        element.value = value
+        element.ctx = ctx
+        return element
 
     def zero(modulus) -> 'Field':
         return Field(0, modulus)
@@ -55,6 +111,61 @@ class Field:
             bytes_little_endian, byteorder='little')
         return Field(value, modulus)
 
+    def batch_to_bytes(values: list['Field'], byte_length: int,
+                       out: bytearray = None) -> bytearray:
+        """
+        Serializes the values as consecutive `byte_length` little-endian chunks.
+
+        They are written into `out` (a writable buffer such as a `bytearray`,
+        `memoryview` or `mmap` of at least len(values) * byte_length bytes) when it
+        is given, otherwise into a new `bytearray`. The buffer is returned.
+        """
+
+        size = len(values) * byte_length
+        if out is None:
+            out = bytearray(size)
+        assert len(out) >= size, "output buffer too small"
+
+        view = memoryview(out)
+        offset = 0
+        for v in values:
+            view[offset:offset + byte_length] = v.value.to_bytes(
+                byte_length, byteorder='little')
+            offset += byte_length
+
+        return out
+
+    def batch_from_bytes(buffer, modulus: int, byte_length: int,
+                         check_canonical: bool = True,
+                         field_cls: type = None) -> list['Field']:
+        """
+        Parses a buffer (`bytes`, `bytearray`, `memoryview`, `mmap`, ...) of
+        concatenated `byte_length` little-endian elements without copying it.
+
+        With `check_canonical`, None is returned if any element is not in [0, modulus-1],
+        like `from_bytes`. Otherwise the elements are reduced, like `from_bytes_reduce`.
+        The elements are instances of `field_cls`, `Field` by default.
+        """
+
+        view = memoryview(buffer).cast('B')
+        assert len(view) % byte_length == 0, "buffer is not a whole number of elements"
+
+        if field_cls is None:
+            field_cls = Field
+        ctx = FieldContext.get(modulus)
+        from_reduced = field_cls.from_reduced
+
+        values = [int.from_bytes(view[i:i + byte_length], byteorder='little')
+                  for i in range(0, len(view), byte_length)]
+
+        if check_canonical:
+            for v in values:
+                if v >= modulus:
+                    return None
+            return [from_reduced(v, ctx) for v in values]
+
+        return [from_reduced(v % modulus, ctx) for v in values]
+
     def lexographically_largest(x: 'Field', q_min_one_div_2: int) -> bool:
         return x.value > q_min_one_div_2
 
@@ -63,107 +174,119 @@ class Field:
 
     def add(self, a: 'Field', b: 'Field') -> 'Field':
         self._check_all_integers_same_modulus(a, b)
-        self.value = (a.value + b.value) % self.modulus
+        self.value = (a.value + b.value) % self.ctx.modulus
         return self
 
     def sub(self, a: 'Field', b: 'Field') -> 'Field':
         self._check_all_integers_same_modulus(a, b)
-        self.value = (a.value - b.value) % self.modulus
+        self.value = (a.value - b.value) % self.ctx.modulus
         return self
 
     def neg(self, a: 'Field') -> 'Field':
         self._check_all_integers_same_modulus(a, a)
-        self.value = -a.value % self.modulus
+        self.value = -a.value % self.ctx.modulus
         return self
 
     def mul(self, a: 'Field', b: 'Field') -> 'Field':
         self._check_all_integers_same_modulus(a, b)
-        self.value = (a.value * b.value) % self.modulus
+        self.value = (a.value * b.value) % self.ctx.modulus
         return self
 
+    def mul_small(self, k: int) -> 'Field':
+        """
+        Returns self * k for a small integer k (e.g a curve constant like -5).
+
+        Like the operator overloads, a new element is returned. Multiplying by a
+        small int is much cheaper than a full field multiplication, so this is
+        faster than multiplying by `k` as a field element.
+        """
+
+        ctx = self.ctx
+        return self.from_reduced((self.value * k) % ctx.modulus, ctx)
+
     def equal(self, b: 'Field') -> 'Field':
         self._check_all_integers_same_modulus(b, b)
         return self.value == b.value
 
     def dup(self) -> 'Field':
-        return copy.deepcopy(self)
+        # The value is an immutable int, so a shallow copy is a full copy
+        return self.from_reduced(self.value, self.ctx)
 
     def inv(self, a: 'Field') -> 'Field':
         if a.is_zero():
             return None
-        self.value = pow(a.value, -1, self.modulus)
+        self.value = pow(a.value, -1, self.ctx.modulus)
         return self
 
-    def multi_inv(values: list['Field']) -> list['Field']:
-
-        modulus = values[0].modulus
-
-        zero = Field.zero(modulus)
-        one = Field.one(modulus)
-        inv = Field.zero(modulus)
-
-        partials = [one]
-        for i in range(len(values)):
-            partials.append(partials[-1] * values[i] or one)
+    def multi_inv(values: list['Field'],
+                  chunk_size: int = None) -> list['Field']:
+        """
+        Inverts all the values with a single field inversion per chunk, see
+        `batch_inverse`. Zero values are mapped to zero.
 
-        inv.inv(partials[-1])
+        The results have the class of the first value.
+        """
 
-        outputs = [zero] * len(values)
-        for i in range(len(values), 0, -1):
-            outputs[i - 1] = partials[i - 1] * inv if values[i - 1] else zero
-            inv = inv * values[i - 1] or one
+        if len(values) == 0:
+            return []
 
-        return outputs
+        cls = type(values[0])
+        ctx = values[0].ctx
+        inverses = batch_inverse(
+            [v.value for v in values], ctx.modulus, chunk_size)
+        return [cls.from_reduced(v, ctx) for v in inverses]
 
     def sqrt(self, a: 'Field') -> 'Field':
         self._check_all_integers_same_modulus(a, a)
-        self.value = modular_sqrt(a.value, self.modulus)
-        if self.value is None:
+        value = modular_sqrt(a.value, self.ctx.modulus)
+        if value is None:
             return None
+        self.value = value
         return self
 
     def exp(self, a: 'Field', exponent: int) -> 'Field':
         self._check_all_integers_same_modulus(a, a)
-        self.value = pow(a.value, exponent, self.modulus)
+        self.value = pow(a.value, exponent, self.ctx.modulus)
         return self
 
     def legendre(self) -> int:
-        return legendre_symbol(self.value, self.modulus)
+        return legendre_symbol(self.value, self.ctx.modulus)
 
     def div(self, a: 'Field', b: 'Field') -> 'Field':
-        b_inv = b.dup()
-        b_inv.inv(b_inv)
-        if b_inv is None:
+        self._check_all_integers_same_modulus(a, b)
+        if b.is_zero():
             return None
 
-        self.mul(a, b_inv)
+        modulus = self.ctx.modulus
+        self.value = (a.value * pow(b.value, -1, modulus)) % modulus
         return self
 
     # Method overloads
+    # These never mutate their operands and build the result directly, with
+    # the class of the left operand, so that subclasses (e.g `Fp`) get
+    # results of their own type without re-wrapping them
     def __add__(self, other):
-        result = Field(0, self.modulus)
-        result.add(self, other)
-        return result
+        self._check_all_integers_same_modulus(other, other)
+        ctx = self.ctx
+        return self.from_reduced((self.value + other.value) % ctx.modulus, ctx)
 
     def __sub__(self, other):
-        result = Field(0, self.modulus)
-        result.sub(self, other)
-        return result
+        self._check_all_integers_same_modulus(other, other)
+        ctx = self.ctx
+        return self.from_reduced((self.value - other.value) % ctx.modulus, ctx)
 
     def __mul__(self, other):
-        result = Field(0, self.modulus)
-        result.mul(self, other)
-        return result
+        self._check_all_integers_same_modulus(other, other)
+        ctx = self.ctx
+        return self.from_reduced((self.value * other.value) % ctx.modulus, ctx)
 
     def __neg__(self):
-        result = Field(0, self.modulus)
-        result.neg(self)
-        return result
+        ctx = self.ctx
+        return self.from_reduced(-self.value % ctx.modulus, ctx)
 
     def __truediv__(self, other):
-        result = Field(0, self.modulus)
-        result.div(self, other)
-        return result
+        result = self.from_reduced(0, self.ctx)
+        return result.div(self, other)
 
     def __eq__(self, obj):
         assert (isinstance(obj, Field))
@@ -171,8 +294,865 @@ class Field:
 
     # Utils
     def _check_all_integers_same_modulus(self, a: 'Field', b: 'Field'):
-        assert (self.modulus == a.modulus)
-        assert (self.modulus == b.modulus)
+        assert (self.ctx.modulus == a.ctx.modulus)
+        assert (self.ctx.modulus == b.ctx.modulus)
+
+
+class TypedField(Field):
+
+    """
+    A finite field whose modulus is fixed by the class, e.g `Fp` and `Fr`.
+
+    Subclasses set `field_ctx`. Since both operands of an operation are elements
+    of the same class, they are in the same field by construction and the
+    per-operation modulus checks of `Field` are skipped unless `CHECKED` is set.
+
+    Each typed field also has a cache of shared, immutable constants, see `constant`.
+    """
+
+    __slots__ = ()
+
+    field_ctx: FieldContext = None
+
+    # Set on every subclass by `__init_subclass__`
+    constant_cls: type = None
+    _constants: dict = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if issubclass(cls, _FieldConstant):
+            return
+
+        cls._constants = {}
+        cls.constant_cls = type(cls.__name__ + 'Constant',
+                                (_FieldConstant, cls),
+                                {'__slots__': (), 'mutable_cls': cls})
+
+    def __init__(self, value=None, generic_field=None) -> None:
+        ctx = self.field_ctx
+        if generic_field is not None:
+            assert generic_field.modulus == ctx.modulus
+            value = generic_field.value
+
+        self.ctx = ctx
+        self.value = value % ctx.modulus
+
+    @classmethod
+    def constant(cls, value: int) -> 'TypedField':
+        """
+        Returns the shared element with this value, creating it on first use.
+
+        Constants are immutable: the in-place methods (`add`, `mul`, `inv`, ...)
+        raise an AttributeError when called on them, so a shared constant cannot be
+        corrupted. The operator overloads and `dup` return ordinary, mutable
+        elements.
+        """
+
+        ctx = cls.field_ctx
+        value %= ctx.modulus
+
+        element = cls._constants.get(value)
+        if element is None:
+            element = object.__new__(cls.constant_cls)
+            object.__setattr__(element, 'value', value)
+            object.__setattr__(element, 'ctx', ctx)
+            cls._constants[value] = element
+        return element
+
+    def add(self, a: 'TypedField', b: 'TypedField') -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, b)
+        self.value = (a.value + b.value) % self.ctx.modulus
+        return self
+
+    def sub(self, a: 'TypedField', b: 'TypedField') -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, b)
+        self.value = (a.value - b.value) % self.ctx.modulus
+        return self
+
+    def neg(self, a: 'TypedField') -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, a)
+        self.value = -a.value % self.ctx.modulus
+        return self
+
+    def mul(self, a: 'TypedField', b: 'TypedField') -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, b)
+        self.value = (a.value * b.value) % self.ctx.modulus
+        return self
+
+    def equal(self, b: 'TypedField') -> bool:
+        if CHECKED:
+            self._check_all_integers_same_modulus(b, b)
+        return self.value == b.value
+
+    def sqrt(self, a: 'TypedField') -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, a)
+        value = modular_sqrt(a.value, self.ctx.modulus)
+        if value is None:
+            return None
+        self.value = value
+        return self
+
+    def exp(self, a: 'TypedField', exponent: int) -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, a)
+        self.value = pow(a.value, exponent, self.ctx.modulus)
+        return self
+
+    def div(self, a: 'TypedField', b: 'TypedField') -> 'TypedField':
+        if CHECKED:
+            self._check_all_integers_same_modulus(a, b)
+        if b.value == 0:
+            return None
+
+        modulus = self.ctx.modulus
+        self.value = (a.value * pow(b.value, -1, modulus)) % modulus
+        return self
+
+    # Method overloads
+    def __add__(self, other):
+        if CHECKED:
+            self._check_all_integers_same_modulus(other, other)
+        ctx = self.ctx
+        return self.from_reduced((self.value + other.value) % ctx.modulus, ctx)
+
+    def __sub__(self, other):
+        if CHECKED:
+            self._check_all_integers_same_modulus(other, other)
+        ctx = self.ctx
+        return self.from_reduced((self.value - other.value) % ctx.modulus, ctx)
+
+    def __mul__(self, other):
+        if CHECKED:
+            self._check_all_integers_same_modulus(other, other)
+        ctx = self.ctx
+        return self.from_reduced((self.value * other.value) % ctx.modulus, ctx)
+
+    def __eq__(self, obj):
+        if CHECKED:
+            assert (isinstance(obj, Field))
+            self._check_all_integers_same_modulus(obj, obj)
+        return self.value == obj.value
+
+
+class MontgomeryContext:
+
+    """
+    Parameters of the Montgomery representation of a field with an odd modulus p.
+
+    An element a is stored as aR mod p where R = 2 ** r_bits > p. The product of two
+    such values is brought back into the representation using Montgomery reduction
+    (REDC), which only needs a multiplication, a mask and a shift by a power of two
+    instead of a division by p.
+
+    Reference: "Modular Multiplication Without Trial Division" by Peter L. Montgomery
+    """
+
+    __slots__ = ('modulus', 'r_bits', 'r_mask', 'r2', 'p_prime')
+
+    def __init__(self, modulus: int, limb_bits: int = 64) -> None:
+        assert modulus % 2 == 1, "montgomery form needs an odd modulus"
+
+        num_limbs = -(-modulus.bit_length() // limb_bits)
+
+        self.modulus = modulus
+        self.r_bits = num_limbs * limb_bits
+        self.r_mask = (1 << self.r_bits) - 1
+        # R ** 2 mod p, used to convert into the montgomery domain with one REDC
+        self.r2 = pow(1 << self.r_bits, 2, modulus)
+        # -p ** -1 mod R
+        self.p_prime = -pow(modulus, -1, 1 << self.r_bits) & self.r_mask
+
+    def redc(self, t: int) -> int:
+        """
+        Computes tR^-1 mod p for 0 <= t < pR
+        """
+
+        m = ((t & self.r_mask) * self.p_prime) & self.r_mask
+        u = (t + m * self.modulus) >> self.r_bits
+        if u >= self.modulus:
+            return u - self.modulus
+        return u
+
+    def to_mont(self, a: int) -> int:
+        return self.redc((a % self.modulus) * self.r2)
+
+    def from_mont(self, a: int) -> int:
+        return self.redc(a)
+
+    def mont_mul(self, a: int, b: int) -> int:
+        return self.redc(a * b)
+
+    def mont_sqr(self, a: int) -> int:
+        return self.redc(a * a)
+
+    def batch_to_mont(self, values: list[int]) -> list[int]:
+        redc = self.redc
+        modulus = self.modulus
+        r2 = self.r2
+        return [redc((a % modulus) * r2) for a in values]
+
+    def batch_from_mont(self, values: list[int]) -> list[int]:
+        redc = self.redc
+        return [redc(a) for a in values]
+
+
+class MontgomeryField:
+
+    """
+    An element of a finite field held in montgomery form.
+
+    Subclasses set `mont_ctx` and `field_cls`, the field the elements convert
+    to and from (e.g `FpMont` and `Fp`). Arithmetic only mixes elements of the
+    same class so no modulus checks are performed.
+    """
+
+    __slots__ = ('value',)
+
+    value: int
+
+    mont_ctx: MontgomeryContext = None
+    field_cls: type = None
+
+    def __init__(self, value: int) -> None:
+        self.value = self.mont_ctx.to_mont(value)
+
+    @classmethod
+    def from_mont(cls, value: int) -> 'MontgomeryField':
+        """
+        Builds an element from a value that is already in montgomery form
+        """
+
+        element = object.__new__(cls)
+        element.value = value
+        return element
+
+    @classmethod
+    def from_field(cls, a: Field) -> 'MontgomeryField':
+        return cls.from_mont(cls.mont_ctx.to_mont(a.value))
+
+    @classmethod
+    def batch_from_field(cls, values: list[Field]) -> list['MontgomeryField']:
+        from_mont = cls.from_mont
+        return [from_mont(v)
+                for v in cls.mont_ctx.batch_to_mont([a.value for a in values])]
+
+    def to_field(self) -> Field:
+        return self.field_cls(self.mont_ctx.from_mont(self.value))
+
+    def batch_to_field(values: list['MontgomeryField']) -> list[Field]:
+        if len(values) == 0:
+            return []
+
+        cls = type(values[0])
+        ctx = cls.field_cls.field_ctx
+        from_reduced = cls.field_cls.from_reduced
+        return [from_reduced(v, ctx)
+                for v in cls.mont_ctx.batch_from_mont([a.value for a in values])]
+
+    def is_zero(self) -> bool:
+        return self.value == 0
+
+    def mont_mul(self, a: 'MontgomeryField',
+                 b: 'MontgomeryField') -> 'MontgomeryField':
+        self.value = self.mont_ctx.redc(a.value * b.value)
+        return self
+
+    def mont_sqr(self, a: 'MontgomeryField') -> 'MontgomeryField':
+        self.value = self.mont_ctx.redc(a.value * a.value)
+        return self
+
+    # Method overloads
+    def __add__(self, other):
+        modulus = self.mont_ctx.modulus
+        value = self.value + other.value
+        if value >= modulus:
+            value -= modulus
+        return self.from_mont(value)
+
+    def __sub__(self, other):
+        value = self.value - other.value
+        if value < 0:
+            value += self.mont_ctx.modulus
+        return self.from_mont(value)
+
+    def __mul__(self, other):
+        return self.from_mont(self.mont_ctx.redc(self.value * other.value))
+
+    def __neg__(self):
+        if self.value == 0:
+            return self.from_mont(0)
+        return self.from_mont(self.mont_ctx.modulus - self.value)
+
+    def __eq__(self, obj):
+        # Both sides are in montgomery form with the same R, so the
+        # representatives can be compared directly
+        return self.value == obj.value
+
+
+LIMB_BITS = 32
+
+_LIMB_MASK = np.uint64((1 << LIMB_BITS) - 1)
+_LIMB_SHIFT = np.uint64(LIMB_BITS)
+
+
+class LimbContext:
+
+    """
+    The parameters `FieldVector` needs for a modulus, split into limbs.
+
+    Limbs are 32 bits wide but stored in uint64 lanes, so that the product of two
+    limbs plus two carries never overflows a lane.
+    """
+
+    __slots__ = ('modulus', 'num_limbs', 'mont', 'p_limbs', 'n0', 'r2_limbs',
+                 'one_limbs')
+
+    def __init__(self, modulus: int) -> None:
+        self.modulus = modulus
+        self.num_limbs = -(-modulus.bit_length() // LIMB_BITS)
+        self.mont = MontgomeryContext(modulus, LIMB_BITS)
+        self.p_limbs = _int_to_limbs(modulus, self.num_limbs)
+        # -p^-1 mod 2^32
+        self.n0 = np.uint64(self.mont.p_prime & int(_LIMB_MASK))
+        self.r2_limbs = _int_to_limbs(self.mont.r2, self.num_limbs)
+        self.one_limbs = _int_to_limbs(1, self.num_limbs)
+
+    def get(modulus: int) -> 'LimbContext':
+        ctx = _LIMB_CONTEXTS.get(modulus)
+        if ctx is None:
+            ctx = LimbContext(modulus)
+            _LIMB_CONTEXTS[modulus] = ctx
+        return ctx
+
+
+_LIMB_CONTEXTS: dict[int, LimbContext] = {}
+
+
+class FieldVector:
+
+    """
+    A vector of elements of a prime field stored as a contiguous array of limbs.
+
+    `limbs` has shape (num_limbs, len(vector)): row i holds the i-th 32 bit limb of
+    every element, so each step of the multi-precision arithmetic below is one
+    NumPy operation over the whole vector instead of one Python operation per
+    element.
+
+    Elements are kept in montgomery form (see `MontgomeryContext`), so a product is
+    reduced with limb operations only. Use `from_fields`/`to_fields` (or the `_ints`
+    variants) to convert from and to ordinary elements.
+    """
+
+    __slots__ = ('limbs', 'ctx', 'field_cls')
+
+    limbs: np.ndarray
+    ctx: LimbContext
+    field_cls: type
+
+    def __init__(self, limbs: np.ndarray, ctx: LimbContext,
+                 field_cls: type = Field) -> None:
+        self.limbs = limbs
+        self.ctx = ctx
+        self.field_cls = field_cls
+
+    def from_ints(values: list[int], modulus: int,
+                  field_cls: type = Field) -> 'FieldVector':
+        ctx = LimbContext.get(modulus)
+        limbs = _ints_to_limbs([v % modulus for v in values], ctx.num_limbs)
+        return FieldVector(_mont_mul(limbs, ctx.r2_limbs, ctx), ctx, field_cls)
+
+    def from_fields(values: list[Field]) -> 'FieldVector':
+        """
+        The elements must all be in the same field; the class of the first one is
+        used for the elements returned by `to_fields`
+        """
+
+        first = values[0]
+        return FieldVector.from_ints(
+            [v.value for v in values], first.ctx.modulus, type(first))
+
+    def to_ints(self) -> list[int]:
+        ctx = self.ctx
+        return _limbs_to_ints(_mont_mul(self.limbs, ctx.one_limbs, ctx))
+
+    def to_fields(self) -> list[Field]:
+        field_ctx = FieldContext.get(self.ctx.modulus)
+        from_reduced = self.field_cls.from_reduced
+        return [from_reduced(v, field_ctx) for v in self.to_ints()]
+
+    def from_bytes(buffer, modulus: int, check_canonical: bool = True,
+                   field_cls: type = Field) -> 'FieldVector':
+        """
+        Parses a buffer of concatenated little-endian elements of 4 * num_limbs bytes
+        each (32 bytes for the bandersnatch fields).
+
+        The buffer is viewed as limbs without a per-element copy. With
+        `check_canonical`, all elements are compared against the modulus in one
+        vectorized pass and None is returned if any of them is not in [0, modulus-1];
+        otherwise they are reduced.
+        """
+
+        ctx = LimbContext.get(modulus)
+        words = np.frombuffer(buffer, dtype='<u4')
+        limbs = words.reshape(-1, ctx.num_limbs).T.astype(np.uint64)
+
+        if check_canonical:
+            _, borrow = _sub_with_borrow(limbs, ctx.p_limbs)
+            if not np.all(borrow == 1):
+                return None
+            return FieldVector(_mont_mul(limbs, ctx.r2_limbs, ctx), ctx,
+                               field_cls)
+
+        return FieldVector.reduce(limbs, modulus, field_cls)
+
+    def to_bytes(self, out: bytearray = None) -> bytearray:
+        """
+        Serializes the elements as concatenated little-endian values of
+        4 * num_limbs bytes, into `out` if it is given
+        """
+
+        ctx = self.ctx
+        limbs = _mont_mul(self.limbs, ctx.one_limbs, ctx)
+        data = np.ascontiguousarray(limbs.T, dtype='<u4')
+
+        if out is None:
+            return bytearray(data.tobytes())
+
+        assert len(out) >= data.nbytes, "output buffer too small"
+        np.frombuffer(out, dtype=np.uint8, count=data.nbytes)[:] = \
+            data.view(np.uint8).reshape(-1)
+        return out
+
+    def reduce(limbs: np.ndarray, modulus: int,
+               field_cls: type = Field) -> 'FieldVector':
+        """
+        Builds a vector from limbs holding arbitrary values below 2 ** (32 * num_limbs),
+        reducing them modulo `modulus`
+        """
+
+        ctx = LimbContext.get(modulus)
+        limbs = np.ascontiguousarray(limbs, dtype=np.uint64)
+        return FieldVector(_mont_mul(limbs, ctx.r2_limbs, ctx), ctx, field_cls)
+
+    def add(self, other: 'FieldVector') -> 'FieldVector':
+        self._check_same_modulus(other)
+        return self._new(_add(self.limbs, other.limbs, self.ctx))
+
+    def sub(self, other: 'FieldVector') -> 'FieldVector':
+        self._check_same_modulus(other)
+        return self._new(_sub(self.limbs, other.limbs, self.ctx))
+
+    def mul(self, other: 'FieldVector') -> 'FieldVector':
+        self._check_same_modulus(other)
+        return self._new(_mont_mul(self.limbs, other.limbs, self.ctx))
+
+    def square(self) -> 'FieldVector':
+        return self._new(_mont_mul(self.limbs, self.limbs, self.ctx))
+
+    def neg(self) -> 'FieldVector':
+        limbs = self.limbs
+        zero = np.zeros_like(limbs)
+        is_zero = np.all(limbs == 0, axis=0)
+        negated, _ = _sub_with_borrow(
+            np.broadcast_to(self.ctx.p_limbs, limbs.shape), limbs)
+        return self._new(np.where(is_zero, zero, negated))
+
+    # Method overloads
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        return self.sub(other)
+
+    def __mul__(self, other):
+        return self.mul(other)
+
+    def __neg__(self):
+        return self.neg()
+
+    def __len__(self):
+        return self.limbs.shape[1]
+
+    def __eq__(self, obj):
+        assert (isinstance(obj, FieldVector))
+        return self.ctx is obj.ctx and np.array_equal(self.limbs, obj.limbs)
+
+    # Utils
+    def _new(self, limbs: np.ndarray) -> 'FieldVector':
+        return FieldVector(limbs, self.ctx, self.field_cls)
+
+    def _check_same_modulus(self, other: 'FieldVector'):
+        assert (self.ctx.modulus == other.ctx.modulus)
+        assert (self.limbs.shape == other.limbs.shape)
+
+
+def _int_to_limbs(value: int, num_limbs: int) -> np.ndarray:
+    return _ints_to_limbs([value], num_limbs)
+
+
+def _ints_to_limbs(values: list[int], num_limbs: int) -> np.ndarray:
+    width = num_limbs * LIMB_BITS // 8
+    buffer = b''.join(v.to_bytes(width, byteorder='little') for v in values)
+    limbs = np.frombuffer(buffer, dtype='<u4').reshape(len(values), num_limbs)
+    return np.ascontiguousarray(limbs.T, dtype=np.uint64)
+
+
+def _limbs_to_ints(limbs: np.ndarray) -> list[int]:
+    num_limbs = limbs.shape[0]
+    width = num_limbs * LIMB_BITS // 8
+    buffer = np.ascontiguousarray(limbs.T, dtype='<u4').tobytes()
+    return [int.from_bytes(buffer[i:i + width], byteorder='little')
+            for i in range(0, len(buffer), width)]
+
+
+def _sub_with_borrow(a: np.ndarray, b: np.ndarray) -> (np.ndarray,
+                                                       np.ndarray):
+    """
+    Limb-wise a - b, returning the result modulo 2 ** (32 * num_limbs) and the final
+    borrow (1 where a < b)
+    """
+
+    base = np.uint64(1 << LIMB_BITS)
+    result = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.uint64)
+    borrow = np.zeros(result.shape[1], dtype=np.uint64)
+    for i in range(result.shape[0]):
+        t = a[i] + base - b[i] - borrow
+        result[i] = t & _LIMB_MASK
+        borrow = np.uint64(1) - (t >> _LIMB_SHIFT)
+    return result, borrow
+
+
+def _reduce_once(t: np.ndarray, carry: np.ndarray,
+                 ctx: LimbContext) -> np.ndarray:
+    """
+    Subtracts p from the elements where carry * 2 ** (32 * num_limbs) + t >= p.
+    Requires that value to be below 2p.
+    """
+
+    subtracted, borrow = _sub_with_borrow(t, ctx.p_limbs)
+    keep = (carry == 0) & (borrow == 1)
+    return np.where(keep, t, subtracted)
+
+
+def _add(a: np.ndarray, b: np.ndarray, ctx: LimbContext) -> np.ndarray:
+    result = np.empty_like(a)
+    carry = np.zeros(a.shape[1], dtype=np.uint64)
+    for i in range(a.shape[0]):
+        t = a[i] + b[i] + carry
+        result[i] = t & _LIMB_MASK
+        carry = t >> _LIMB_SHIFT
+    return _reduce_once(result, carry, ctx)
+
+
+def _sub(a: np.ndarray, b: np.ndarray, ctx: LimbContext) -> np.ndarray:
+    result, borrow = _sub_with_borrow(a, b)
+    p_if_borrow = ctx.p_limbs * borrow
+    added = np.empty_like(result)
+    carry = np.zeros(a.shape[1], dtype=np.uint64)
+    for i in range(a.shape[0]):
+        t = result[i] + p_if_borrow[i] + carry
+        added[i] = t & _LIMB_MASK
+        carry = t >> _LIMB_SHIFT
+    return added
+
+
+def _mont_mul(a: np.ndarray, b: np.ndarray, ctx: LimbContext) -> np.ndarray:
+    """
+    Computes abR^-1 mod p element-wise using the Coarsely Integrated Operand Scanning
+    (CIOS) method, one limb of b at a time.
+
+    Reference: "Analyzing and Comparing Montgomery Multiplication Algorithms"
+    by Koc, Acar and Kaliski
+    """
+
+    num_limbs = ctx.num_limbs
+    p = ctx.p_limbs
+    n0 = ctx.n0
+    n = max(a.shape[1], b.shape[1])
+
+    t = np.zeros((num_limbs + 2, n), dtype=np.uint64)
+    for i in range(num_limbs):
+        b_i = b[i]
+
+        # t += a * b_i
+        carry = np.zeros(n, dtype=np.uint64)
+        for j in range(num_limbs):
+            uv = t[j] + a[j] * b_i + carry
+            t[j] = uv & _LIMB_MASK
+            carry = uv >> _LIMB_SHIFT
+        uv = t[num_limbs] + carry
+        t[num_limbs] = uv & _LIMB_MASK
+        t[num_limbs + 1] = uv >> _LIMB_SHIFT
+
+        # t = (t + m * p) / 2^32, where m makes the lowest limb vanish
+        m = (t[0] * n0) & _LIMB_MASK
+        carry = (t[0] + m * p[0]) >> _LIMB_SHIFT
+        for j in range(1, num_limbs):
+            uv = t[j] + m * p[j] + carry
+            t[j - 1] = uv & _LIMB_MASK
+            carry = uv >> _LIMB_SHIFT
+        uv = t[num_limbs] + carry
+        t[num_limbs - 1] = uv & _LIMB_MASK
+        t[num_limbs] = t[num_limbs + 1] + (uv >> _LIMB_SHIFT)
+
+    return _reduce_once(t[:num_limbs], t[num_limbs], ctx)
+
+
+def batch_inverse(values: list[int], modulus: int,
+                  chunk_size: int = None) -> list[int]:
+    """
+    Computes the inverses of all the values modulo `modulus` using Montgomery's trick:
+
+        1. Compute the running products p_i = v_0 * v_1 * ... * v_i
+        2. Invert the last product once
+        3. Walk backwards, getting v_i^-1 = p_(i-1) * (p_i)^-1 and
+           (p_(i-1))^-1 = v_i * (p_i)^-1
+
+    This trades n inversions for one inversion and about 3n multiplications.
+    Zeros have no inverse; they are skipped in the products and mapped to zero.
+
+    When `chunk_size` is given, the values are processed in chunks of that size,
+    each with its own inversion, which bounds the memory used by the running
+    products for very large inputs.
+    """
+
+    n = len(values)
+    if chunk_size is None or chunk_size > n:
+        chunk_size = max(n, 1)
+
+    inverses = [0] * n
+    for start in range(0, n, chunk_size):
+        chunk = [v % modulus for v in values[start:start + chunk_size]]
+
+        partials = []
+        product = 1
+        for v in chunk:
+            if v:
+                product = (product * v) % modulus
+            partials.append(product)
+
+        inv = pow(product, -1, modulus)
+
+        for i in range(len(chunk) - 1, -1, -1):
+            v = chunk[i]
+            if v == 0:
+                continue
+            previous = partials[i - 1] if i > 0 else 1
+            inverses[start + i] = (inv * previous) % modulus
+            inv = (inv * v) % modulus
+
+    return inverses
+
+
+class FixedBaseExp:
+
+    """
+    Exponentiation of a fixed base modulo a fixed modulus.
+
+    A table of base^(d * 2^(w * i)) for every digit d in [0, 2^w - 1] and window i is
+    precomputed once, so base^e only costs one multiplication per nonzero w-bit digit
+    of e and no squarings. The table covers exponents up to the size of the modulus
+    and grows when larger exponents are used.
+
+    Building the table costs about as much as 2^w / w exponentiations, so it only pays
+    off for a base that is raised to many exponents (e.g the generator of a setup).
+    Use `FixedBaseExp.get` to share the table of such a (base, modulus) pair.
+    """
+
+    def __init__(self, base: int, modulus: int, window: int = 4,
+                 max_bits: int = None) -> None:
+        self.base = base % modulus
+        self.modulus = modulus
+        self.window = window
+        self.mask = (1 << window) - 1
+        # table[i][d] = base^(d * 2^(w * i))
+        self.table = []
+        if max_bits is None:
+            max_bits = modulus.bit_length()
+        self._extend(max_bits)
+
+    def get(base: int, modulus: int) -> 'FixedBaseExp':
+        """
+        Returns the shared table of `base` modulo `modulus`, creating it on first use.
+        Only the FIXED_BASES_MAX most recently created tables are kept.
+        """
+
+        key = (base % modulus, modulus)
+        fixed_base = _FIXED_BASES.get(key)
+        if fixed_base is None:
+            fixed_base = FixedBaseExp(base, modulus)
+            if len(_FIXED_BASES) >= FIXED_BASES_MAX:
+                # Evicts the oldest table
+                del _FIXED_BASES[next(iter(_FIXED_BASES))]
+            _FIXED_BASES[key] = fixed_base
+        return fixed_base
+
+    def pow(self, exponent: int) -> int:
+        modulus = self.modulus
+        if exponent < 0:
+            return pow(self.pow(-exponent), -1, modulus)
+
+        self._extend(exponent.bit_length())
+
+        window = self.window
+        mask = self.mask
+        result = 1
+        for row in self.table:
+            if exponent == 0:
+                break
+            digit = exponent & mask
+            if digit:
+                result = (result * row[digit]) % modulus
+            exponent >>= window
+
+        return result % modulus
+
+    # Utils
+    def _extend(self, bits: int):
+        modulus = self.modulus
+        if self.table:
+            step = pow(self.table[-1][1], 1 << self.window, modulus)
+        else:
+            step = self.base
+
+        while len(self.table) * self.window < bits:
+            row = [1, step]
+            for _ in range(2, 1 << self.window):
+                row.append((row[-1] * step) % modulus)
+            self.table.append(row)
+            step = (row[-1] * step) % modulus
+
+
+# The number of tables kept by `FixedBaseExp.get`
+FIXED_BASES_MAX = 16
+_FIXED_BASES: dict[tuple[int, int], FixedBaseExp] = {}
+
+# Below this many bases `multi_exp` uses Straus' method, otherwise Pippenger's
+MULTI_EXP_STRAUS_MAX = 32
+
+
+def multi_exp(bases: list[int], exponents: list[int], modulus: int,
+              window: int = None) -> int:
+    """
+    Computes the product of bases[i] ** exponents[i] modulo `modulus`.
+
+    All the exponentiations share one chain of squarings:
+
+        - Straus' method (small inputs): each base gets a table of its first
+          2^w powers and every w-bit window costs w squarings plus one
+          multiplication per base.
+
+        - Pippenger's bucket method (large inputs): for every c-bit window the bases
+          are multiplied into 2^c - 1 buckets by their digit, and the buckets are
+          combined as bucket_1 * bucket_2^2 * ... using running products.
+
+    The window is chosen from the number of bases unless given. Negative exponents
+    use the inverse of their base.
+    """
+
+    assert len(bases) == len(exponents), "one exponent per base"
+
+    pairs = []
+    for base, exponent in zip(bases, exponents):
+        if exponent < 0:
+            base, exponent = pow(base, -1, modulus), -exponent
+        if exponent:
+            pairs.append((base % modulus, exponent))
+
+    if not pairs:
+        return 1 % modulus
+
+    max_bits = max(e.bit_length() for _, e in pairs)
+
+    if len(pairs) < MULTI_EXP_STRAUS_MAX:
+        return _straus(pairs, max_bits, modulus, window or 4)
+
+    if window is None:
+        window = max(2, len(pairs).bit_length() - 2)
+    return _pippenger(pairs, max_bits, modulus, window)
+
+
+def _straus(pairs: list[tuple[int, int]], max_bits: int, modulus: int,
+            window: int) -> int:
+    mask = (1 << window) - 1
+
+    tables = []
+    for base, _ in pairs:
+        table = [1, base]
+        for _ in range(2, 1 << window):
+            table.append((table[-1] * base) % modulus)
+        tables.append(table)
+
+    result = 1
+    for shift in range(((max_bits - 1) // window) * window, -1, -window):
+        for _ in range(window):
+            result = (result * result) % modulus
+        for table, (_, exponent) in zip(tables, pairs):
+            digit = (exponent >> shift) & mask
+            if digit:
+                result = (result * table[digit]) % modulus
+
+    return result
+
+
+def _pippenger(pairs: list[tuple[int, int]], max_bits: int, modulus: int,
+               window: int) -> int:
+    mask = (1 << window) - 1
+
+    result = 1
+    for shift in range(((max_bits - 1) // window) * window, -1, -window):
+        for _ in range(window):
+            result = (result * result) % modulus
+
+        buckets = [None] * (1 << window)
+        for base, exponent in pairs:
+            digit = (exponent >> shift) & mask
+            if digit:
+                bucket = buckets[digit]
+                buckets[digit] = base if bucket is None else (
+                    bucket * base) % modulus
+
+        # prod(bucket_d ** d) = prod over d of (bucket_d * ... * bucket_top)
+        running = 1
+        total = 1
+        for digit in range(mask, 0, -1):
+            if buckets[digit] is not None:
+                running = (running * buckets[digit]) % modulus
+            total = (total * running) % modulus
+        result = (result * total) % modulus
+
+    return result
+
+
+class _FieldConstant:
+
+    """
+    Mixed into a typed field to make the class of its shared constants
+    """
+
+    __slots__ = ()
+
+    mutable_cls: type = None
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            "field constants are immutable, use dup() to get a mutable copy")
+
+    @classmethod
+    def from_reduced(cls, value: int, ctx: FieldContext) -> 'Field':
+        # Results of arithmetic on constants are ordinary elements
+        return cls.mutable_cls.from_reduced(value, ctx)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
 
 def modular_sqrt(a: int, p: int):
@@ -183,78 +1163,245 @@ def modular_sqrt(a: int, p: int):
             x^2 = a (mod p)
         And returns x. Note that p - x is also a root.
 
-        0 is returned is no square root exists for
+        None is returned if no square root exists for
         these a and p.
 
-        The Tonelli-Shanks algorithm is used (except
-        for some simple cases in which the solution
-        is known from an identity). This algorithm
-        runs in polynomial time (unless the
-        generalized Riemann hypothesis is false).
-    """
-    # Simple cases
-    #
-    if legendre_symbol(a, p) != 1:
-        return None
-    elif a == 0:
-        return 0
-    elif p == 2:
-        return 0
-    elif p % 4 == 3:
-        return pow(a, (p + 1) // 4, p)
-
-    # Partition p-1 to s * 2^e for an odd s (i.e.
-    # reduce all the powers of 2 from p-1)
-    #
-    s = p - 1
-    e = 0
-    while s % 2 == 0:
-        s //= 2
-        e += 1
-
-    # Find some 'n' with a legendre symbol n|p = -1.
-    # Shouldn't take long.
-    #
-    n = 2
-    while legendre_symbol(n, p) != -1:
-        n += 1
-
-    # Here be dragons!
-    # Read the paper "Square roots from 1; 24, 51,
-    # 10 to Dan Shanks" by Ezra Brown for more
-    # information
-    #
-
-    # x is a guess of the square root that gets better
-    # with each iteration.
-    # b is the "fudge factor" - by how much we're off
-    # with the guess. The invariant x^2 = ab (mod p)
-    # is maintained throughout the loop.
-    # g is used for successive powers of n to update
-    # both a and b
-    # r is the exponent - decreases with each update
-    #
-    x = pow(a, (s + 1) // 2, p)
-    b = pow(a, s, p)
-    g = pow(n, s, p)
-    r = e
-
-    while True:
-        t = b
-        m = 0
-        for m in range(r):
-            if t == 1:
-                break
-            t = pow(t, 2, p)
+        The precomputed context of p is used, see
+        `SqrtContext`.
+    """
+    return SqrtContext.get(p).sqrt(a)
+
+
+class SqrtContext:
+
+    """
+    Precomputed data to compute square roots modulo a fixed odd prime p.
+
+    Everything that only depends on p is computed once: p - 1 = s * 2^e with s odd,
+    a quadratic non-residue z, c = z^s (a generator of the 2^e-th roots of unity)
+    and powers of c. A square root then costs one exponentiation by about (s-1)/2
+    and some multiplications, and tells at the same time whether a is a square,
+    so no separate Legendre symbol is needed.
+
+    Two methods are used depending on the 2-adicity e:
+
+        - Tonelli-Shanks with the powers c^(2^i) precomputed when e is small.
+
+        - A lookup-table variant when e >= `TABLE_MIN_TWO_ADICITY` (e.g e = 32 for
+          the bandersnatch base field). It finds the discrete log of a^s in base c
+          `window` bits at a time using a table of the 2^window-th roots of unity.
+          See "Computing square roots faster than the Tonelli-Shanks/Bernstein
+          algorithm" by Palash Sarkar (https://eprint.iacr.org/2020/1407) and
+          "Faster square roots in annoying finite fields" by D. J. Bernstein.
+    """
+
+    TABLE_MIN_TWO_ADICITY = 8
+    DEFAULT_WINDOW = 8
+
+    def __init__(self, modulus: int, window: int = None) -> None:
+        p = modulus
+
+        # Partition p-1 to s * 2^e for an odd s (i.e.
+        # reduce all the powers of 2 from p-1)
+        s = p - 1
+        e = 0
+        while s % 2 == 0:
+            s //= 2
+            e += 1
+
+        # Find some 'n' with a legendre symbol n|p = -1.
+        # Shouldn't take long.
+        n = 2
+        while legendre_symbol(n, p) != -1:
+            n += 1
+
+        self.modulus = p
+        self.s = s
+        self.e = e
+        self.non_residue = n
+        self.half_s = (s - 1) // 2
+
+        # c^(2^i) for i in [0, e], c = n^s has order 2^e
+        c = pow(n, s, p)
+        self.root_of_unity_powers = [c]
+        for _ in range(e):
+            c = (c * c) % p
+            self.root_of_unity_powers.append(c)
+
+        if window is None:
+            window = self.DEFAULT_WINDOW if e >= self.TABLE_MIN_TWO_ADICITY else 0
+        self.window = min(window, e)
+
+        if self.window > 0:
+            self._build_tables()
+
+    def get(modulus: int) -> 'SqrtContext':
+        """
+        Returns the context for `modulus`, creating it on first use
+        """
+
+        ctx = _SQRT_CONTEXTS.get(modulus)
+        if ctx is None:
+            ctx = SqrtContext(modulus)
+            _SQRT_CONTEXTS[modulus] = ctx
+        return ctx
+
+    def sqrt(self, a: int) -> int:
+        """
+        Returns a square root of a, or None if a is not a square
+        """
+
+        _, root = self.sqrt_and_is_square(a)
+        return root
+
+    def sqrt_and_is_square(self, a: int) -> (bool, int):
+        """
+        Returns (True, x) with x ** 2 = a mod p if a is a square and (False, None)
+        otherwise
+        """
+
+        p = self.modulus
+        a %= p
+        if a == 0:
+            return True, 0
+
+        if self.e == 1:
+            # p = 3 mod 4, so a^((p+1)/4) is a root whenever one exists
+            x = pow(a, (p + 1) // 4, p)
+            if (x * x) % p == a:
+                return True, x
+            return False, None
+
+        # w = a^((s-1)/2), x = a^((s+1)/2) and b = a^s. The invariant
+        # x^2 = ab holds, so it remains to remove b, which is a 2^e-th root of
+        # unity, from x^2
+        w = pow(a, self.half_s, p)
+        x = (a * w) % p
+        b = (x * w) % p
+
+        if self.window > 0:
+            return self._sqrt_table(x, b)
+        return self._sqrt_tonelli_shanks(x, b)
+
+    # Utils
+    def _sqrt_tonelli_shanks(self, x: int, b: int) -> (bool, int):
+        # Here be dragons!
+        # Read the paper "Square roots from 1; 24, 51,
+        # 10 to Dan Shanks" by Ezra Brown for more
+        # information
+        #
+        # x is a guess of the square root that gets better
+        # with each iteration.
+        # b is the "fudge factor" - by how much we're off
+        # with the guess. The invariant x^2 = ab (mod p)
+        # is maintained throughout the loop.
+        # The powers of c are used to update both x and b
+        # r is the exponent - decreases with each update
+        p = self.modulus
+        e = self.e
+        powers = self.root_of_unity_powers
+        r = e
+
+        while b != 1:
+            # Find the least m with b^(2^m) = 1, if it is not below r then b
+            # has order 2^e and a is not a square
+            t = b
+            m = 0
+            while t != 1 and m < r:
+                t = (t * t) % p
+                m += 1
+
+            if m == r:
+                return False, None
+
+            # The updating power of c is always c^(2^(e - r)), so the
+            # intermediate powers are read from the table
+            x = (x * powers[e - m - 1]) % p
+            b = (b * powers[e - m]) % p
+            r = m
+
+        return True, x
+
+    def _build_tables(self):
+        p = self.modulus
+        e = self.e
+        w = self.window
+        c = self.root_of_unity_powers[0]
+        c_inv = pow(c, -1, p)
+
+        # omega = c^(2^(e-w)) has order 2^w, map each of its powers to the
+        # exponent
+        omega = self.root_of_unity_powers[e - w]
+        self.roots_of_unity = {}
+        value = 1
+        for j in range(1 << w):
+            self.roots_of_unity[value] = j
+            value = (value * omega) % p
+
+        # For each chunk of w bits of an exponent k (the lowest first):
+        #   inverse_chunks[i][d] = c^-(d * 2^(iw))
+        #   half_inverse_chunks[i][d] = c^-(d * 2^(iw) / 2), for i = 0 only
+        #   even values of d are meaningful
+        self.inverse_chunks = []
+        self.half_inverse_chunks = []
+        for i in range(0, -(-e // w)):
+            base = pow(c_inv, 1 << (i * w), p)
+            half_base = pow(c_inv, 1 << (i * w - 1), p) if i > 0 else None
+
+            chunk = [1]
+            half_chunk = [1]
+            for d in range(1, 1 << w):
+                chunk.append((chunk[-1] * base) % p)
+                if half_base is None:
+                    half_chunk.append(None)
+                else:
+                    half_chunk.append((half_chunk[-1] * half_base) % p)
+            if half_base is None:
+                half_chunk = [chunk[d >> 1] if d % 2 == 0 else None
+                              for d in range(1 << w)]
+            self.inverse_chunks.append(chunk)
+            self.half_inverse_chunks.append(half_chunk)
+
+    def _sqrt_table(self, x: int, b: int) -> (bool, int):
+        """
+        Finds k with b = c^k, w bits at a time starting from the lowest bits.
+
+        With the bits below position iw known (k_low), y = b * c^-k_low has order
+        dividing 2^(e - iw). Raising it to 2^(e - iw - w) lands in the subgroup of
+        order 2^w, where it equals omega^(next w bits of k) and is found in the table.
+        a is a square iff k is even, and then x * c^(-k/2) is a root.
+        """
+
+        p = self.modulus
+        e = self.e
+        w = self.window
+        roots = self.roots_of_unity
+        digits = []
+
+        y = b
+        for i, chunk in enumerate(self.inverse_chunks):
+            width = min(w, e - i * w)
+
+            t = y
+            for _ in range(e - i * w - width):
+                t = (t * t) % p
+
+            # For a narrower last chunk t is in the subgroup of order 2^width,
+            # i.e its table exponent is a multiple of 2^(w - width)
+            digit = roots[t] >> (w - width)
+            digits.append(digit)
+            y = (y * chunk[digit]) % p
+
+        if digits[0] % 2 == 1:
+            return False, None
+
+        for i, digit in enumerate(digits):
+            x = (x * self.half_inverse_chunks[i][digit]) % p
+
+        return True, x
 
-        if m == 0:
-            return x
 
-        gs = pow(g, 2 ** (r - m - 1), p)
-        g = (gs * gs) % p
-        x = (x * gs) % p
-        b = (b * g) % p
-        r = m
+_SQRT_CONTEXTS: dict[int, SqrtContext] = {}
 
 
 def legendre_symbol(a: int, p: int):
@@ -22,6 +22,9 @@ def gcd_by_eea(a: int, b: int) -> list[list[int]]:
     The Extended Euclidean Algorithm is used here.
 
     The value of x_1 and y_1 in the last row are the values of x and y respectively.
+
+    Every step is kept as a row of the returned table so the algorithm can be
+    followed by hand. To only get the result, use `extended_gcd` or `mod_inverse`.
     """
 
     # Initial Values
@@ -50,5 +53,104 @@ def gcd_by_eea(a: int, b: int) -> list[list[int]]:
     return table
 
 
+def extended_gcd(a: int, b: int) -> tuple[int, int, int]:
+    """
+    Returns (gcd, x, y) with ax + by = gcd(a, b).
+
+    This is the same algorithm as `gcd_by_eea`, but only the last two rows of the
+    table are kept, so it runs in constant memory.
+    """
+
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r != 0:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    return (old_r, old_x, old_y)
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """
+    Computes the multiplicative inverse of a mod m, that is the x with ax = 1 mod m.
+
+    The x of `extended_gcd(a, m)` is the inverse when the gcd is 1. Python's
+    built-in pow(a, -1, m) runs that same algorithm in C, so it is used here.
+    """
+
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        raise Exception(f"{a} has no inverse mod {m}")
+
+
+def mod_inverse_binary(a: int, m: int) -> int:
+    """
+    Computes the multiplicative inverse of a mod m for an odd m, using the binary
+    Extended Euclidean Algorithm.
+
+    Instead of divisions, it only uses shifts and subtractions: while u and v are
+    reduced towards gcd(a, m) by halving and subtracting, x1 and x2 are kept such
+    that a * x1 = u mod m and a * x2 = v mod m. Halving x mod m is x / 2 when x is
+    even and (x + m) / 2 when it is odd.
+    """
+
+    assert m & 1, "the modulus must be odd"
+
+    u, v = a % m, m
+    x1, x2 = 1, 0
+    while u != 1 and v != 1:
+        if u == 0:
+            raise Exception(f"{a} has no inverse mod {m}")
+
+        while u & 1 == 0:
+            u >>= 1
+            x1 = x1 >> 1 if x1 & 1 == 0 else (x1 + m) >> 1
+        while v & 1 == 0:
+            v >>= 1
+            x2 = x2 >> 1 if x2 & 1 == 0 else (x2 + m) >> 1
+
+        if u >= v:
+            u -= v
+            x1 -= x2
+        else:
+            v -= u
+            x2 -= x1
+
+    return (x1 if u == 1 else x2) % m
+
+
+def jacobi_symbol(a: int, n: int) -> int:
+    """
+    Computes the Jacobi symbol (a|n) for an odd n > 0, which is the Legendre symbol
+    when n is prime: 1 if a is a non zero square mod n, -1 if it is not a square and
+    0 if n divides a.
+
+    Euler's criterion (a ** ((n - 1) / 2) mod n) costs an exponentiation. Instead,
+    like the Euclidean Algorithm, (a|n) is reduced to (n mod a|a) with the law of
+    quadratic reciprocity, after removing the factors of 2 of a with
+    (2|n) = -1 when n = 3 or 5 mod 8.
+    """
+
+    assert n > 0 and n & 1, "n must be odd and positive"
+
+    a %= n
+    result = 1
+    while a != 0:
+        twos = (a & -a).bit_length() - 1
+        a >>= twos
+        if twos & 1 and n & 7 in (3, 5):
+            result = -result
+
+        # (a|n) = -(n|a) when a = n = 3 mod 4, else (n|a)
+        if a & n & 3 == 3:
+            result = -result
+        a, n = n % a, a
+
+    return result if n == 1 else 0
+
+
 def generate_random_prime(min: int, max: int):
     return sympy.randprime(min, max)